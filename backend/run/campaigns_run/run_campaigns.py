@@ -20,6 +20,8 @@ from collections import defaultdict
 backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..')
 sys.path.insert(0, backend_dir)
 
+from utils.mongodb_pull.snapshot_store import pa, write_records
+
 def setup_logging() -> logging.Logger:
     """Set up logging for the orchestrator"""
     log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
@@ -197,7 +199,8 @@ def combine_campaign_results(campaign_results: List[Dict]) -> Dict[str, List[Dic
 
 def save_combined_results(combined_results: Dict[str, List[Dict]], output_dir: str, logger: logging.Logger):
     """
-    Save combined results to local JSON files compatible with airtable_sync.py
+    Save combined results to local JSON files compatible with airtable_sync.py,
+    plus memory-mappable .arrow snapshots of them when pyarrow is installed
 
     Args:
         combined_results: Dict with 'messages', 'users', 'events' keys
@@ -214,6 +217,12 @@ def save_combined_results(combined_results: Dict[str, List[Dict]], output_dir: s
 
         logger.info(f"✓ Saved {len(combined_results[data_type])} {data_type} to {file_path}")
 
+        # Written after the JSON so readers see the snapshot as up to date
+        if pa is not None:
+            arrow_path = os.path.join(output_dir, f'{data_type}.arrow')
+            write_records(arrow_path, combined_results[data_type], default=str)
+            logger.info(f"✓ Saved {data_type} snapshot to {arrow_path}")
+
 
 def main():
     """Main entry point for campaign orchestrator"""
@@ -54,7 +54,7 @@ sys.path.insert(0, backend_dir)
 # Import from utils modules
 from utils.report_creation.report_generator import generate_report
 from utils.firebase_manage.firebase_manager import FirebaseManager
-from utils.mongodb_pull.mongodb_pull import MongoDBPull
+from utils.mongodb_pull.mongodb_pull import MongoDBConnection, MongoDBPull, SnapshotSource
 from utils.airtable_sync.airtable_sync import upload_message_to_airtable
 
 # ============================================================================
@@ -117,8 +117,16 @@ def setup_logging(log_dir: str = None) -> logging.Logger:
 class SeatNewcomersCampaign:
     """Main campaign class for Seat Newcomers initiative"""
 
-    def __init__(self, logger: logging.Logger = None):
-        """Initialize connections to MongoDB, Firebase, and Anthropic"""
+    def __init__(self, logger: logging.Logger = None, source=None):
+        """
+        Initialize connections to MongoDB, Firebase, and Anthropic
+
+        Args:
+            logger: Optional logger instance
+            source: Optional mongodb_pull DataSource to read users/events/orders from
+                (e.g. SnapshotSource for offline runs); defaults to live MongoDB
+        """
+        self.source = source
         self.logger = logger or logging.getLogger('SeatNewcomers')
         self.campaign_id = f"seat-newcomers-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
         self.campaign_name = "seat-newcomers"
@@ -170,7 +178,15 @@ class SeatNewcomersCampaign:
         """Initialize MongoDB connection using mongodb_pull helper"""
         try:
             # Use mongodb_pull helper for MongoDB connection
-            self.mongodb_pull = MongoDBPull(logger=self.logger)
+            # DELTA_PULL=true: repeat runs only fetch documents changed since the last snapshot
+            # (edits that do not move the watermark wait for the daily reconcile, so it is
+            # opt-in; a given data source, e.g. an offline snapshot, is read as is)
+            delta = os.getenv('DELTA_PULL', 'false').lower() == 'true'
+            self.mongodb_pull = MongoDBPull(logger=self.logger, delta=delta and self.source is None, source=self.source)
+            if not isinstance(self.mongodb_pull.connection, MongoDBConnection):
+                self.mongo_client = self.db = self.users_collection = self.events_collection = None
+                self.logger.info(f"Reading campaign data from {type(self.mongodb_pull.connection).__name__}")
+                return
             self.mongo_client = self.mongodb_pull.connection.get_client()
             self.db = self.mongodb_pull.connection.get_database()
             self.users_collection = self.db['user']
@@ -387,15 +403,9 @@ class SeatNewcomersCampaign:
         self.logger.info("Fetching future events (preferring beginner-friendly) using mongodb_pull...")
 
         try:
-            # Get fully enriched events from mongodb_pull
-            all_enriched_events = self.mongodb_pull.events_pull(generate_report=False)
-            self.logger.info(f"Found {len(all_enriched_events)} total enriched events")
-
-            # Filter for events that qualify for seat-newcomers campaign (future, public, 50-80% participation)
-            future_events = [
-                event for event in all_enriched_events
-                if event.get('campaign_qualifications', {}).get('qualifies_seat_newcomers', False)
-            ]
+            # Get enriched events that qualify for seat-newcomers campaign (future, public, 50-80% participation);
+            # only future public events are fetched and enriched
+            future_events = self.mongodb_pull.events_pull(generate_report=False, campaign='seat_newcomers')
 
             # Sort by participation percentage (prefer 50-80% range for beginner-friendliness)
             # Create a custom sort key that prioritizes 50-80% range
@@ -1152,7 +1162,10 @@ def main():
     
     try:
         # Create and run campaign
-        campaign = SeatNewcomersCampaign(logger=logger)
+        # SOURCE_DIR: read users/events/orders from a mongodb_pull snapshot directory instead of MongoDB
+        source_dir = os.getenv('SOURCE_DIR')
+        source = SnapshotSource(source_dir, logger) if source_dir else None
+        campaign = SeatNewcomersCampaign(logger=logger, source=source)
         campaign.run()
 
     except KeyboardInterrupt:
@@ -8,12 +8,20 @@ Implementation follows the plan outlined in README.md
 """
 
 import os
+import sys
 import json
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple
 from pyairtable import Api
 
+# Add backend directory to path for the shared snapshot reader
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..')
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from utils.mongodb_pull.snapshot_store import load_records, snapshot_fields
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -226,27 +234,38 @@ def pull_airtable_data(table, table_name):
 # PHASE 3: LOAD LOCAL MONGODB DATA
 # ============================================================================
 
-def load_local_mongodb_data(data_type):
-    """Load local MongoDB data from JSON files."""
+def load_local_mongodb_data(data_type, field_mapping):
+    """
+    Load local MongoDB data from JSON files (or their memory-mapped .arrow snapshots).
+
+    Only the mapped fields are decoded from an .arrow snapshot; the others are listed
+    from its schema. Returns (records, field names found in the data).
+    """
     file_path = os.path.join(MONGODB_DATA_DIR, f'{data_type}.json')
+    arrow_path = os.path.join(MONGODB_DATA_DIR, f'{data_type}.arrow')
 
     logger.info(f"Loading local MongoDB {data_type} data from {file_path}")
 
-    if not os.path.exists(file_path):
+    if not os.path.exists(file_path) and not os.path.exists(arrow_path):
         logger.error(f"✗ File not found: {file_path}")
-        return []
-
-    with open(file_path, 'r') as f:
-        records = json.load(f)
+        return [], set()
+
+    fields = snapshot_fields(file_path)
+    if fields is None:
+        # JSON is parsed in full anyway; sample field names from the records
+        records = load_records(file_path)
+        fields = set()
+        for record in records[:100]:  # Sample first 100 records
+            fields.update(record.keys())
+    else:
+        records = load_records(file_path, columns=list(field_mapping))
 
     logger.info(f"✓ Loaded {len(records)} {data_type} records from MongoDB data")
 
     # Log field analysis
-    if records:
-        first_record = records[0]
-        logger.info(f"Fields in MongoDB {data_type}: {list(first_record.keys())}")
+    logger.info(f"Fields in MongoDB {data_type}: {sorted(fields)}")
 
-    return records
+    return records, set(fields)
 
 # ============================================================================
 # PHASE 4: MATCHING FUNCTIONS
@@ -304,14 +323,8 @@ def map_fields(local_record, field_mapping):
 
     return mapped_fields
 
-def identify_unmapped_fields(mongodb_records, field_mapping, table_name):
+def identify_unmapped_fields(all_mongodb_fields, field_mapping, table_name):
     """Identify MongoDB fields that aren't mapped to Airtable."""
-    all_mongodb_fields = set()
-
-    # Collect all fields from MongoDB records
-    for record in mongodb_records[:100]:  # Sample first 100 records
-        all_mongodb_fields.update(record.keys())
-
     # Find unmapped fields
     mapped_fields = set(field_mapping.keys())
     unmapped_fields = all_mongodb_fields - mapped_fields
@@ -616,9 +629,9 @@ def main():
         logger.info("\n" + "="*80)
         logger.info("PHASE 3: Loading MongoDB Data")
         logger.info("="*80)
-        users_mongodb = load_local_mongodb_data('users')
-        events_mongodb = load_local_mongodb_data('events')
-        messages_mongodb = load_local_mongodb_data('messages')
+        users_mongodb, users_fields = load_local_mongodb_data('users', USERS_FIELD_MAPPING)
+        events_mongodb, events_fields = load_local_mongodb_data('events', EVENTS_FIELD_MAPPING)
+        messages_mongodb, messages_fields = load_local_mongodb_data('messages', MESSAGES_FIELD_MAPPING)
 
         # Phase 4: Create lookups
         logger.info("\n" + "="*80)
@@ -632,9 +645,9 @@ def main():
         logger.info("\n" + "="*80)
         logger.info("PHASE 5: Identifying Unmapped Fields")
         logger.info("="*80)
-        users_unmapped = identify_unmapped_fields(users_mongodb, USERS_FIELD_MAPPING, 'users')
-        events_unmapped = identify_unmapped_fields(events_mongodb, EVENTS_FIELD_MAPPING, 'events')
-        messages_unmapped = identify_unmapped_fields(messages_mongodb, MESSAGES_FIELD_MAPPING, 'messages')
+        users_unmapped = identify_unmapped_fields(users_fields, USERS_FIELD_MAPPING, 'users')
+        events_unmapped = identify_unmapped_fields(events_fields, EVENTS_FIELD_MAPPING, 'events')
+        messages_unmapped = identify_unmapped_fields(messages_fields, MESSAGES_FIELD_MAPPING, 'messages')
 
         # Phase 7: Sync tables
         logger.info("\n" + "="*80)
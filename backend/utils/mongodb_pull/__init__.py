@@ -11,17 +11,85 @@ from .mongodb_pull import (
     
     # Component Classes
     MongoDBConnection,
+    DataSource,
+    MemorySource,
+    SnapshotSource,
+    MongoClientRegistry,
     UserEnrichment,
     EventTransformation,
     CampaignQualification,
     SummaryGeneration,
     SocialConnection,
+    UserEventIndex,
+    CoAttendanceGraph,
     ReportGeneration,
+    DeltaSnapshot,
+    EnrichmentMaterializer,
+    LazyDocument,
+    EventTable,
+    EnrichedRecord,
+    EnrichedUser,
+    EnrichedEvent,
+    LazyUserFields,
+    SelectiveEnrichment,
     
     # Utilities
     parse_iso_date,
+    date_cache_info,
+    clear_date_cache,
     is_profile_complete,
     setup_logging,
+    CLIENT_REGISTRY,
+    match_filter,
+    save_snapshot,
+    LAZY_COLLECTIONS,
+    materialize,
+    to_plain,
+    
+    # Field Requirements
+    FIELD_REQUIREMENTS,
+    PULL_STAGES,
+    ALL_FIELDS,
+    build_projection,
+    
+    # Server-Side Aggregation
+    build_order_stats_pipeline,
+    build_event_demographics_pipeline,
+    fold_demographic_values,
+    build_partition_filters,
+    build_scope_filters,
+    
+    # Reports
+    REPORT_SPECS,
+    user_report_row,
+    event_report_row,
+    report_stats,
+    build_report_pipeline,
+    
+    # Materialized Enrichment
+    MATERIALIZED_COLLECTIONS,
+    MATERIALIZED_FIELDS,
+    enrichment_document,
+    
+    # Incremental Enrichment
+    USER_ENRICHED_FIELDS,
+    USER_TIME_LABELS,
+    ENRICHMENT_CACHE_FILE,
+    
+    # Lazy Fields
+    USER_LAZY_FIELDS,
+    
+    # Field-Selective Enrichment
+    USER_STAGES,
+    EVENT_STAGES,
+    ENRICHMENT_STAGES,
+    REPORT_DERIVED_FIELDS,
+    plan_enrichment_stages,
+    
+    # Campaign Qualification Pre-filters
+    CAMPAIGNS,
+    QUALIFICATION_PREFILTERS,
+    build_qualification_filter,
     
     # Scoring Functions
     calculate_newcomer_score,
@@ -34,17 +102,85 @@ __all__ = [
     
     # Component Classes
     'MongoDBConnection',
+    'DataSource',
+    'MemorySource',
+    'SnapshotSource',
+    'MongoClientRegistry',
     'UserEnrichment',
     'EventTransformation',
     'CampaignQualification',
     'SummaryGeneration',
     'SocialConnection',
+    'UserEventIndex',
+    'CoAttendanceGraph',
     'ReportGeneration',
+    'DeltaSnapshot',
+    'EnrichmentMaterializer',
+    'LazyDocument',
+    'EventTable',
+    'EnrichedRecord',
+    'EnrichedUser',
+    'EnrichedEvent',
+    'LazyUserFields',
+    'SelectiveEnrichment',
     
     # Utilities
     'parse_iso_date',
+    'date_cache_info',
+    'clear_date_cache',
     'is_profile_complete',
     'setup_logging',
+    'CLIENT_REGISTRY',
+    'match_filter',
+    'save_snapshot',
+    'LAZY_COLLECTIONS',
+    'materialize',
+    'to_plain',
+    
+    # Field Requirements
+    'FIELD_REQUIREMENTS',
+    'PULL_STAGES',
+    'ALL_FIELDS',
+    'build_projection',
+    
+    # Server-Side Aggregation
+    'build_order_stats_pipeline',
+    'build_event_demographics_pipeline',
+    'fold_demographic_values',
+    'build_partition_filters',
+    'build_scope_filters',
+    
+    # Reports
+    'REPORT_SPECS',
+    'user_report_row',
+    'event_report_row',
+    'report_stats',
+    'build_report_pipeline',
+    
+    # Materialized Enrichment
+    'MATERIALIZED_COLLECTIONS',
+    'MATERIALIZED_FIELDS',
+    'enrichment_document',
+    
+    # Incremental Enrichment
+    'USER_ENRICHED_FIELDS',
+    'USER_TIME_LABELS',
+    'ENRICHMENT_CACHE_FILE',
+    
+    # Lazy Fields
+    'USER_LAZY_FIELDS',
+    
+    # Field-Selective Enrichment
+    'USER_STAGES',
+    'EVENT_STAGES',
+    'ENRICHMENT_STAGES',
+    'REPORT_DERIVED_FIELDS',
+    'plan_enrichment_stages',
+    
+    # Campaign Qualification Pre-filters
+    'CAMPAIGNS',
+    'QUALIFICATION_PREFILTERS',
+    'build_qualification_filter',
     
     # Scoring Functions
     'calculate_newcomer_score',
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+MongoDB Pull command line
+
+Run from the backend directory:
+    python -m utils.mongodb_pull indexes [--create] [--uri URI] [--database NAME]
+    python -m utils.mongodb_pull reports [--only users|events] [--uri URI] [--database NAME]
+    python -m utils.mongodb_pull snapshot DIR [--uri URI] [--database NAME]
+    python -m utils.mongodb_pull profile DIR [--users-limit N] [--top N]
+"""
+
+import argparse
+import cProfile
+import pstats
+import sys
+import time
+
+from .mongodb_pull import MongoDBConnection, MongoDBPull, ReportGeneration, SnapshotSource, save_snapshot, setup_logging
+from .index_advisor import IndexAdvisor, format_report
+
+
+def indexes(args: argparse.Namespace) -> int:
+    """Explain the pull layer's access paths and report (or create) missing indexes"""
+    logger = setup_logging(logger_name='MongoDBPull.IndexAdvisor')
+    connection = MongoDBConnection(logger, connection_string=args.uri, database=args.database)
+    try:
+        rows = IndexAdvisor(connection, logger).advise(create=args.create)
+    finally:
+        connection.close()
+    print(format_report(rows))
+    # Non-zero when a path still needs an index, so scheduled checks can alert on it
+    return 1 if any(row['before']['collscan'] and not row['created'] for row in rows) else 0
+
+
+def reports(args: argparse.Namespace) -> int:
+    """Render markdown reports from the report collections written by a server_reports pull"""
+    logger = setup_logging(logger_name='MongoDBPull.Reports')
+    connection = MongoDBConnection(logger, connection_string=args.uri, database=args.database)
+    generation = ReportGeneration(logger)
+    try:
+        for kind in [args.only] if args.only else ['users', 'events']:
+            stats = connection.aggregate_report(kind)
+            if not stats['count']:
+                logger.warning(f"No {kind} report rows; run a pull with server_reports=True first")
+                continue
+            generate = generation.generate_users_report if kind == 'users' else generation.generate_events_report
+            print(generate(stats=stats))
+    finally:
+        connection.close()
+    return 0
+
+
+def snapshot(args: argparse.Namespace) -> int:
+    """Copy the user, event and order collections into a directory for offline runs"""
+    logger = setup_logging(logger_name='MongoDBPull.Snapshot')
+    connection = MongoDBConnection(logger, connection_string=args.uri, database=args.database)
+    try:
+        counts = save_snapshot(connection, args.directory)
+    finally:
+        connection.close()
+    for collection, count in counts.items():
+        print(f"{collection}: {count} documents")
+    return 0
+
+
+def profile(args: argparse.Namespace) -> int:
+    """Run users_events_pull on a snapshot directory under cProfile (no network)"""
+    logger = setup_logging(logger_name='MongoDBPull.Profile')
+    pull = MongoDBPull(logger, source=SnapshotSource(args.directory, logger))
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    users, events = pull.users_events_pull(users_limit=args.users_limit, generate_report=False, save_data=False)
+    profiler.disable()
+    print(f"users_events_pull: {len(users)} users, {len(events)} events in {time.perf_counter() - start:.2f}s")
+    pstats.Stats(profiler, stream=sys.stdout).sort_stats(args.sort).print_stats(args.top)
+    return 0
+
+
+def main(argv=None) -> int:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(prog='python -m utils.mongodb_pull', description='MongoDB pull utilities')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    index_parser = commands.add_parser('indexes', help='Explain the queries the pull layer issues and report COLLSCANs')
+    index_parser.add_argument('--create', action='store_true', help='Create the recommended index for every path that runs a COLLSCAN')
+    index_parser.add_argument('--uri', help='MongoDB URI (default: the production cluster)')
+    index_parser.add_argument('--database', help='Database name (default: cuculi_production)')
+    index_parser.set_defaults(handler=indexes)
+
+    report_parser = commands.add_parser('reports', help='Render reports from the report_users / report_events collections')
+    report_parser.add_argument('--only', choices=['users', 'events'], help='Render just one report (default: both)')
+    report_parser.add_argument('--uri', help='MongoDB URI (default: the production cluster)')
+    report_parser.add_argument('--database', help='Database name (default: cuculi_production)')
+    report_parser.set_defaults(handler=reports)
+
+    snapshot_parser = commands.add_parser('snapshot', help='Copy user/event/order into a directory SnapshotSource can read')
+    snapshot_parser.add_argument('directory', help='SnapshotStore directory to write the user, event and order datasets to')
+    snapshot_parser.add_argument('--uri', help='MongoDB URI (default: the production cluster)')
+    snapshot_parser.add_argument('--database', help='Database name (default: cuculi_production)')
+    snapshot_parser.set_defaults(handler=snapshot)
+
+    profile_parser = commands.add_parser('profile', help='Profile users_events_pull offline on a snapshot directory')
+    profile_parser.add_argument('directory', help='Snapshot directory (see the snapshot command)')
+    profile_parser.add_argument('--users-limit', type=int, help='Only enrich the first N users')
+    profile_parser.add_argument('--top', type=int, default=25, help='Number of functions to list (default: 25)')
+    profile_parser.add_argument('--sort', default='cumulative', help='pstats sort key (default: cumulative)')
+    profile_parser.set_defaults(handler=profile)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Async MongoDB Pull
+
+asyncio variant of the MongoDB read path. AsyncMongoDBConnection exposes get_users,
+get_events and get_orders as async iterators over non-blocking cursors, and
+AsyncMongoDBPull.users_events_pull fetches the three collections concurrently on the
+event loop, so an asyncio campaign runner can overlap data loading with LLM calls,
+Firebase writes or report generation. Enrichment is the same code as MongoDBPull and
+runs in a worker thread, so its output is identical.
+
+Uses PyMongo's native AsyncMongoClient (pymongo >= 4.9), or Motor on older pymongo
+(pip install motor).
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import List, Dict, Any, AsyncIterator, Iterable, Optional, Tuple
+
+try:
+    from pymongo import AsyncMongoClient
+except ImportError:  # pragma: no cover - pymongo < 4.9
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient as AsyncMongoClient
+    except ImportError:  # pragma: no cover - optional dependency
+        AsyncMongoClient = None
+
+from .mongodb_pull import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_IDLE_TIME_MS,
+    DEFAULT_MAX_POOL_SIZE,
+    MONGO_CONNECTION_STRING,
+    MONGO_DATABASE,
+    MONGO_HOST,
+    MongoDBPull,
+    build_projection,
+    setup_logging,
+)
+
+
+# ============================================================================
+# Async MongoDB Connection Class
+# ============================================================================
+
+class AsyncMongoDBConnection:
+    """Non-blocking MongoDB connection with async-iterator reads."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, connection_string: Optional[str] = None, database: Optional[str] = None, max_pool_size: int = DEFAULT_MAX_POOL_SIZE, max_idle_time_ms: int = DEFAULT_MAX_IDLE_TIME_MS):
+        """
+        Initialize async MongoDB connection.
+
+        Args:
+            logger: Optional logger instance. If None, creates a default logger.
+            connection_string: Optional MongoDB URI (default: the production cluster)
+            database: Optional database name (default: MONGO_DATABASE)
+            max_pool_size: Maximum sockets in the client's connection pool
+            max_idle_time_ms: Milliseconds a pooled socket may sit idle before it is closed
+        """
+        if AsyncMongoClient is None:
+            raise ImportError("AsyncMongoDBConnection requires pymongo >= 4.9 or motor (pip install motor)")
+        self.logger = logger or setup_logging()
+        self.connection_string = connection_string
+        self.database_name = database or MONGO_DATABASE
+        self.max_pool_size = max_pool_size
+        self.max_idle_time_ms = max_idle_time_ms
+        self._client = None
+        self._database = None
+
+    def get_client(self):
+        """
+        Get the async MongoDB client (created on first use, bound to the running event loop).
+
+        Async clients cannot be shared across event loops, so unlike MongoDBConnection
+        this client is not borrowed from CLIENT_REGISTRY.
+
+        Returns:
+            AsyncMongoClient (or Motor client) instance.
+        """
+        if self._client is None:
+            self.logger.info("Establishing async MongoDB connection...")
+            options = {
+                'connectTimeoutMS': 30000,
+                'serverSelectionTimeoutMS': 30000,
+                'maxPoolSize': self.max_pool_size,
+                'maxIdleTimeMS': self.max_idle_time_ms,
+            }
+            if self.connection_string is None:
+                self.logger.debug(f"Connecting to: {MONGO_HOST} (database: {self.database_name})")
+                self._client = AsyncMongoClient(MONGO_CONNECTION_STRING, tls=True, tlsAllowInvalidCertificates=True, **options)
+            else:
+                self.logger.debug(f"Connecting to custom URI (database: {self.database_name})")
+                self._client = AsyncMongoClient(self.connection_string, **options)
+            self.logger.info("✓ Async MongoDB connection established successfully")
+        return self._client
+
+    def get_database(self):
+        """
+        Get async MongoDB database instance.
+
+        Returns:
+            Async database instance for 'cuculi_production' (or the configured database).
+        """
+        if self._database is None:
+            self._database = self.get_client()[self.database_name]
+            self.logger.debug(f"Accessing database: {self.database_name}")
+        return self._database
+
+    async def _iter_collection(self, collection: str, label: str, filter: Optional[Dict[str, Any]], limit: Optional[int], batch_size: int, projection: Optional[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream documents from a collection without blocking the event loop.
+
+        Only one cursor batch (batch_size documents) is held in memory at once.
+        """
+        self.logger.info(f"Streaming {label} from MongoDB (filter: {filter}, limit: {limit}, batch_size: {batch_size})...")
+        cursor = self.get_database()[collection].find(filter or {}, projection, batch_size=batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+        count = 0
+        async for document in cursor:
+            count += 1
+            yield document
+        self.logger.info(f"✓ Streamed {count} {label} from '{collection}' collection")
+
+    def get_users(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, projection: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate users from MongoDB asynchronously.
+
+        Args:
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            batch_size: Number of documents fetched per cursor round trip
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+
+        Yields:
+            User documents, one at a time (use with `async for`).
+        """
+        return self._iter_collection('user', 'users', filter, limit, batch_size, projection)
+
+    def get_events(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, projection: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate events from MongoDB asynchronously.
+
+        Args:
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            batch_size: Number of documents fetched per cursor round trip
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+
+        Yields:
+            Event documents, one at a time (use with `async for`).
+        """
+        return self._iter_collection('event', 'events', filter, limit, batch_size, projection)
+
+    def get_orders(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, projection: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate orders from MongoDB asynchronously.
+
+        Args:
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            batch_size: Number of documents fetched per cursor round trip
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+
+        Yields:
+            Order documents, one at a time (use with `async for`).
+        """
+        return self._iter_collection('order', 'orders', filter, limit, batch_size, projection)
+
+    async def read_collection(self, collection: str, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Read all matching documents from a collection into a list.
+
+        Args:
+            collection: Collection name ('user', 'event', 'order')
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            projection: Optional MongoDB projection (None returns whole documents)
+
+        Returns:
+            List of documents.
+        """
+        return [document async for document in self._iter_collection(collection, collection, filter, limit, DEFAULT_BATCH_SIZE, projection)]
+
+    async def close(self):
+        """Close async MongoDB connection."""
+        if self._client:
+            self.logger.debug("Closing async MongoDB connection...")
+            # AsyncMongoClient.close() is a coroutine; Motor's is synchronous
+            result = self._client.close()
+            if inspect.isawaitable(result):
+                await result
+            self._client = None
+            self._database = None
+            self.logger.info("✓ Async MongoDB connection closed")
+
+
+# ============================================================================
+# Async MongoDBPull Class
+# ============================================================================
+
+class AsyncMongoDBPull:
+    """asyncio counterpart of MongoDBPull: non-blocking fetches, shared enrichment."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, connection_string: Optional[str] = None, database: Optional[str] = None, max_pool_size: int = DEFAULT_MAX_POOL_SIZE, max_idle_time_ms: int = DEFAULT_MAX_IDLE_TIME_MS):
+        """
+        Initialize AsyncMongoDBPull.
+
+        Args:
+            logger: Optional logger instance. If None, creates a default logger.
+            connection_string: Optional MongoDB URI (default: the production cluster)
+            database: Optional database name (default: MONGO_DATABASE)
+            max_pool_size: Maximum sockets in the client's connection pool
+            max_idle_time_ms: Milliseconds a pooled socket may sit idle before it is closed
+        """
+        self.logger = logger or setup_logging()
+        self.connection = AsyncMongoDBConnection(self.logger, connection_string=connection_string, database=database, max_pool_size=max_pool_size, max_idle_time_ms=max_idle_time_ms)
+        # Enrichment stages only; its blocking connection is never opened
+        self.pull = MongoDBPull(self.logger, connection_string=connection_string, database=database)
+
+    async def users_events_pull(self, users_filter: Optional[Dict[str, Any]] = None, users_limit: Optional[int] = None, events_filter: Optional[Dict[str, Any]] = None, events_limit: Optional[int] = None, generate_report: bool = True, save_data: bool = True, users_fields: Optional[Iterable[str]] = None, events_fields: Optional[Iterable[str]] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Get fully transformed and enriched users and events without blocking the event loop.
+
+        The three collections are fetched concurrently as asyncio tasks; enrichment,
+        reports and data files then run in a worker thread through
+        MongoDBPull.users_pull/events_pull, so other coroutines keep running throughout.
+
+        Args:
+            users_filter: Optional MongoDB filter for users
+            users_limit: Optional limit on number of users
+            events_filter: Optional MongoDB filter for events
+            events_limit: Optional limit on number of events
+            generate_report: If True, generates timestamped markdown reports in reports/ folder
+            save_data: If True, saves the enriched data to timestamped JSON files in data/ folder
+            users_fields: Extra raw user fields to fetch, or '*' for whole documents
+            events_fields: Extra raw event fields to fetch, or '*' for whole documents
+
+        Returns:
+            Tuple of (enriched_users, enriched_events), equal to MongoDBPull.users_events_pull().
+        """
+        self.logger.info("=" * 80)
+        self.logger.info("STARTING ASYNC USERS AND EVENTS PULL OPERATION")
+        self.logger.info("=" * 80)
+
+        self.logger.info("\nStep 1: Fetching raw data from MongoDB (async, concurrent)...")
+        # Both pulls consume the same documents, so project the union of their fields
+        both = ['users_pull', 'events_pull']
+        fetch_start = time.perf_counter()
+        users, events, orders = await asyncio.gather(
+            self.connection.read_collection('user', users_filter, users_limit, build_projection(both, 'user', users_fields)),
+            self.connection.read_collection('event', events_filter, events_limit, build_projection(both, 'event', events_fields)),
+            self.connection.read_collection('order', projection=build_projection(both, 'order')),
+        )
+        self.logger.info(f"  ✓ Fetched {len(users)} users, {len(events)} events, {len(orders)} orders in {time.perf_counter() - fetch_start:.2f}s")
+
+        self.logger.info("\nStep 2: Enriching users and events in a worker thread...")
+        enriched_users, enriched_events = await asyncio.to_thread(self._enrich, users, events, orders, generate_report, save_data)
+
+        self.logger.info("\n" + "=" * 80)
+        self.logger.info(f"✓ ASYNC USERS AND EVENTS PULL COMPLETED")
+        self.logger.info(f"  - {len(enriched_users)} users enriched")
+        self.logger.info(f"  - {len(enriched_events)} events enriched")
+        self.logger.info("=" * 80)
+
+        return enriched_users, enriched_events
+
+    def _enrich(self, users: List[Dict[str, Any]], events: List[Dict[str, Any]], orders: List[Dict[str, Any]], generate_report: bool, save_data: bool) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Run the blocking enrichment stages on pre-fetched documents"""
+        enriched_users = self.pull.users_pull(generate_report=generate_report, save_data=save_data, users=users, events=events, orders=orders)
+        enriched_events = self.pull.events_pull(generate_report=generate_report, save_data=save_data, users=users, events=events)
+        return enriched_users, enriched_events
+
+    async def close(self):
+        """Close MongoDB connections."""
+        await self.connection.close()
+        self.pull.close()
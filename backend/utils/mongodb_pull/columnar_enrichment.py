@@ -0,0 +1,422 @@
+"""
+Columnar User Enrichment
+
+Opt-in vectorized engine for UserEnrichment.transform_users(). Users, events and orders
+are loaded once into NumPy columns (epoch-microsecond dates, float spend, int counts,
+categorical codes for role and segments) and every derived field is computed in
+vectorized passes. The output is identical to the row-wise enrich_user_profile() path.
+
+Requires numpy (pip install numpy). Enable with transform_users(..., columnar=True) or
+users_pull(..., columnar=True).
+"""
+
+import logging
+from itertools import chain
+from datetime import datetime, timezone, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .mongodb_pull import parse_iso_date
+
+
+# ============================================================================
+# Constants
+# ============================================================================
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+MICROSECONDS_PER_DAY = 86_400_000_000
+NO_DATE = np.iinfo(np.int64).min if np is not None else None
+
+COMPLETENESS_FIELDS = ['interests', 'tableTypePreference', 'homeNeighborhood', 'gender', 'relationship_status']
+
+JOURNEY_STAGES = ["Signed Up Online", "Downloaded App", "Joined Table", "Returned", "Attended"]
+ENGAGEMENT_STATUSES = ["active", "dormant", "churned", "new"]
+VALUE_SEGMENTS = ["VIP", "High Value", "Regular", "Low Value"]
+SOCIAL_ROLES = ["social_leader", "active_participant", "observer"]
+CHURN_RISKS = ["high", "medium", "low"]
+USER_SEGMENTS = ["Dead", "Campaign", "Fresh", "Active", "Dormant", "Inactive", "New"]
+
+
+class NaiveTimestampError(ValueError):
+    """Raised when a timestamp without timezone is found (row-wise path must handle it)."""
+
+
+def _field_filled(field: str, value: Any) -> bool:
+    """Same filled-field rule as UserEnrichment.calculate_completeness()."""
+    if value is None:
+        return False
+    if field == 'interests':
+        return isinstance(value, list) and len(value) > 0 and any(item for item in value if item)
+    if isinstance(value, str):
+        return bool(value.strip())
+    return bool(value)
+
+
+def _order_amount(order: Dict[str, Any]) -> float:
+    """Same price rule as UserEnrichment.calculate_stats()."""
+    price = order.get('price')
+    if isinstance(price, dict):
+        return price.get('total', 0)
+    if isinstance(price, (int, float)):
+        return price
+    return 0
+
+
+# ============================================================================
+# Columnar Enrichment Class
+# ============================================================================
+
+class ColumnarUserEnrichment:
+    """Vectorized equivalent of UserEnrichment.enrich_user_profile() over a whole user list."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """
+        Initialize ColumnarUserEnrichment.
+
+        Args:
+            logger: Optional logger instance
+        """
+        if np is None:
+            raise ImportError("Columnar enrichment requires numpy. Install with: pip install numpy")
+        self.logger = logger or logging.getLogger('MongoDBPull.ColumnarUserEnrichment')
+        self._date_codes: Dict[Any, int] = {}
+        self._date_values: List[Optional[Tuple[int, int, datetime]]] = [None]
+        self.columns: Dict[str, Any] = {}
+        self.derived: Dict[str, Any] = {}
+
+    def _date_code(self, value: Any) -> int:
+        """
+        Get the date-table code for a raw date value, parsing each distinct value once.
+
+        Returns:
+            Index into self._date_values (code 0 is reserved for missing/invalid dates).
+
+        Raises:
+            NaiveTimestampError: If the value parses to a datetime without timezone.
+        """
+        if not value:
+            return 0
+        try:
+            return self._date_codes[value]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable value; parse_iso_date would reject it anyway
+            return 0
+        dt = parse_iso_date(value)
+        if dt is None:
+            code = 0
+        else:
+            if dt.tzinfo is None:
+                raise NaiveTimestampError(f"Timestamp without timezone: {value!r}")
+            code = len(self._date_values)
+            self._date_values.append(((dt - EPOCH) // ONE_MICROSECOND, dt.year, dt))
+        self._date_codes[value] = code
+        return code
+
+    def load(self, users: List[Dict[str, Any]], event_map: Dict[str, List[Dict[str, Any]]], order_map: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Load users and their events/orders into columns.
+
+        Args:
+            users: List of user documents
+            event_map: Dict mapping user_id -> list of events (from index_data_by_user)
+            order_map: Dict mapping user_id -> list of orders (from index_data_by_user)
+
+        Raises:
+            NaiveTimestampError: If any relevant timestamp has no timezone.
+        """
+        n = len(users)
+        uids = [str(user.get('_id', '')) for user in users]
+        user_events = [event_map.get(uid, []) for uid in uids]
+        user_orders = [order_map.get(uid, []) for uid in uids]
+        event_count = np.fromiter(map(len, user_events), dtype=np.int64, count=n)
+        order_count = np.fromiter(map(len, user_orders), dtype=np.int64, count=n)
+
+        # Date table: every distinct date value is parsed once and referenced by code
+        self._date_codes = {}
+        self._date_values = [None]
+
+        # Participations: one entry per (user, event) in event_map order; each distinct
+        # event is resolved once via its object identity
+        flat_events = list(chain.from_iterable(user_events))
+        event_rows = np.repeat(np.arange(n, dtype=np.int64), event_count)
+        event_ids = np.fromiter(map(id, flat_events), dtype=np.int64, count=len(flat_events))
+        unique_ids, first_seen, event_inverse = np.unique(event_ids, return_index=True, return_inverse=True)
+        event_date_codes = np.fromiter(
+            (self._date_code(flat_events[i].get('startDate')) for i in first_seen.tolist()),
+            dtype=np.int64, count=len(unique_ids)
+        )[event_inverse] if len(flat_events) else np.zeros(0, dtype=np.int64)
+
+        # Orders belong to exactly one user, so they are read once each
+        flat_orders = list(chain.from_iterable(user_orders))
+        order_rows = np.repeat(np.arange(n, dtype=np.int64), order_count)
+        order_amounts = np.fromiter(map(_order_amount, flat_orders), dtype=np.float64, count=len(flat_orders))
+        order_date_codes = np.fromiter(
+            (self._date_code(order.get('createdAt')) for order in flat_orders),
+            dtype=np.int64, count=len(flat_orders)
+        )
+
+        created_date_codes = np.fromiter(
+            (self._date_code(user.get('createdAt')) for user in users),
+            dtype=np.int64, count=n
+        )
+
+        date_epochs = np.fromiter(
+            (value[0] if value else NO_DATE for value in self._date_values),
+            dtype=np.int64, count=len(self._date_values)
+        )
+        date_years = np.fromiter(
+            (value[1] if value else 0 for value in self._date_values),
+            dtype=np.int64, count=len(self._date_values)
+        )
+
+        # Activity candidates keep the row-wise scan order (a user's events, then their
+        # orders) so ties on the latest timestamp resolve to the same datetime object
+        act_rows = np.concatenate([event_rows, order_rows])
+        act_codes = np.concatenate([event_date_codes, order_date_codes])
+        has_date = date_epochs[act_codes] != NO_DATE if len(act_codes) else np.zeros(0, dtype=bool)
+        act_rows = act_rows[has_date]
+        act_codes = act_codes[has_date]
+
+        created_epochs = date_epochs[created_date_codes] if n else np.zeros(0, dtype=np.int64)
+        created_years = date_years[created_date_codes] if n else np.zeros(0, dtype=np.int64)
+
+        roles = [user.get('role') for user in users]
+        role_labels = sorted({str(role) for role in roles if role != 'POTENTIAL'})
+        role_labels.insert(0, 'POTENTIAL')  # Code 0 is reserved for journey_stage's role check
+        role_codes = {label: code for code, label in enumerate(role_labels)}
+
+        self.columns = {
+            'n': n,
+            'users': users,
+            'uids': uids,
+            'user_events': user_events,
+            'event_count': event_count,
+            'order_count': order_count,
+            'order_rows': order_rows,
+            'order_amounts': order_amounts,
+            'act_rows': act_rows,
+            'act_codes': act_codes,
+            'act_epochs': date_epochs[act_codes],
+            'created_epoch': created_epochs,
+            'created_year': created_years,
+            'role_labels': role_labels,
+            'role_code': np.fromiter(
+                (0 if role == 'POTENTIAL' else role_codes[str(role)] for role in roles),
+                dtype=np.int64, count=n
+            ),
+            'has_details': np.fromiter(
+                (bool(u.get('interests') or u.get('occupation') or u.get('homeNeighborhood')) for u in users),
+                dtype=bool, count=n
+            ),
+            'filled': sum(
+                np.fromiter((_field_filled(field, u.get(field)) for u in users), dtype=np.int64, count=n)
+                for field in COMPLETENESS_FIELDS
+            ),
+        }
+        self.logger.debug(f"Loaded {n} users, {len(act_codes)} activity timestamps ({len(self._date_values)} distinct), {len(flat_orders)} orders into columns")
+
+    def derive(self, now: Optional[datetime] = None) -> None:
+        """
+        Compute every derived field in vectorized passes.
+
+        Args:
+            now: Reference time (default: current UTC time)
+        """
+        c = self.columns
+        n = c['n']
+        now = now or datetime.now(timezone.utc)
+        now_epoch = (now - EPOCH) // ONE_MICROSECOND
+        event_count = c['event_count']
+        order_count = c['order_count']
+
+        # Spend: bincount accumulates sequentially per user like the row-wise loop,
+        # then Python round() keeps the exact same rounding as calculate_stats()
+        spent_raw = np.bincount(c['order_rows'], weights=c['order_amounts'], minlength=n) if n else np.zeros(0)
+        total_spent_list = [round(value, 2) for value in spent_raw.tolist()]
+        total_spent = np.asarray(total_spent_list, dtype=np.float64)
+
+        # Last activity: max epoch per user, first candidate (scan order) among ties
+        last_epoch = np.full(n, NO_DATE, dtype=np.int64)
+        np.maximum.at(last_epoch, c['act_rows'], c['act_epochs'])
+        has_activity = last_epoch != NO_DATE
+        candidates = np.arange(len(c['act_epochs']))
+        is_max = c['act_epochs'] == last_epoch[c['act_rows']]
+        first_max = np.full(n, len(candidates), dtype=np.int64)
+        np.minimum.at(first_max, c['act_rows'][is_max], candidates[is_max])
+        last_active_code = np.where(has_activity, np.append(c['act_codes'], 0)[first_max], 0)
+
+        days_inactive = np.where(has_activity, (now_epoch - last_epoch) // MICROSECONDS_PER_DAY, 9999)
+
+        has_created = c['created_epoch'] != NO_DATE
+        created_year = c['created_year']
+        days_since_registration = np.where(has_created, (now_epoch - c['created_epoch']) // MICROSECONDS_PER_DAY, 0)
+
+        journey_code = np.select(
+            [
+                c['role_code'] == 0,
+                event_count == 0,
+                (event_count >= 1) & (total_spent == 0),
+                (total_spent > 0) & (event_count > 1),
+                total_spent > 0,
+            ],
+            [0, 1, 2, 3, 4],
+            default=1
+        )
+        engagement_code = np.select(
+            [days_inactive <= 30, days_inactive <= 90, days_inactive != 9999],
+            [0, 1, 2],
+            default=3
+        )
+        value_code = np.select([total_spent >= 2000, total_spent >= 500, total_spent > 0], [0, 1, 2], default=3)
+        social_code = np.select([event_count >= 50, event_count >= 20], [0, 1], default=2)
+        churn_code = np.select([days_inactive >= 180, days_inactive >= 90], [0, 1], default=2)
+        active = event_count > 0
+        segment_code = np.select(
+            [
+                (event_count == 0) & (order_count == 0) & has_created & (created_year < 2025),
+                has_created & (created_year == 2025) & ~c['has_details'],
+                (days_inactive <= 30) & active,
+                (days_inactive <= 90) & active,
+                (days_inactive <= 180) & active,
+                active | (order_count > 0),
+            ],
+            [0, 1, 2, 3, 4, 5],
+            default=6
+        )
+
+        filled = c['filled']
+
+        # Scores (same operation order as calculate_newcomer_score / calculate_reactivation_score)
+        newcomer_event = np.select([event_count == 0, event_count == 1, event_count == 2], [50, 30, 10], default=0)
+        newcomer_completeness = np.minimum(30, (filled / 8) * 30)
+        newcomer_recency = np.select([days_since_registration <= 90, days_since_registration <= 180], [20, 10], default=0)
+        newcomer_score = newcomer_event + newcomer_completeness + newcomer_recency
+
+        reactivation_completeness = np.minimum(40, (filled / 8) * 40)
+        dormancy = np.where(
+            (days_inactive >= 31) & (days_inactive <= 90),
+            30 - ((days_inactive - 31) / 59 * 10),
+            np.where(days_inactive < 31, 15, 5)
+        )
+        history = np.select([event_count >= 5, event_count >= 3, event_count >= 1], [30, 20, 10], default=0)
+        reactivation_score = reactivation_completeness + dormancy + history
+
+        self.derived = {
+            'total_spent': total_spent_list,
+            'has_activity': has_activity,
+            'last_active_code': last_active_code,
+            'days_inactive': days_inactive,
+            'days_since_registration': days_since_registration,
+            'journey_code': journey_code,
+            'engagement_code': engagement_code,
+            'value_code': value_code,
+            'social_code': social_code,
+            'churn_code': churn_code,
+            'segment_code': segment_code,
+            'newcomer_score': newcomer_score,
+            'reactivation_score': reactivation_score,
+        }
+
+    def to_records(self, campaign_qualifier: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """
+        Materialize enriched user dictionaries (same keys and order as enrich_user_profile()).
+
+        Args:
+            campaign_qualifier: Optional CampaignQualification instance
+
+        Returns:
+            List of enriched user dictionaries.
+        """
+        c = self.columns
+        d = self.derived
+        # isoformat() once per distinct latest-activity date
+        last_active_iso = {
+            code: self._date_values[code][2].isoformat()
+            for code in set(d['last_active_code'].tolist()) if code
+        }
+        last_active_iso[0] = None
+        last_codes = d['last_active_code'].tolist()
+        columns = zip(
+            c['users'], c['uids'], c['user_events'],
+            c['event_count'].tolist(), c['order_count'].tolist(), d['total_spent'],
+            last_codes, d['days_inactive'].tolist(),
+            d['journey_code'].tolist(), d['engagement_code'].tolist(), d['value_code'].tolist(),
+            d['social_code'].tolist(), d['churn_code'].tolist(), d['segment_code'].tolist(),
+            d['days_since_registration'].tolist(), c['filled'].tolist()
+        )
+        completeness_labels = [
+            (f"{filled}/{len(COMPLETENESS_FIELDS)} ({int((filled / len(COMPLETENESS_FIELDS)) * 100)}%)", filled >= 4)
+            for filled in range(len(COMPLETENESS_FIELDS) + 1)
+        ]
+
+        enriched_users = []
+        for (user, uid, events, event_count, order_count, spent, last_code, days_inactive,
+             journey, engagement, value, social, churn, segment, days_since_registration, filled) in columns:
+            created_at = user.get('createdAt')
+            cohort = None
+            if created_at:
+                try:
+                    cohort = created_at[:7]  # YYYY-MM format
+                except Exception:
+                    pass
+            comp_score, is_ready = completeness_labels[filled]
+            engagement_status = ENGAGEMENT_STATUSES[engagement]
+            enriched_user = {
+                **user,  # Preserve all original fields
+                "id": uid,
+                "event_count": event_count,
+                "order_count": order_count,
+                "total_order_amount": spent,
+                "total_spent": spent,  # Alias for compatibility
+                "last_active": last_active_iso[last_code],
+                "days_inactive": days_inactive,
+                "journey_stage": JOURNEY_STAGES[journey],
+                "engagement_status": engagement_status,
+                "is_active": engagement_status == "active",
+                "value_segment": VALUE_SEGMENTS[value],
+                "social_role": SOCIAL_ROLES[social],
+                "churn_risk": CHURN_RISKS[churn],
+                "user_segment": USER_SEGMENTS[segment],
+                "cohort": cohort,
+                "days_since_registration": days_since_registration,
+                "profile_completeness": comp_score,
+                "personalization_ready": is_ready
+            }
+            if campaign_qualifier:
+                campaign_qualifier.add_campaign_qualifications_to_user(enriched_user, events)
+            enriched_users.append(enriched_user)
+        return enriched_users
+
+    def scores(self) -> Tuple[List[float], List[float]]:
+        """
+        Get vectorized newcomer and reactivation scores aligned with the loaded users.
+
+        Returns:
+            Tuple of (newcomer_scores, reactivation_scores)
+        """
+        return self.derived['newcomer_score'].tolist(), self.derived['reactivation_score'].tolist()
+
+    def transform(self, users: List[Dict[str, Any]], event_map: Dict[str, List[Dict[str, Any]]], order_map: Dict[str, List[Dict[str, Any]]], campaign_qualifier: Optional[Any] = None, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Load, derive and materialize enriched users in one call.
+
+        Args:
+            users: List of user documents
+            event_map: Dict mapping user_id -> list of events
+            order_map: Dict mapping user_id -> list of orders
+            campaign_qualifier: Optional CampaignQualification instance
+            now: Reference time (default: current UTC time)
+
+        Returns:
+            List of enriched user dictionaries.
+        """
+        self.load(users, event_map, order_map)
+        self.derive(now)
+        return self.to_records(campaign_qualifier)
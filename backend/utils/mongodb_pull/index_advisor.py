@@ -0,0 +1,258 @@
+"""
+Index Advisor
+
+Checks that MongoDB has indexes for the queries the pull layer issues: delta pulls on
+each watermark field of user/event/order, campaign pre-filters on event type/startDate and user createdAt, and the
+user-keyed lookups on event.participants, event.ownerId and order.userId. Each access
+path is run through explain() with the pull layer's projection; paths answered by a
+COLLSCAN are reported and, with create=True, given their recommended index and
+explained again so the before/after plans and timings can be compared.
+
+Run from the backend directory:
+    python -m utils.mongodb_pull indexes            # report only
+    python -m utils.mongodb_pull indexes --create   # create missing indexes
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+
+from bson import ObjectId
+
+from .mongodb_pull import (
+    WATERMARK_FIELDS,
+    MongoDBConnection,
+    build_projection,
+    build_qualification_filter,
+)
+
+
+# ============================================================================
+# Access Paths
+# ============================================================================
+
+def _user_keys(samples: Dict[str, Any]) -> List[Any]:
+    """Sample user id in both stored forms (ObjectId and string)"""
+    return [samples['user_id'], str(samples['user_id'])]
+
+
+def _since(samples: Dict[str, Any], collection: str, field: str) -> Any:
+    """A recent watermark of the same type the collection stores in field"""
+    mark = samples['now'] - timedelta(days=1)
+    return mark.strftime('%Y-%m-%dT%H:%M:%S.000Z') if isinstance(samples.get(f'{collection}_{field}'), str) else mark
+
+
+# Collections DeltaSnapshot keeps current, and the watermark fields that need an index
+# (_id always has one)
+DELTA_COLLECTIONS = ('user', 'event', 'order')
+DELTA_WATERMARK_FIELDS = tuple(field for field in WATERMARK_FIELDS if field != '_id')
+
+
+def _delta_path(collection: str, field: str) -> Dict[str, Any]:
+    """Access path of a delta pull tracking field on collection"""
+    return {
+        'name': f'{collection} delta pull ({field})',
+        'collection': collection,
+        'filter': lambda samples: {field: {'$gte': _since(samples, collection, field)}},
+        'index': [(field, 1)],
+    }
+
+
+# Queries issued by the pull layer, with the index each one needs. filter receives
+# sample values read from the collections (a user _id, watermark field types, now).
+ACCESS_PATHS: Tuple[Dict[str, Any], ...] = (
+    {
+        'name': 'events by participant',
+        'collection': 'event',
+        'filter': lambda samples: {'participants': {'$in': _user_keys(samples)}},
+        'index': [('participants', 1)],
+    },
+    {
+        'name': 'events by owner',
+        'collection': 'event',
+        'filter': lambda samples: {'ownerId': {'$in': _user_keys(samples)}},
+        'index': [('ownerId', 1)],
+    },
+    {
+        'name': 'event campaign pre-filter',
+        'collection': 'event',
+        'filter': lambda samples: build_qualification_filter('event', 'fill_the_table', samples['now']),
+        'index': [('type', 1), ('startDate', 1)],
+    },
+    {
+        'name': 'orders by user',
+        'collection': 'order',
+        'filter': lambda samples: {'userId': {'$in': _user_keys(samples)}},
+        'index': [('userId', 1)],
+    },
+    {
+        'name': 'user campaign pre-filter',
+        'collection': 'user',
+        'filter': lambda samples: build_qualification_filter('user', 'seat_newcomers', samples['now']),
+        'index': [('createdAt', 1)],
+    },
+) + tuple(
+    # A delta filter's $or branch for documents missing the primary field uses these too
+    _delta_path(collection, field) for collection in DELTA_COLLECTIONS for field in DELTA_WATERMARK_FIELDS
+)
+
+
+def plan_stages(explain: Dict[str, Any]) -> List[str]:
+    """
+    List every stage in an explain() result's winning plan.
+
+    Handles both classic plans and slot-based plans (queryPlan nested in winningPlan).
+
+    Args:
+        explain: Output of the explain command
+
+    Returns:
+        Stage names, outermost first (e.g. ['PROJECTION_SIMPLE', 'FETCH', 'IXSCAN']).
+    """
+    stages = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if 'stage' in node:
+                stages.append(node['stage'])
+            for key, value in node.items():
+                if key != 'rejectedPlans':
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(explain.get('queryPlanner', {}).get('winningPlan', {}))
+    return stages
+
+
+# ============================================================================
+# Index Advisor Class
+# ============================================================================
+
+class IndexAdvisor:
+    """Explains the pull layer's access paths and creates the indexes they are missing."""
+
+    def __init__(self, connection: MongoDBConnection, logger: Optional[logging.Logger] = None):
+        """
+        Initialize IndexAdvisor.
+
+        Args:
+            connection: MongoDBConnection for the database to inspect
+            logger: Optional logger instance
+        """
+        self.connection = connection
+        self.logger = logger or logging.getLogger('MongoDBPull.IndexAdvisor')
+
+    def _samples(self) -> Dict[str, Any]:
+        """Read the sample values the access path filters are built from"""
+        database = self.connection.get_database()
+        user = database['user'].find_one({}, {'_id': 1}) or {'_id': ObjectId()}
+        samples = {'now': datetime.now(timezone.utc), 'user_id': user['_id']}
+        for collection in DELTA_COLLECTIONS:
+            for field in DELTA_WATERMARK_FIELDS:
+                document = database[collection].find_one({field: {'$exists': True}}, {field: 1}) or {}
+                samples[f'{collection}_{field}'] = document.get(field)
+        return samples
+
+    def explain(self, collection: str, filter: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Explain a find() with the pull layer's projection for the collection.
+
+        Args:
+            collection: Collection name ('user', 'event', 'order')
+            filter: MongoDB filter
+
+        Returns:
+            Dictionary with stages, collscan, index (name or None), docs_examined,
+            keys_examined, returned and time_ms.
+        """
+        projection = build_projection(['users_pull', 'events_pull'], collection)
+        command = {'find': collection, 'filter': filter}
+        if projection:
+            command['projection'] = projection
+        result = self.connection.get_database().command({'explain': command, 'verbosity': 'executionStats'})
+        stages = plan_stages(result)
+        stats = result.get('executionStats', {})
+        index_names = []
+
+        def collect(node: Any) -> None:
+            if isinstance(node, dict):
+                if 'indexName' in node:
+                    index_names.append(node['indexName'])
+                for value in node.values():
+                    collect(value)
+            elif isinstance(node, list):
+                for item in node:
+                    collect(item)
+
+        collect(result.get('queryPlanner', {}).get('winningPlan', {}))
+        return {
+            'stages': stages,
+            'collscan': 'COLLSCAN' in stages,
+            'index': index_names[0] if index_names else None,
+            'docs_examined': stats.get('totalDocsExamined', 0),
+            'keys_examined': stats.get('totalKeysExamined', 0),
+            'returned': stats.get('nReturned', 0),
+            'time_ms': stats.get('executionTimeMillis', 0),
+        }
+
+    def advise(self, create: bool = False) -> List[Dict[str, Any]]:
+        """
+        Explain every access path and optionally create the missing indexes.
+
+        Args:
+            create: If True, create the recommended index for each path that runs a
+                COLLSCAN, then explain the path again
+
+        Returns:
+            One row per access path: name, collection, index (recommended keys),
+            before (explain summary), after (explain summary, or None if unchanged),
+            created (bool).
+        """
+        samples = self._samples()
+        rows = []
+        for path in ACCESS_PATHS:
+            collection = self.connection.get_database()[path['collection']]
+            filter = path['filter'](samples)
+            before = self.explain(path['collection'], filter)
+            row = {'name': path['name'], 'collection': path['collection'], 'index': path['index'], 'before': before, 'after': None, 'created': False}
+            if before['collscan'] and create:
+                self.logger.info(f"Creating index {path['index']} on '{path['collection']}' for {path['name']}...")
+                collection.create_index(path['index'])
+                row['created'] = True
+                row['after'] = self.explain(path['collection'], filter)
+                self.logger.info(f"✓ Created index on '{path['collection']}'")
+            rows.append(row)
+        return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    """
+    Render advise() rows as a plain-text table.
+
+    Args:
+        rows: Output of IndexAdvisor.advise()
+
+    Returns:
+        Table with the plan, documents examined and execution time before (and after) indexing.
+    """
+    def describe(summary: Optional[Dict[str, Any]]) -> str:
+        if summary is None:
+            return '-'
+        plan = 'COLLSCAN' if summary['collscan'] else f"IXSCAN {summary['index']}"
+        return f"{plan} ({summary['docs_examined']} docs, {summary['time_ms']} ms)"
+
+    def keys(index: List[Tuple[str, int]]) -> str:
+        return ', '.join(f'{field}:{direction}' for field, direction in index)
+
+    header = ('Access path', 'Collection', 'Index', 'Before', 'After')
+    table = [header] + [(row['name'], row['collection'], keys(row['index']), describe(row['before']), describe(row['after'])) for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+    lines = ['  '.join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in table]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    missing = sum(1 for row in rows if row['before']['collscan'] and not row['created'])
+    created = sum(1 for row in rows if row['created'])
+    lines.append('')
+    lines.append(f"{len(rows)} access paths: {created} indexes created, {missing} still run a COLLSCAN")
+    return '\n'.join(lines)
@@ -213,18 +213,32 @@ DERIVED/TRANSFORMED FIELDS:
 ================================================================================
 """
 
+import atexit
+import hashlib
 import logging
 import os
 import sys
 import json
-from pymongo import MongoClient
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pymongo import ASCENDING, IndexModel, MongoClient, UpdateOne
+from pymongo.cursor import Cursor
+from bson.codec_options import CodecOptions, DEFAULT_CODEC_OPTIONS
 from pymongo.database import Database
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from urllib.parse import quote_plus
-from typing import List, Dict, Any, Optional, Tuple
-from collections import defaultdict
-from bson import ObjectId
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+from collections import Counter, defaultdict, deque
+from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from bson import ObjectId, json_util, decode as bson_decode
 import re
+import struct
+from array import array
+from bisect import bisect_left
+from itertools import islice
 
 
 # ============================================================================
@@ -239,6 +253,16 @@ MONGO_DATABASE = "cuculi_production"
 # Connection string
 MONGO_CONNECTION_STRING = f"mongodb+srv://{MONGO_USERNAME}:{quote_plus(MONGO_PASSWORD)}@{MONGO_HOST}/?retryWrites=true&w=majority"
 
+# Default cursor batch size for streaming reads (documents per round trip)
+DEFAULT_BATCH_SIZE = 1000
+
+# _id-range partitions streaming reads (iter_*) read ahead of the one being yielded
+DEFAULT_PREFETCH_PARTITIONS = 1
+
+# Connection pool settings for shared clients (see MongoClientRegistry)
+DEFAULT_MAX_POOL_SIZE = 50
+DEFAULT_MAX_IDLE_TIME_MS = 300000
+
 
 # ============================================================================
 # Logging Setup
@@ -295,42 +319,947 @@ def setup_logging(log_dir: Optional[str] = None, logger_name: str = 'MongoDBPull
     return logger
 
 
+# ============================================================================
+# Field Requirements Registry
+# ============================================================================
+
+# Raw fields each stage reads, per collection. Projections for a pull are the
+# union of its stages' fields, so documents only carry what is actually used.
+# '_id' is always returned by MongoDB and is not listed.
+FIELD_REQUIREMENTS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    # UserEnrichment: stats, segments, completeness, engagement
+    'user_enrichment': {
+        'user': ('role', 'createdAt', 'interests', 'tableTypePreference', 'homeNeighborhood',
+                 'gender', 'relationship_status', 'occupation'),
+        'event': ('participants', 'ownerId', 'startDate'),
+        'order': ('userId', 'price', 'createdAt'),
+    },
+    # CampaignQualification (users and events)
+    'campaign_qualification': {
+        'user': ('interests',),
+        'event': ('type', 'startDate', 'maxParticipants', 'participants', 'participantCount',
+                  'participationPercentage'),
+    },
+    # SummaryGeneration.generate_user_summary
+    'user_summary': {
+        'user': ('firstName', 'lastName', 'interests', 'occupation', 'homeNeighborhood', 'gender',
+                 'relationshipStatus', 'cuisines', 'tableTypePreference', 'eventCount', 'createdAt',
+                 'birthDay'),
+    },
+    # SocialConnection: connections, event history, interest analysis
+    'social_connection': {
+        'event': ('name', 'participants', 'ownerId', 'startDate', 'categories', 'features',
+                  'venueName', 'venue', 'type'),
+    },
+    # EventTransformation: participant demographics and participation
+    'event_transformation': {
+        'user': ('interests', 'occupation', 'homeNeighborhood'),
+        'event': ('name', 'participants', 'maxParticipants'),
+    },
+    # SummaryGeneration.generate_event_summary
+    'event_summary': {
+        'event': ('name', 'description', 'startDate', 'venue', 'venueName', 'neighborhood',
+                  'categories', 'features', 'participationPercentage', 'maxParticipants',
+                  'participantCount', 'participants'),
+    },
+    # ReportGeneration.generate_events_report
+    'event_report': {
+        'event': ('eventStatus', 'type', 'participants', 'participantCount', 'maxParticipants',
+                  'participationPercentage'),
+    },
+    # Raw fields read by the campaigns in run/campaigns_run from pulled users/events
+    'campaigns': {
+        'user': ('firstName', 'lastName', 'email', 'phone', 'eventCount', 'last_event_date'),
+        'event': ('name', 'participants', 'maxParticipants', 'participationPercentage'),
+    },
+    # Airtable sync of the users/events the campaign runners save (raw columns of
+    # USERS_FIELD_MAPPING and EVENTS_FIELD_MAPPING in utils/airtable_sync)
+    'airtable_sync': {
+        'user': ('email', 'firstName', 'lastName', 'phone', 'role', 'gender', 'birthDay', 'occupation',
+                 'homeNeighborhood', 'interests', 'tableTypePreference', 'profile_ready',
+                 'createdAt', 'updatedAt'),
+        'event': ('name', 'description', 'startDate', 'endDate', 'location', 'eventType', 'cuisine',
+                  'tableType', 'maxCapacity', 'price', 'createdAt', 'updatedAt'),
+    },
+}
+
+# Stages that run in each pull
+PULL_STAGES: Dict[str, Tuple[str, ...]] = {
+    'users_pull': ('user_enrichment', 'campaign_qualification', 'user_summary', 'social_connection', 'campaigns', 'airtable_sync'),
+    'events_pull': ('event_transformation', 'campaign_qualification', 'event_summary', 'event_report', 'campaigns', 'airtable_sync'),
+}
+
+# fields= value that disables projection and fetches whole documents
+ALL_FIELDS = '*'
+
+
+def build_projection(pulls: Iterable[str], collection: str, fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, int]]:
+    """
+    Build a MongoDB projection for a collection from the field-requirements registry.
+    
+    Args:
+        pulls: Pull names from PULL_STAGES whose stages will consume the documents
+        collection: Collection name ('user', 'event', 'order')
+        fields: Optional extra raw fields to keep (e.g. for downstream consumers),
+            or ALL_FIELDS ('*') to fetch whole documents
+            
+    Returns:
+        Inclusion projection dict (e.g. {'firstName': 1, ...}), or None for whole documents.
+    """
+    if fields == ALL_FIELDS:
+        return None
+    
+    required = set(fields or ())
+    for pull in pulls:
+        for stage in PULL_STAGES[pull]:
+            required.update(FIELD_REQUIREMENTS[stage].get(collection, ()))
+    
+    # A parent path makes its sub-paths redundant (and MongoDB rejects both together)
+    paths = sorted(required)
+    return {path: 1 for path in paths if not any(path.startswith(f"{other}.") for other in paths)}
+
+
+# ============================================================================
+# Server-Side Aggregation Pipelines
+# ============================================================================
+
+# Number of entries kept in each participant top list (interests, occupations, neighborhoods)
+PARTICIPANT_TOP_K = 5
+
+# Participant index multiplier used to order first occurrences (participant, interest)
+_OCCURRENCE_STRIDE = 1_000_000
+
+# BSON types pymongo decodes to int/float; calculate_stats skips other prices (e.g. decimal)
+_PYTHON_NUMBER_TYPES = ['double', 'int', 'long']
+
+# User IDs per $in query in scoped fetches (each ID is matched in both stored forms)
+SCOPED_FETCH_CHUNK_SIZE = 500
+
+# Order stats for users without orders
+EMPTY_ORDER_STATS: Dict[str, Any] = {'order_count': 0, 'total_spent': 0.0, 'last_order': None}
+
+
+def _to_string(expr: Any) -> Dict[str, Any]:
+    """Aggregation expression converting a value to string (None when not convertible)."""
+    return {'$convert': {'input': expr, 'to': 'string', 'onError': None, 'onNull': None}}
+
+
+def _truthy(expr: Any) -> Dict[str, Any]:
+    """Aggregation expression mirroring Python truthiness for scalar fields."""
+    value = {'$ifNull': [expr, '']}
+    return {'$and': [{'$ne': [value, '']}, {'$ne': [value, False]}, {'$ne': [value, 0]}]}
+
+
+def build_order_stats_pipeline() -> List[Dict[str, Any]]:
+    """
+    Build the aggregation computing per-user order stats (the order half of
+    UserEnrichment.calculate_stats) inside MongoDB.
+    
+    Returns:
+        Pipeline yielding one row per user: {_id: user_id, order_count, total_spent, last_order}.
+    """
+    return [
+        {'$project': {
+            '_id': 0,
+            'uid': _to_string('$userId'),
+            # price is either {'total': x} or a bare int/float ($isNumber would also take Decimal128)
+            'amount': {'$switch': {
+                'branches': [
+                    {'case': {'$eq': [{'$type': '$price'}, 'object']}, 'then': {'$ifNull': ['$price.total', 0]}},
+                    {'case': {'$in': [{'$type': '$price'}, _PYTHON_NUMBER_TYPES]}, 'then': '$price'},
+                ],
+                'default': 0,
+            }},
+            'created_at': {'$convert': {'input': '$createdAt', 'to': 'date', 'onError': None, 'onNull': None}},
+        }},
+        {'$match': {'uid': {'$nin': [None, '', 'None']}}},
+        {'$group': {
+            '_id': '$uid',
+            'order_count': {'$sum': 1},
+            'total_spent': {'$sum': '$amount'},
+            'last_order': {'$max': '$created_at'},
+        }},
+    ]
+
+
+def build_event_demographics_pipeline(event_ids: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Build the aggregation counting participant signals
+    (EventTransformation.enrich_event_with_participants) inside MongoDB.
+    
+    Participants are unwound and joined to 'user' with $lookup (matching both ObjectId
+    and string ids). Raw values are counted per event and BSON type, with the position
+    at which the Python path first meets them (participant order, then interest order).
+    Lowercasing and the top lists are left to fold_demographic_values: $toLower only
+    folds ASCII and $convert formats doubles unlike str() (1.0 becomes '1').
+    
+    Args:
+        event_ids: _id values of the events to analyze
+        
+    Returns:
+        Pipeline yielding rows {event: event_id_string, dimension: 'interests' |
+        'occupations' | 'neighborhoods', values: [[value, count, first_position], ...]}.
+    """
+    interests = {'$cond': [{'$isArray': '$user.interests'}, '$user.interests', []]}
+    position = {'$multiply': ['$p_idx', _OCCURRENCE_STRIDE]}
+    
+    def single(dimension: str, field: str) -> Dict[str, Any]:
+        return {'$cond': [
+            _truthy(field),
+            [{'d': dimension, 'v': field, 'pos': position}],
+            [],
+        ]}
+    
+    return [
+        {'$match': {'_id': {'$in': event_ids}}},
+        {'$project': {'participants': 1}},
+        {'$unwind': {'path': '$participants', 'includeArrayIndex': 'p_idx'}},
+        {'$addFields': {'participant_keys': [
+            {'$convert': {'input': '$participants', 'to': 'objectId', 'onError': None, 'onNull': None}},
+            _to_string('$participants'),
+        ]}},
+        {'$lookup': {'from': 'user', 'localField': 'participant_keys', 'foreignField': '_id', 'as': 'user'}},
+        {'$unwind': '$user'},
+        {'$project': {'signals': {'$concatArrays': [
+            {'$map': {
+                'input': {'$range': [0, {'$size': interests}]},
+                'as': 'i',
+                'in': {
+                    'd': 'interests',
+                    'v': {'$arrayElemAt': [interests, '$$i']},
+                    'pos': {'$add': [position, '$$i']},
+                },
+            }},
+            single('occupations', '$user.occupation'),
+            single('neighborhoods', '$user.homeNeighborhood'),
+        ]}}},
+        {'$unwind': '$signals'},
+        # Grouping by type keeps values str() tells apart (1 and 1.0) in separate rows
+        {'$group': {
+            '_id': {'event': '$_id', 'd': '$signals.d', 't': {'$type': '$signals.v'}, 'v': '$signals.v'},
+            'count': {'$sum': 1},
+            'pos': {'$min': '$signals.pos'},
+        }},
+        {'$group': {'_id': {'event': '$_id.event', 'd': '$_id.d'}, 'values': {'$push': ['$_id.v', '$count', '$pos']}}},
+        {'$project': {'_id': 0, 'event': _to_string('$_id.event'), 'dimension': '$_id.d', 'values': 1}},
+    ]
+
+
+def fold_demographic_values(values: Iterable[Any], top_k: int = PARTICIPANT_TOP_K) -> List[Tuple[str, int]]:
+    """
+    Turn build_event_demographics_pipeline counts into a participant top list.
+    
+    Values are keyed by str(value).lower(), like the Python path, and counts of values
+    that fold together (e.g. 'Café' and 'CAFÉ') are merged. Ties keep first-occurrence
+    order.
+    
+    Args:
+        values: [value, count, first_position] entries of one event and dimension
+        top_k: Entries kept
+        
+    Returns:
+        List of (value, count) tuples, highest count first.
+    """
+    counts: Dict[str, int] = {}
+    first: Dict[str, int] = {}
+    for value, count, position in values:
+        key = str(value).lower()
+        counts[key] = counts.get(key, 0) + count
+        first[key] = min(first.get(key, position), position)
+    return sorted(counts.items(), key=lambda item: (-item[1], first[item[0]]))[:top_k]
+
+
+def build_partition_filters(buckets: List[Dict[str, Any]], filter: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Turn $bucketAuto output over _id into contiguous _id range filters.
+    
+    The first range is open below and the last open above, so together they cover
+    every document matched by filter. Ranges are returned in ascending _id order.
+    
+    Args:
+        buckets: $bucketAuto rows ({_id: {min, max}, count}) sorted by _id
+        filter: Optional MongoDB filter each range is combined with
+        
+    Returns:
+        List of filters (one per partition), or None when the _ids do not share a
+        single type (range queries are type-bracketed and would skip documents).
+    """
+    if not buckets:
+        return None
+    if len({type(bucket['_id']['min']) for bucket in buckets} | {type(buckets[-1]['_id']['max'])}) != 1:
+        return None
+    
+    filters = []
+    for index, bucket in enumerate(buckets):
+        id_range = {}
+        if index > 0:
+            id_range['$gte'] = bucket['_id']['min']
+        if index < len(buckets) - 1:
+            id_range['$lt'] = buckets[index + 1]['_id']['min']
+        range_filter = {'_id': id_range} if id_range else {}
+        filters.append({'$and': [filter, range_filter]} if filter else range_filter)
+    return filters
+
+
+def build_scope_filters(collection: str, user_ids: Iterable[Any], chunk_size: int = SCOPED_FETCH_CHUNK_SIZE) -> List[Dict[str, Any]]:
+    """
+    Build filters for the events or orders that belong to a set of users.
+    
+    Events match when a user is a participant or the owner; orders when the user
+    placed them. User references are stored both as ObjectIds and as strings, so each
+    ID is matched in both forms.
+    
+    Args:
+        collection: 'event' or 'order'
+        user_ids: _id values of the selected users
+        chunk_size: Users per filter, keeping each $in list bounded
+        
+    Returns:
+        List of filters (one per chunk of users); empty when there are no users.
+    """
+    fields = {'event': ('participants', 'ownerId'), 'order': ('userId',)}[collection]
+    user_ids = list(dict.fromkeys(user_ids))
+    filters = []
+    for start in range(0, len(user_ids), chunk_size):
+        keys = []
+        for user_id in user_ids[start:start + chunk_size]:
+            keys.append(user_id)
+            if isinstance(user_id, ObjectId):
+                keys.append(str(user_id))
+            elif isinstance(user_id, str) and ObjectId.is_valid(user_id):
+                keys.append(ObjectId(user_id))
+        clauses = [{field: {'$in': keys}} for field in fields]
+        filters.append(clauses[0] if len(clauses) == 1 else {'$or': clauses})
+    return filters
+
+
+# ============================================================================
+# MongoClient Registry
+# ============================================================================
+
+class MongoClientRegistry:
+    """
+    Process-wide cache of MongoClients keyed by connection string and client options.
+    
+    Connections borrow a client with acquire() and hand it back with release(). A
+    client stays open (with its warm pool) while it has no borrowers, so the next
+    pull in the same process skips the TLS handshake; close_idle() and close_all()
+    close unborrowed and all clients respectively.
+    """
+    
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the registry.
+        
+        Args:
+            logger: Optional logger instance
+        """
+        self.logger = logger or logging.getLogger('MongoDBPull.ClientRegistry')
+        self._clients: Dict[Tuple, MongoClient] = {}
+        self._references: Dict[Tuple, int] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(connection_string: str, options: Dict[str, Any]) -> Tuple:
+        """Registry key for a connection string and client options"""
+        return (connection_string, tuple(sorted(options.items())))
+    
+    def acquire(self, connection_string: str, **options: Any) -> MongoClient:
+        """
+        Borrow the shared client for a connection string and options, creating it if needed.
+        
+        Args:
+            connection_string: MongoDB URI
+            **options: MongoClient keyword options (pool size, timeouts, TLS settings)
+            
+        Returns:
+            Shared MongoClient instance. Call release() when done with it.
+        """
+        key = self._key(connection_string, options)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = MongoClient(connection_string, **options)
+                self._clients[key] = client
+                self._references[key] = 0
+                self.logger.debug(f"Created shared MongoClient ({len(self._clients)} in registry)")
+            self._references[key] += 1
+            self.logger.debug(f"Borrowed shared MongoClient ({self._references[key]} borrowers)")
+        return client
+    
+    def release(self, client: MongoClient) -> None:
+        """
+        Return a borrowed client. The client stays open for the next borrower.
+        
+        Args:
+            client: Client previously returned by acquire()
+        """
+        with self._lock:
+            for key, shared in self._clients.items():
+                if shared is client:
+                    self._references[key] = max(self._references[key] - 1, 0)
+                    self.logger.debug(f"Released shared MongoClient ({self._references[key]} borrowers)")
+                    return
+    
+    def references(self, client: MongoClient) -> int:
+        """Number of connections currently borrowing client (0 if not in the registry)"""
+        with self._lock:
+            for key, shared in self._clients.items():
+                if shared is client:
+                    return self._references[key]
+        return 0
+    
+    def close_idle(self) -> int:
+        """
+        Close and drop every client that has no borrowers.
+        
+        Returns:
+            Number of clients closed.
+        """
+        with self._lock:
+            idle = [key for key, count in self._references.items() if count == 0]
+            for key in idle:
+                self._clients.pop(key).close()
+                del self._references[key]
+        if idle:
+            self.logger.debug(f"Closed {len(idle)} idle MongoClient(s)")
+        return len(idle)
+    
+    def close_all(self) -> None:
+        """Close and drop every client, borrowed or not (runs at interpreter exit)"""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+            self._references.clear()
+
+
+# Shared by every MongoDBConnection in the process unless one is given a registry
+CLIENT_REGISTRY = MongoClientRegistry()
+atexit.register(CLIENT_REGISTRY.close_all)
+
+
+# ============================================================================
+# Lazy BSON Documents
+# ============================================================================
+
+# Collections read as LazyDocuments when MongoDBConnection(lazy_decode=True)
+LAZY_COLLECTIONS: Tuple[str, ...] = ('event', 'order')
+
+_INT32 = struct.Struct('<i')
+_DOUBLE = struct.Struct('<d')
+
+# Value sizes of fixed-width BSON element types (double, ObjectId, bool, datetime,
+# null, int32, timestamp, int64, decimal128, undefined, min/max key)
+_FIXED_SIZES = {0x01: 8, 0x07: 12, 0x08: 1, 0x09: 8, 0x0A: 0, 0x10: 4, 0x11: 8, 0x12: 8, 0x13: 16, 0x06: 0, 0x7F: 0, 0xFF: 0}
+
+
+def _next_element(raw: bytes, position: int) -> Tuple[str, int, int]:
+    """
+    Locate the BSON element starting at position without decoding its value.
+    
+    Args:
+        raw: BSON bytes of one document
+        position: Offset of the element's type byte
+        
+    Returns:
+        Tuple of (field name, offset of its value, offset just past the element).
+    """
+    element_type = raw[position]
+    key_end = raw.index(b'\x00', position + 1)
+    value = key_end + 1
+    if element_type in _FIXED_SIZES:
+        size = _FIXED_SIZES[element_type]
+    elif element_type in (0x02, 0x0D, 0x0E):  # string, code, symbol
+        size = 4 + _INT32.unpack_from(raw, value)[0]
+    elif element_type in (0x03, 0x04, 0x0F):  # document, array, code with scope
+        size = _INT32.unpack_from(raw, value)[0]
+    elif element_type == 0x05:  # binary: length, subtype, bytes
+        size = 5 + _INT32.unpack_from(raw, value)[0]
+    elif element_type == 0x0B:  # regex: pattern and options cstrings
+        size = raw.index(b'\x00', raw.index(b'\x00', value) + 1) + 1 - value
+    elif element_type == 0x0C:  # DBPointer: string and ObjectId
+        size = 16 + _INT32.unpack_from(raw, value)[0]
+    else:
+        raise ValueError(f"Unknown BSON element type 0x{element_type:02x}")
+    return raw[position + 1:key_end].decode('utf-8'), value, value + size
+
+
+class LazyDocument(MutableMapping):
+    """
+    Dictionary-like view of a raw BSON document that decodes each field on first access.
+    
+    Reads of a few fields from wide documents (events, orders) skip decoding the rest:
+    elements are located only as far into the document as the requested field, and
+    each field is decoded (with the collection's codec options, so values equal a
+    normal find()) and cached when first read. Assignments and deletes apply to the
+    decoded view; raw is unchanged.
+    """
+    
+    __slots__ = ('raw', '_codec_options', '_scalars', '_offsets', '_position', '_values', '_decoded')
+    
+    def __init__(self, raw: bytes, codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS):
+        """
+        Initialize LazyDocument.
+        
+        Args:
+            raw: BSON bytes of one document
+            codec_options: Codec options to decode values with
+        """
+        self.raw = raw
+        self._codec_options = codec_options
+        # Scalars are decoded in Python unless custom type decoders are registered
+        self._scalars = codec_options.type_registry == DEFAULT_CODEC_OPTIONS.type_registry
+        self._offsets: Dict[str, Tuple[int, int, int]] = {}  # located, not yet decoded
+        self._position = 4  # first element not yet located
+        self._values: Dict[str, Any] = {}
+        self._decoded = False
+    
+    def _locate(self, key: Optional[str] = None) -> None:
+        """Locate elements until key is found (every element when key is None)"""
+        raw, offsets, position = self.raw, self._offsets, self._position
+        end = len(raw) - 1
+        while position < end:
+            name, value, element_end = _next_element(raw, position)
+            offsets[name] = (position, value, element_end)
+            position = element_end
+            if name == key:
+                break
+        self._position = position
+    
+    def _decode(self, key: str, start: int, value: int, end: int) -> Any:
+        """Decode one element"""
+        raw = self.raw
+        element_type = raw[start]
+        if self._scalars:
+            if element_type == 0x02:
+                return raw[value + 4:end - 1].decode('utf-8', self._codec_options.unicode_decode_error_handler)
+            if element_type == 0x07:
+                return ObjectId(raw[value:end])
+            if element_type == 0x10:
+                return _INT32.unpack_from(raw, value)[0]
+            if element_type == 0x01:
+                return _DOUBLE.unpack_from(raw, value)[0]
+            if element_type == 0x08:
+                return raw[value] == 1
+            if element_type == 0x0A:
+                return None
+        return bson_decode(_INT32.pack(end - start + 5) + raw[start:end] + b'\x00', self._codec_options)[key]
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if key not in self._offsets:
+            self._locate(key)
+        start, value, end = self._offsets.pop(key)
+        decoded = self._values[key] = self._decode(key, start, value, end)
+        return decoded
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._locate()
+        self._offsets.pop(key, None)
+        self._values[key] = value
+    
+    def __delitem__(self, key: str) -> None:
+        self._locate()
+        if key in self._values:
+            del self._values[key]
+        else:
+            del self._offsets[key]
+    
+    def __contains__(self, key: object) -> bool:
+        if key in self._values or key in self._offsets:
+            return True
+        self._locate(key)
+        return key in self._offsets
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def __iter__(self) -> Iterator[str]:
+        # Iterating reads every field, so decode them all (in document order) at once
+        return iter(self.to_dict())
+    
+    def __len__(self) -> int:
+        self._locate()
+        return len(self._values) + len(self._offsets)
+    
+    def __repr__(self) -> str:
+        return f"LazyDocument({self.to_dict()!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Decode every remaining field.
+        
+        Returns:
+            The document as a plain dict. The same dict is returned on later calls and
+            backs this view, so it reflects (and receives) later assignments.
+        """
+        if self._decoded:
+            return self._values
+        # Rebuild in document order, keeping values already read (and possibly mutated)
+        self._locate()
+        document = {}
+        for key, value in bson_decode(self.raw, self._codec_options).items():
+            if key in self._values:
+                document[key] = self._values.pop(key)
+            elif key in self._offsets:
+                document[key] = value
+        document.update(self._values)
+        self._values = document
+        self._offsets = {}
+        self._decoded = True
+        return self._values
+
+
+def iter_lazy_documents(batches: Iterable[bytes], codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS) -> Iterator[LazyDocument]:
+    """
+    Split raw cursor batches (find_raw_batches) into LazyDocuments.
+    
+    Args:
+        batches: Concatenated BSON documents, one bytes object per server batch
+        codec_options: Codec options to decode values with
+    
+    Yields:
+        One LazyDocument per document, in cursor order.
+    """
+    for batch in batches:
+        position = 0
+        while position < len(batch):
+            size = _INT32.unpack_from(batch, position)[0]
+            yield LazyDocument(batch[position:position + size], codec_options)
+            position += size
+
+
+def materialize(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a plain dict for a document that may be a LazyDocument.
+    
+    Args:
+        document: dict or LazyDocument
+    
+    Returns:
+        The document itself, or the LazyDocument's fully decoded dict.
+    """
+    return document.to_dict() if isinstance(document, LazyDocument) else document
+
+
+# ============================================================================
+# Data Sources
+# ============================================================================
+
+# Extended JSON options for snapshot files (keeps ObjectId/datetime types, naive datetimes like pymongo)
+SNAPSHOT_JSON_OPTIONS = json_util.JSONOptions(json_mode=json_util.JSONMode.RELAXED, tz_aware=False)
+
+
+def _filter_value(document: Dict[str, Any], path: str) -> Any:
+    """Value at a dotted path of a document (None when absent)"""
+    value: Any = document
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _comparable(value: Any, bound: Any) -> bool:
+    """Whether MongoDB would compare two values in a range query (same BSON type bracket)"""
+    if isinstance(value, bool) or isinstance(bound, bool):
+        return isinstance(value, bool) and isinstance(bound, bool)
+    if isinstance(value, (int, float)) and isinstance(bound, (int, float)):
+        return True
+    return type(value) is type(bound)
+
+
+def _utc(value: Any) -> Any:
+    """Treat naive datetimes as UTC (as stored by MongoDB) so they compare with aware ones"""
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _matches_condition(value: Any, operator: str, bound: Any) -> bool:
+    """Evaluate one query operator against a field value (arrays match element-wise)"""
+    if operator == '$in':
+        values = value if isinstance(value, list) else [value]
+        return any(v in bound for v in values) or (value is None and None in bound)
+    if operator == '$nin':
+        return not _matches_condition(value, '$in', bound)
+    if operator == '$eq':
+        return value == bound or (isinstance(value, list) and bound in value)
+    if operator == '$ne':
+        return not _matches_condition(value, '$eq', bound)
+    if operator in ('$gt', '$gte', '$lt', '$lte'):
+        values = value if isinstance(value, list) else [value]
+        for v in values:
+            if not _comparable(v, bound):
+                continue
+            v, b = _utc(v), _utc(bound)
+            if (operator == '$gt' and v > b) or (operator == '$gte' and v >= b) or (operator == '$lt' and v < b) or (operator == '$lte' and v <= b):
+                return True
+        return False
+    raise ValueError(f"Unsupported query operator for in-process filtering: {operator}")
+
+
+def match_filter(document: Dict[str, Any], filter: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a MongoDB query filter against a document in process.
+    
+    Covers what the pulls generate: $and/$or, equality (including None for a missing
+    field), $in/$nin, $eq/$ne and $gt/$gte/$lt/$lte with MongoDB's type bracketing,
+    on top-level or dotted fields.
+    
+    Args:
+        document: Document to test
+        filter: MongoDB filter (None or {} matches everything)
+        
+    Returns:
+        True if the document matches.
+    """
+    for field, condition in (filter or {}).items():
+        if field == '$and':
+            if not all(match_filter(document, clause) for clause in condition):
+                return False
+        elif field == '$or':
+            if not any(match_filter(document, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(key.startswith('$') for key in condition):
+            value = _filter_value(document, field)
+            if not all(_matches_condition(value, operator, bound) for operator, bound in condition.items()):
+                return False
+        elif not _matches_condition(_filter_value(document, field), '$eq', condition):
+            return False
+    return True
+
+
+class DataSource(ABC):
+    """
+    Read API the pulls load users, events and orders through.
+    
+    Implementations: MongoDBConnection (live MongoDB), SnapshotSource (a SnapshotStore
+    directory) and MemorySource (in-memory fixtures). Only read_collection
+    is abstract. Server-side aggregations and write-backs need a MongoDBConnection.
+    """
+    
+    @abstractmethod
+    def read_collection(self, collection: str, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None, lazy: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Read documents from a collection.
+        
+        Args:
+            collection: Collection name ('user', 'event', 'order')
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            projection: Optional MongoDB projection
+            partitions: Parallel partitions (sources that cannot partition ignore it)
+            lazy: Lazy decoding override (sources that cannot decode lazily ignore it)
+            
+        Returns:
+            List of documents.
+        """
+    
+    def get_users(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read users (see read_collection)."""
+        return self.read_collection('user', filter=filter, limit=limit, projection=projection, partitions=partitions)
+    
+    def get_events(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read events (see read_collection)."""
+        return self.read_collection('event', filter=filter, limit=limit, projection=projection, partitions=partitions)
+    
+    def get_orders(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read orders (see read_collection)."""
+        return self.read_collection('order', filter=filter, limit=limit, projection=projection, partitions=partitions)
+    
+    def iter_users(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over users (see read_collection); batch_size is a hint."""
+        return iter(self.get_users(filter=filter, limit=limit, projection=projection, partitions=partitions))
+    
+    def aggregate_order_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Server-side order stats; only available on MongoDBConnection."""
+        raise NotImplementedError(f"{type(self).__name__} cannot aggregate server-side; use server_side=False")
+    
+    def aggregate_event_demographics(self, event_ids: List[Any], top_k: int = PARTICIPANT_TOP_K) -> Dict[str, Dict[str, List[Tuple[str, int]]]]:
+        """Server-side participant demographics; only available on MongoDBConnection."""
+        raise NotImplementedError(f"{type(self).__name__} cannot aggregate server-side; use server_side=False")
+    
+    def close(self) -> None:
+        """Release resources held by the source (nothing by default)."""
+
+
+class MemorySource(DataSource):
+    """
+    Serves documents held in memory, filtered in process with match_filter.
+    
+    Returned documents are new top-level dicts in stored order; nested values are
+    shared with the fixture (the pulls do not modify them).
+    """
+    
+    def __init__(self, collections: Optional[Dict[str, List[Dict[str, Any]]]] = None, logger: Optional[logging.Logger] = None):
+        """
+        Initialize MemorySource.
+        
+        Args:
+            collections: Documents per collection name, e.g. {'user': [...], 'event': [...], 'order': [...]}
+            logger: Optional logger instance
+        """
+        self.collections: Dict[str, List[Dict[str, Any]]] = dict(collections or {})
+        self.logger = logger or logging.getLogger('MongoDBPull.MemorySource')
+    
+    def _documents(self, collection: str) -> List[Dict[str, Any]]:
+        """Stored documents of a collection (a missing collection is empty, as in MongoDB)"""
+        return self.collections.get(collection, [])
+    
+    def read_collection(self, collection: str, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None, lazy: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Read documents from a collection (see DataSource.read_collection).
+        """
+        documents = []
+        for document in self._documents(collection):
+            if filter and not match_filter(document, filter):
+                continue
+            documents.append(_project_document(document, projection))
+            if limit and len(documents) >= limit:
+                break
+        self.logger.info(f"✓ Read {len(documents)} {collection} documents from {type(self).__name__}")
+        return documents
+
+
+def _bson_json_default(value: Any) -> Any:
+    """Extended JSON form of BSON values ({'$oid': ...}, {'$date': ...}) for SnapshotStore datasets"""
+    return json_util.default(value, json_options=SNAPSHOT_JSON_OPTIONS)
+
+
+def _bson_json_hook(document: Dict[str, Any]) -> Any:
+    """Restore BSON values written by _bson_json_default (naive UTC datetimes, like pymongo)"""
+    return json_util.object_hook(document, json_options=SNAPSHOT_JSON_OPTIONS)
+
+
+class SnapshotSource(MemorySource):
+    """
+    Serves collections from a SnapshotStore directory, for offline runs.
+    
+    Each collection is the store dataset of the same name (user.arrow, event.arrow,
+    order.arrow), read once, on first use, with ObjectIds and datetimes restored.
+    save_snapshot() writes a directory this source can read. Requires pyarrow.
+    """
+    
+    def __init__(self, snapshot_dir: str, logger: Optional[logging.Logger] = None):
+        """
+        Initialize SnapshotSource.
+        
+        Args:
+            snapshot_dir: SnapshotStore directory holding the collection datasets
+            logger: Optional logger instance
+        """
+        from .snapshot_store import SnapshotStore
+        super().__init__(logger=logger or logging.getLogger('MongoDBPull.SnapshotSource'))
+        self.snapshot_dir = snapshot_dir
+        self.store = SnapshotStore(snapshot_dir, self.logger)
+    
+    def _documents(self, collection: str) -> List[Dict[str, Any]]:
+        """Load a collection's dataset on first use"""
+        if collection not in self.collections:
+            names = self.store.names()
+            if collection not in names:
+                raise FileNotFoundError(f"No snapshot of '{collection}' in {self.snapshot_dir} (datasets: {', '.join(names) or 'none'})")
+            self.collections[collection] = self.store.read(collection, object_hook=_bson_json_hook)
+            self.logger.debug(f"Loaded {len(self.collections[collection])} {collection} documents from {self.snapshot_dir}")
+        return self.collections[collection]
+
+
+def save_snapshot(source: DataSource, snapshot_dir: str, collections: Iterable[str] = ('user', 'event', 'order')) -> Dict[str, int]:
+    """
+    Copy whole collections from a source into a SnapshotStore that SnapshotSource can read.
+    
+    ObjectIds and datetimes are stored as Extended JSON, so they read back with
+    their BSON types.
+    
+    Args:
+        source: Source to read from (usually a MongoDBConnection)
+        snapshot_dir: Store directory; each collection becomes a dataset of that name
+        collections: Collection names to copy
+        
+    Returns:
+        Number of documents written per collection.
+    """
+    from .snapshot_store import SnapshotStore
+    store = SnapshotStore(snapshot_dir)
+    counts = {}
+    for collection in collections:
+        documents = source.read_collection(collection, lazy=False)
+        store.write(collection, documents, default=_bson_json_default)
+        counts[collection] = len(documents)
+    return counts
+
+
 # ============================================================================
 # MongoDB Connection Class
 # ============================================================================
 
-class MongoDBConnection:
+class MongoDBConnection(DataSource):
     """Handles MongoDB connection and basic data retrieval."""
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, connection_string: Optional[str] = None, database: Optional[str] = None, partitions: int = 1, max_pool_size: int = DEFAULT_MAX_POOL_SIZE, max_idle_time_ms: int = DEFAULT_MAX_IDLE_TIME_MS, registry: Optional[MongoClientRegistry] = None, lazy_decode: bool = False):
         """
         Initialize MongoDB connection.
         
         Args:
             logger: Optional logger instance. If None, creates a default logger.
+            connection_string: Optional MongoDB URI (default: the production cluster)
+            database: Optional database name (default: MONGO_DATABASE)
+            partitions: Default number of parallel _id-range partitions for unlimited
+                reads (1 reads through a single cursor)
+            max_pool_size: Maximum sockets in the shared client's connection pool
+            max_idle_time_ms: Milliseconds a pooled socket may sit idle before it is closed
+            registry: Client registry to borrow from (default: the process-wide CLIENT_REGISTRY)
+            lazy_decode: If True, documents from LAZY_COLLECTIONS ('event', 'order') are
+                read as raw BSON batches and returned as LazyDocuments, which decode a
+                field only when it is first read
         """
         self.logger = logger or setup_logging()
+        self.connection_string = connection_string
+        self.database_name = database or MONGO_DATABASE
+        self.partitions = partitions
+        self.max_pool_size = max_pool_size
+        self.max_idle_time_ms = max_idle_time_ms
+        self.registry = registry or CLIENT_REGISTRY
+        self.lazy_decode = lazy_decode
         self._client: Optional[MongoClient] = None
         self._database: Optional[Database] = None
+        self._lock = threading.Lock()
     
     def get_client(self) -> MongoClient:
         """
         Get MongoDB client with hardcoded credentials.
         
+        The client is borrowed from the registry, so every connection in the process
+        with the same URI and pool settings shares one client and its warm pool.
+        
         Returns:
             MongoClient instance configured for cuculi_production database.
         """
-        if self._client is None:
-            self.logger.info("Establishing MongoDB connection...")
-            self.logger.debug(f"Connecting to: {MONGO_HOST} (database: {MONGO_DATABASE})")
-            self._client = MongoClient(
-                MONGO_CONNECTION_STRING,
-                connectTimeoutMS=30000,
-                serverSelectionTimeoutMS=30000,
-                tls=True,
-                tlsAllowInvalidCertificates=True
-            )
-            self.logger.info("✓ MongoDB connection established successfully")
+        # Lock so concurrent fetches (users_events_pull) borrow the client only once
+        with self._lock:
+            if self._client is None:
+                self.logger.info("Establishing MongoDB connection...")
+                options = {
+                    'connectTimeoutMS': 30000,
+                    'serverSelectionTimeoutMS': 30000,
+                    'maxPoolSize': self.max_pool_size,
+                    'maxIdleTimeMS': self.max_idle_time_ms,
+                }
+                if self.connection_string is None:
+                    self.logger.debug(f"Connecting to: {MONGO_HOST} (database: {self.database_name})")
+                    self._client = self.registry.acquire(MONGO_CONNECTION_STRING, tls=True, tlsAllowInvalidCertificates=True, **options)
+                else:
+                    self.logger.debug(f"Connecting to custom URI (database: {self.database_name})")
+                    self._client = self.registry.acquire(self.connection_string, **options)
+                self.logger.info(f"✓ MongoDB connection established successfully ({self.registry.references(self._client)} sharing this client)")
         return self._client
     
     def get_database(self) -> Database:
@@ -338,79 +1267,375 @@ class MongoDBConnection:
         Get MongoDB database instance.
         
         Returns:
-            Database instance for 'cuculi_production'.
+            Database instance for 'cuculi_production' (or the configured database).
         """
         if self._database is None:
             client = self.get_client()
-            self._database = client[MONGO_DATABASE]
-            self.logger.debug(f"Accessing database: {MONGO_DATABASE}")
+            self._database = client[self.database_name]
+            self.logger.debug(f"Accessing database: {self.database_name}")
         return self._database
     
-    def get_users(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def _find(self, collection: str, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, raw: bool = False) -> Cursor:
+        """
+        Build a find() cursor on a collection.
+        
+        Args:
+            collection: Collection name ('user', 'event', 'order')
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            batch_size: Optional number of documents fetched per server round trip
+            projection: Optional MongoDB projection (None returns whole documents)
+            raw: If True, return a find_raw_batches() cursor (undecoded BSON batches)
+            
+        Returns:
+            pymongo Cursor (lazy; documents are only fetched while iterating).
+        """
+        db = self.get_database()
+        find = db[collection].find_raw_batches if raw else db[collection].find
+        query = find(filter or {}, projection)
+        if limit:
+            query = query.limit(limit)
+        if batch_size:
+            query = query.batch_size(batch_size)
+        return query
+    
+    def _documents(self, collection: str, cursor: Cursor, lazy: bool) -> Iterable[Dict[str, Any]]:
+        """Documents of a cursor from _find (LazyDocuments for a raw cursor)"""
+        if lazy:
+            return iter_lazy_documents(cursor, self.get_database()[collection].codec_options)
+        return cursor
+    
+    def _use_lazy(self, collection: str, lazy: Optional[bool]) -> bool:
+        """Whether reads from a collection return LazyDocuments"""
+        return self.lazy_decode and collection in LAZY_COLLECTIONS if lazy is None else lazy
+    
+    def _partition_filters(self, collection: str, filter: Optional[Dict[str, Any]], partitions: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Split a collection (or the documents matching filter) into _id ranges of
+        roughly equal size using $bucketAuto.
+        
+        Returns:
+            List of per-partition filters in ascending _id order, or None if the
+            collection cannot be range-partitioned (fewer than 2 buckets, mixed _id types).
+        """
+        pipeline = ([{'$match': filter}] if filter else []) + [
+            {'$project': {'_id': 1}},
+            {'$bucketAuto': {'groupBy': '$_id', 'buckets': partitions}},
+        ]
+        buckets = list(self.get_database()[collection].aggregate(pipeline, allowDiskUse=True))
+        filters = build_partition_filters(buckets, filter) if len(buckets) > 1 else None
+        if filters is None:
+            self.logger.info(f"  '{collection}' cannot be split into _id ranges; reading with a single cursor")
+        return filters
+    
+    def _read_partitions(self, collection: str, filters: List[Dict[str, Any]], projection: Optional[Dict[str, Any]], batch_size: Optional[int] = None, lazy: bool = False, prefetch: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read _id-range partitions in parallel over the shared connection pool.
+        
+        Args:
+            prefetch: Partitions read ahead of the one being yielded (default: all of
+                them at once). A streaming caller then holds at most prefetch + 1
+                partitions in memory.
+        
+        Yields:
+            Each partition's documents (sorted by _id), in partition order, so the merged
+            output is deterministic regardless of which partition finishes first.
+        """
+        def read(index: int, partition_filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+            start = time.perf_counter()
+            cursor = self._find(collection, partition_filter, None, batch_size, projection, raw=lazy).sort('_id', 1)
+            documents = list(self._documents(collection, cursor, lazy))
+            self.logger.debug(f"  Partition {index + 1}/{len(filters)} of '{collection}': {len(documents)} documents in {time.perf_counter() - start:.2f}s")
+            return documents
+        
+        in_flight = len(filters) if prefetch is None else min(len(filters), prefetch + 1)
+        queued = enumerate(filters)
+        with ThreadPoolExecutor(max_workers=in_flight, thread_name_prefix=f'mongodb-{collection}-partition') as executor:
+            futures = deque(executor.submit(read, index, partition_filter) for index, partition_filter in islice(queued, in_flight))
+            while futures:
+                yield futures.popleft().result()
+                # The caller is done with that partition; start the next one
+                for index, partition_filter in islice(queued, 1):
+                    futures.append(executor.submit(read, index, partition_filter))
+    
+    def read_collection(self, collection: str, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None, lazy: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Read all matching documents from a collection.
+        
+        With more than one partition (and no limit) the collection is split into _id
+        ranges that are read in parallel and concatenated in ascending _id order.
+        
+        Args:
+            collection: Collection name ('user', 'event', 'order')
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results (disables partitioning)
+            projection: Optional MongoDB projection (None returns whole documents)
+            partitions: Number of parallel _id-range partitions (default: self.partitions)
+            lazy: If True, return LazyDocuments; if False, dicts (default: lazy_decode
+                for LAZY_COLLECTIONS)
+            
+        Returns:
+            List of documents.
+        """
+        partitions = partitions or self.partitions
+        lazy = self._use_lazy(collection, lazy)
+        if partitions > 1 and not limit:
+            filters = self._partition_filters(collection, filter, partitions)
+            if filters is not None:
+                start = time.perf_counter()
+                documents = [doc for batch in self._read_partitions(collection, filters, projection, lazy=lazy) for doc in batch]
+                self.logger.info(f"  Read '{collection}' in {len(filters)} _id partitions ({time.perf_counter() - start:.2f}s)")
+                return documents
+        return list(self._documents(collection, self._find(collection, filter, limit, projection=projection, raw=lazy), lazy))
+    
+    def _iter_collection(self, collection: str, label: str, filter: Optional[Dict[str, Any]], limit: Optional[int], batch_size: int, projection: Optional[Dict[str, Any]], partitions: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream documents from a collection one at a time.
+        
+        Only one cursor batch (batch_size documents) is held in memory at once. With
+        more than one partition, _id-range partitions are read in ascending _id order,
+        each held in memory until it is yielded; only DEFAULT_PREFETCH_PARTITIONS are
+        read ahead of the one being yielded.
+        """
+        self.logger.info(f"Streaming {label} from MongoDB (filter: {filter}, limit: {limit}, batch_size: {batch_size})...")
+        partitions = partitions or self.partitions
+        lazy = self._use_lazy(collection, None)
+        filters = self._partition_filters(collection, filter, partitions) if partitions > 1 and not limit else None
+        if filters is not None:
+            documents = (doc for batch in self._read_partitions(collection, filters, projection, batch_size, lazy, DEFAULT_PREFETCH_PARTITIONS) for doc in batch)
+        else:
+            documents = self._documents(collection, self._find(collection, filter, limit, batch_size, projection, raw=lazy), lazy)
+        count = 0
+        for document in documents:
+            count += 1
+            yield document
+        self.logger.info(f"✓ Streamed {count} {label} from '{collection}' collection")
+    
+    def get_users(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Query user collection from MongoDB.
         
         Args:
             filter: Optional MongoDB filter dictionary (e.g., {"role": "REGULAR"})
             limit: Optional limit on number of results
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+            partitions: Optional number of parallel _id-range partitions (default: self.partitions)
             
         Returns:
             List of user documents from 'user' collection.
         """
         self.logger.info(f"Fetching users from MongoDB (filter: {filter}, limit: {limit})...")
-        db = self.get_database()
-        query = db['user'].find(filter or {})
-        if limit:
-            query = query.limit(limit)
-        users = list(query)
+        users = self.read_collection('user', filter, limit, projection, partitions)
         self.logger.info(f"✓ Fetched {len(users)} users from 'user' collection")
         return users
     
-    def get_events(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_events(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Query event collection from MongoDB.
         
         Args:
             filter: Optional MongoDB filter dictionary
             limit: Optional limit on number of results
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+            partitions: Optional number of parallel _id-range partitions (default: self.partitions)
             
         Returns:
-            List of event documents from 'event' collection.
+            List of event documents from 'event' collection (LazyDocuments with lazy_decode).
         """
         self.logger.info(f"Fetching events from MongoDB (filter: {filter}, limit: {limit})...")
-        db = self.get_database()
-        query = db['event'].find(filter or {})
-        if limit:
-            query = query.limit(limit)
-        events = list(query)
+        events = self.read_collection('event', filter, limit, projection, partitions)
         self.logger.info(f"✓ Fetched {len(events)} events from 'event' collection")
         return events
     
-    def get_orders(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_orders(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Query order collection from MongoDB.
         
         Args:
             filter: Optional MongoDB filter dictionary
             limit: Optional limit on number of results
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+            partitions: Optional number of parallel _id-range partitions (default: self.partitions)
             
         Returns:
-            List of order documents from 'order' collection.
+            List of order documents from 'order' collection (LazyDocuments with lazy_decode).
         """
         self.logger.info(f"Fetching orders from MongoDB (filter: {filter}, limit: {limit})...")
-        db = self.get_database()
-        query = db['order'].find(filter or {})
-        if limit:
-            query = query.limit(limit)
-        orders = list(query)
+        orders = self.read_collection('order', filter, limit, projection, partitions)
         self.logger.info(f"✓ Fetched {len(orders)} orders from 'order' collection")
         return orders
     
+    def iter_users(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream user documents from MongoDB without materializing the collection.
+        
+        Args:
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            batch_size: Number of documents fetched per server round trip
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+            partitions: Optional number of parallel _id-range partitions (default: self.partitions)
+            
+        Yields:
+            User documents from 'user' collection.
+        """
+        return self._iter_collection('user', 'users', filter, limit, batch_size, projection, partitions)
+    
+    def iter_events(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream event documents from MongoDB without materializing the collection.
+        
+        Args:
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            batch_size: Number of documents fetched per server round trip
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+            partitions: Optional number of parallel _id-range partitions (default: self.partitions)
+            
+        Yields:
+            Event documents from 'event' collection.
+        """
+        return self._iter_collection('event', 'events', filter, limit, batch_size, projection, partitions)
+    
+    def iter_orders(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, projection: Optional[Dict[str, Any]] = None, partitions: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream order documents from MongoDB without materializing the collection.
+        
+        Args:
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            batch_size: Number of documents fetched per server round trip
+            projection: Optional MongoDB projection (see build_projection); None returns whole documents
+            partitions: Optional number of parallel _id-range partitions (default: self.partitions)
+            
+        Yields:
+            Order documents from 'order' collection.
+        """
+        return self._iter_collection('order', 'orders', filter, limit, batch_size, projection, partitions)
+    
+    def _aggregate(self, collection: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run an aggregation pipeline and return all result rows.
+        
+        Dates come back timezone-aware (UTC) to match parse_iso_date.
+        """
+        db = self.get_database()
+        coll = db.get_collection(collection, codec_options=CodecOptions(tz_aware=True, tzinfo=timezone.utc))
+        return list(coll.aggregate(pipeline, allowDiskUse=True))
+    
+    def aggregate_order_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute per-user order stats server-side ($group over 'order' by userId).
+        
+        Returns:
+            Dict mapping user_id -> {order_count, total_spent, last_order}. Users without
+            orders are absent (use EMPTY_ORDER_STATS).
+        """
+        self.logger.info("Aggregating order stats by user in MongoDB...")
+        order_stats = {}
+        for row in self._aggregate('order', build_order_stats_pipeline()):
+            order_stats[row['_id']] = {
+                'order_count': row['order_count'],
+                'total_spent': float(row['total_spent']),
+                'last_order': row['last_order'],
+            }
+        self.logger.info(f"✓ Aggregated order stats for {len(order_stats)} users")
+        return order_stats
+    
+    def aggregate_event_demographics(self, event_ids: List[Any], top_k: int = PARTICIPANT_TOP_K) -> Dict[str, Dict[str, List[Tuple[str, int]]]]:
+        """
+        Compute participant top interests/occupations/neighborhoods server-side
+        ($unwind participants + $lookup into 'user'), without shipping user documents.
+        
+        Args:
+            event_ids: _id values of the events to analyze
+            top_k: Entries kept per top list
+            
+        Returns:
+            Dict mapping event_id -> {'interests': [(value, count), ...], 'occupations': [...],
+            'neighborhoods': [...]}. Dimensions with no values are absent.
+        """
+        self.logger.info(f"Aggregating participant demographics for {len(event_ids)} events in MongoDB...")
+        demographics: Dict[str, Dict[str, List[Tuple[str, int]]]] = defaultdict(dict)
+        for start in range(0, len(event_ids), DEFAULT_BATCH_SIZE):
+            chunk = event_ids[start:start + DEFAULT_BATCH_SIZE]
+            for row in self._aggregate('event', build_event_demographics_pipeline(chunk)):
+                demographics[row['event']][row['dimension']] = fold_demographic_values(row['values'], top_k)
+        self.logger.info(f"✓ Aggregated participant demographics for {len(demographics)} events")
+        return dict(demographics)
+    
+    def write_report_rows(self, kind: str, rows: Iterable[Dict[str, Any]], append: bool = False) -> int:
+        """
+        Write report rows to the staging copy of a report collection.
+        
+        Rows become visible to aggregate_report (and dashboards) once
+        publish_report_rows swaps the staging collection in.
+        
+        Args:
+            kind: 'users' or 'events' (see REPORT_SPECS)
+            rows: Rows from user_report_row / event_report_row
+            append: If True, add to the staging collection instead of starting a new one
+                (for writing a streamed pull batch by batch)
+        
+        Returns:
+            Number of rows written.
+        """
+        staging = self.get_database()[f"{REPORT_SPECS[kind]['collection']}_staging"]
+        if not append:
+            staging.drop()
+        written = 0
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, DEFAULT_BATCH_SIZE))
+            if not batch:
+                break
+            staging.insert_many(batch, ordered=False)
+            written += len(batch)
+        self.logger.info(f"✓ Wrote {written} {kind} report rows to '{staging.name}'")
+        return written
+    
+    def publish_report_rows(self, kind: str) -> None:
+        """
+        Atomically replace a report collection with its staging copy.
+        
+        Args:
+            kind: 'users' or 'events'
+        """
+        name = REPORT_SPECS[kind]['collection']
+        db = self.get_database()
+        if f"{name}_staging" in db.list_collection_names(filter={'name': f"{name}_staging"}):
+            db[f"{name}_staging"].rename(name, dropTarget=True)
+        else:
+            db[name].drop()
+        self.logger.info(f"✓ Published {kind} report rows to '{name}'")
+    
+    def aggregate_report(self, kind: str) -> Dict[str, Any]:
+        """
+        Compute every table of a report with one $facet aggregation over its
+        published report collection.
+        
+        Args:
+            kind: 'users' or 'events'
+        
+        Returns:
+            Report stats (count, sums, distributions) for ReportGeneration.
+        """
+        self.logger.info(f"Aggregating {kind} report in MongoDB...")
+        result = self._aggregate(REPORT_SPECS[kind]['collection'], build_report_pipeline(kind))
+        stats = report_stats_from_facet(kind, result[0])
+        self.logger.info(f"✓ Aggregated {kind} report over {stats['count']} rows")
+        return stats
+    
     def close(self):
-        """Close MongoDB connection."""
+        """
+        Close MongoDB connection.
+        
+        The shared client is returned to the registry rather than closed, so later
+        connections in the same process reuse its pool.
+        """
         if self._client:
             self.logger.debug("Closing MongoDB connection...")
-            self._client.close()
+            self.registry.release(self._client)
             self._client = None
             self._database = None
             self.logger.info("✓ MongoDB connection closed")
@@ -420,10 +1645,23 @@ class MongoDBConnection:
 # Utility Functions
 # ============================================================================
 
+# Distinct date strings kept parsed. The same startDate/createdAt strings are parsed by
+# several stages (stats, event history, time patterns, qualification, summaries); the
+# cache is emptied when it reaches this size.
+DATE_CACHE_SIZE = 1 << 17
+
+_DATE_CACHE: Dict[str, Optional[datetime]] = {}
+_DATE_STATS = {'parsed': 0}
+_UNPARSED = object()
+
+
 def parse_iso_date(value: Any) -> Optional[datetime]:
     """
     Parse ISO 8601 date strings safely into datetime (UTC).
     
+    Each distinct string is parsed once and memoized (datetimes are immutable, so
+    sharing them is safe); see date_cache_info().
+    
     Args:
         value: ISO 8601 string, datetime object, or None
         
@@ -432,16 +1670,36 @@ def parse_iso_date(value: Any) -> Optional[datetime]:
     """
     if not value:
         return None
-    try:
-        if isinstance(value, datetime):
-            return value
-        if isinstance(value, str):
-            return datetime.fromisoformat(value.replace('Z', '+00:00'))
-    except Exception:
-        return None
+    if value.__class__ is str:
+        parsed = _DATE_CACHE.get(value, _UNPARSED)
+        if parsed is _UNPARSED:
+            try:
+                parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                parsed = None
+            if len(_DATE_CACHE) >= DATE_CACHE_SIZE:
+                _DATE_CACHE.clear()
+            _DATE_CACHE[value] = parsed
+            _DATE_STATS['parsed'] += 1
+        return parsed
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return parse_iso_date(str(value))
     return None
 
 
+def date_cache_info() -> Dict[str, int]:
+    """Strings parsed by parse_iso_date so far and strings currently memoized"""
+    return {'parsed': _DATE_STATS['parsed'], 'cached': len(_DATE_CACHE)}
+
+
+def clear_date_cache() -> None:
+    """Empty parse_iso_date's memo and reset its counter"""
+    _DATE_CACHE.clear()
+    _DATE_STATS['parsed'] = 0
+
+
 def is_profile_complete(user: Dict[str, Any]) -> bool:
     """
     Check if user profile is complete (at least 4 of 5 required fields).
@@ -475,7 +1733,24 @@ def is_profile_complete(user: Dict[str, Any]) -> bool:
                 if value:
                     filled += 1
     
-    return filled >= 4
+    return filled >= 4
+
+
+def event_attendees(event: Dict[str, Any]) -> Set[str]:
+    """
+    Get the IDs of everyone attached to an event (participants plus owner).
+    
+    Args:
+        event: Event dictionary
+        
+    Returns:
+        Set of user ID strings (missing/None IDs removed).
+    """
+    attendees = {str(p) for p in event.get('participants', []) or []}
+    attendees.add(str(event.get('ownerId', '')))
+    attendees.discard('None')
+    attendees.discard('')
+    return attendees
 
 
 def _convert_objectid(obj: Any) -> Any:
@@ -503,17 +1778,132 @@ def _convert_objectid(obj: Any) -> Any:
 # User Enrichment Class
 # ============================================================================
 
+# Fields enrich_user_profile adds to a user, in output order. Incremental runs cache
+# them per user together with a hash of the user's input slice.
+USER_ENRICHED_FIELDS = ('id', 'event_count', 'order_count', 'total_order_amount', 'total_spent',
+                        'last_active', 'days_inactive', 'journey_stage', 'engagement_status',
+                        'is_active', 'value_segment', 'social_role', 'churn_risk', 'user_segment',
+                        'cohort', 'days_since_registration', 'profile_completeness',
+                        'personalization_ready')
+
+# Labels derived from day counters (thresholds at 30/90/180 days inactive). A cached user
+# whose labels move for the current time (e.g. active -> dormant) is recomputed.
+USER_TIME_LABELS = ('engagement_status', 'churn_risk', 'user_segment')
+
+# Order fields calculate_stats reads (the order part of a user's input slice)
+USER_ORDER_INPUTS = ('price', 'createdAt')
+
+# Incremental cache file name (in the snapshot directory) and format version; entries
+# written by another version are ignored
+ENRICHMENT_CACHE_FILE = 'user_enrichment.cache.json'
+ENRICHMENT_CACHE_VERSION = 1
+
+
 class UserEnrichment:
     """Handles user enrichment, transformation, and segment analysis."""
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, cache_path: Optional[str] = None):
         """
         Initialize UserEnrichment.
         
         Args:
             logger: Optional logger instance
+            cache_path: Optional incremental cache file. When set, transform_users keeps a
+                hash of each user's input slice (enrichment fields of the user, startDate
+                of their events, price/createdAt of their orders) with the enriched fields,
+                and on later runs only recomputes users whose hash changed or whose
+                time-based labels crossed a threshold. Call save_cache() to persist it.
         """
         self.logger = logger or logging.getLogger('MongoDBPull.UserEnrichment')
+        self.columnar_engine = None
+        self.cache_path = cache_path
+        self.cache: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    def load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the incremental cache from cache_path (once).
+        
+        Returns:
+            user_id -> {'hash': str, 'fields': {USER_ENRICHED_FIELDS values}}; empty when
+            there is no cache file or it was written by another ENRICHMENT_CACHE_VERSION.
+        """
+        if self.cache is None:
+            self.cache = {}
+            if self.cache_path and os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                if payload.get('version') == ENRICHMENT_CACHE_VERSION:
+                    self.cache = payload['users']
+                    self.logger.info(f"✓ Loaded enrichment cache for {len(self.cache)} users from {self.cache_path}")
+                else:
+                    self.logger.info(f"Ignoring enrichment cache {self.cache_path} (version {payload.get('version')})")
+        return self.cache
+    
+    def save_cache(self) -> None:
+        """Write the incremental cache to cache_path atomically (no-op without a cache)."""
+        if not self.cache_path or self.cache is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': ENRICHMENT_CACHE_VERSION, 'users': self.cache}, f)
+        os.replace(tmp_path, self.cache_path)
+        self.logger.info(f"✓ Saved enrichment cache for {len(self.cache)} users to {self.cache_path}")
+    
+    def input_hash(self, user: Dict[str, Any], events: List[Dict[str, Any]], orders: List[Dict[str, Any]], order_stats: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Hash a user's input slice: the only values enrich_user_profile reads.
+        
+        Args:
+            user: User document
+            events: Events of the user
+            orders: Orders of the user
+            order_stats: Optional pre-aggregated order stats (replaces orders)
+            
+        Returns:
+            Hex digest, stable across runs for unchanged inputs.
+        """
+        user_fields = tuple(user.get(field) for field in FIELD_REQUIREMENTS['user_enrichment']['user'])
+        event_dates = tuple(event.get('startDate') for event in events)
+        if order_stats is not None:
+            order_inputs = tuple(sorted(order_stats.items()))
+        else:
+            order_inputs = tuple(tuple(order.get(field) for field in USER_ORDER_INPUTS) for order in orders)
+        return hashlib.sha1(repr((user_fields, event_dates, order_inputs)).encode('utf-8')).hexdigest()
+    
+    def refresh_cached_profile(self, user: Dict[str, Any], fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild an enriched user from its cached fields for the current time.
+        
+        Day counters are recomputed from the cached last_active and the user's createdAt,
+        so the result equals a fresh enrich_user_profile as long as no USER_TIME_LABELS
+        label changes.
+        
+        Args:
+            user: User document (with the same input hash as when cached)
+            fields: Cached USER_ENRICHED_FIELDS values
+            
+        Returns:
+            Enriched user dictionary (without campaign qualifications), or None if a
+            time-based label crossed a threshold and the user must be recomputed.
+        """
+        engagement_result = self.derive_engagement(parse_iso_date(fields['last_active']))
+        stats = {
+            'event_count': fields['event_count'],
+            'order_count': fields['order_count'],
+            'total_spent': fields['total_spent'],
+            'last_active': parse_iso_date(fields['last_active']),
+            'days_inactive': engagement_result['days_inactive']
+        }
+        segs = self.derive_segments(user, stats)
+        if any(segs[label] != fields[label] for label in USER_TIME_LABELS):
+            return None
+        
+        enriched_user = {**user, **fields}
+        enriched_user['days_inactive'] = stats['days_inactive']
+        enriched_user['is_active'] = engagement_result['is_active']
+        enriched_user['days_since_registration'] = segs['days_since_registration']
+        return enriched_user
     
     def index_data_by_user(self, events: List[Dict[str, Any]], orders: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
         """
@@ -555,13 +1945,16 @@ class UserEnrichment:
         self.logger.info(f"✓ Created index maps: {len(event_map)} users with events, {len(order_map)} users with orders")
         return dict(event_map), dict(order_map)
     
-    def calculate_stats(self, events: List[Dict[str, Any]], orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def calculate_stats(self, events: List[Dict[str, Any]], orders: List[Dict[str, Any]], order_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Calculate statistics from user's events and orders.
         
         Args:
             events: List of event documents for the user
             orders: List of order documents for the user
+            order_stats: Optional pre-aggregated order stats for the user
+                ({order_count, total_spent, last_order}, see MongoDBConnection.aggregate_order_stats).
+                When given, orders is ignored.
             
         Returns:
             Dictionary with:
@@ -573,14 +1966,19 @@ class UserEnrichment:
         """
         now = datetime.now(timezone.utc)
         
-        # Calculate total spent from orders
-        spent = 0.0
-        for order in orders:
-            price = order.get('price')
-            if isinstance(price, dict):
-                spent += price.get('total', 0)
-            elif isinstance(price, (int, float)):
-                spent += price
+        # Calculate total spent from orders (or take the pre-aggregated totals)
+        if order_stats is not None:
+            order_count = order_stats['order_count']
+            spent = order_stats['total_spent']
+        else:
+            order_count = len(orders)
+            spent = 0.0
+            for order in orders:
+                price = order.get('price')
+                if isinstance(price, dict):
+                    spent += price.get('total', 0)
+                elif isinstance(price, (int, float)):
+                    spent += price
         
         # Get all timestamps
         dates = []
@@ -588,10 +1986,13 @@ class UserEnrichment:
             start_date = event.get('startDate')
             if start_date:
                 dates.append(parse_iso_date(start_date))
-        for order in orders:
-            created_at = order.get('createdAt')
-            if created_at:
-                dates.append(parse_iso_date(created_at))
+        if order_stats is not None:
+            dates.append(order_stats['last_order'])
+        else:
+            for order in orders:
+                created_at = order.get('createdAt')
+                if created_at:
+                    dates.append(parse_iso_date(created_at))
         
         # Find most recent activity
         valid_dates = [d for d in dates if d is not None]
@@ -607,7 +2008,7 @@ class UserEnrichment:
         
         return {
             'event_count': len(events),
-            'order_count': len(orders),
+            'order_count': order_count,
             'total_spent': round(spent, 2),
             'last_active': last_active,
             'days_inactive': days_inactive
@@ -850,7 +2251,7 @@ class UserEnrichment:
             f"with {stats['event_count']} events and ${stats['total_spent']} spent. Classified as {segs['value_segment']}."
         )
     
-    def enrich_user_profile(self, user: Dict[str, Any], events: List[Dict[str, Any]], orders: List[Dict[str, Any]], campaign_qualifier: Optional['CampaignQualification'] = None) -> Dict[str, Any]:
+    def enrich_user_profile(self, user: Dict[str, Any], events: List[Dict[str, Any]], orders: List[Dict[str, Any]], campaign_qualifier: Optional['CampaignQualification'] = None, order_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Enrich a single user profile with calculated metrics, segments, and narrative.
         
@@ -859,6 +2260,7 @@ class UserEnrichment:
             events: List of events associated with the user (as participant or owner)
             orders: List of orders associated with the user
             campaign_qualifier: Optional CampaignQualification instance for adding campaign qualifications
+            order_stats: Optional pre-aggregated order stats for the user (replaces orders)
             
         Returns:
             Enriched user dictionary with all calculated fields.
@@ -866,7 +2268,7 @@ class UserEnrichment:
         uid = str(user.get('_id', ''))
         
         # Calculate statistics
-        stats = self.calculate_stats(events, orders)
+        stats = self.calculate_stats(events, orders, order_stats)
         
         # Derive segments
         segs = self.derive_segments(user, stats)
@@ -906,7 +2308,7 @@ class UserEnrichment:
         
         return enriched_user
     
-    def transform_users(self, users: List[Dict[str, Any]], events: List[Dict[str, Any]], orders: List[Dict[str, Any]], campaign_qualifier: Optional['CampaignQualification'] = None) -> List[Dict[str, Any]]:
+    def transform_users(self, users: List[Dict[str, Any]], events: List[Dict[str, Any]], orders: List[Dict[str, Any]], campaign_qualifier: Optional['CampaignQualification'] = None, event_map: Optional[Dict[str, List[Dict[str, Any]]]] = None, order_map: Optional[Dict[str, List[Dict[str, Any]]]] = None, columnar: bool = False, log_distributions: bool = True, order_stats: Optional[Dict[str, Dict[str, Any]]] = None, event_table: Optional['EventTable'] = None) -> List[Dict[str, Any]]:
         """
         Transform all users by enriching each with their events and orders.
         
@@ -915,20 +2317,58 @@ class UserEnrichment:
             events: List of all event documents
             orders: List of all order documents
             campaign_qualifier: Optional CampaignQualification instance for adding campaign qualifications
+            event_map: Optional pre-built user_id -> events map (from index_data_by_user)
+            order_map: Optional pre-built user_id -> orders map (from index_data_by_user)
+            columnar: If True, use the vectorized ColumnarUserEnrichment engine (requires numpy).
+                Output is identical to the row-wise path; the engine is kept on
+                self.columnar_engine so callers can reuse its vectorized scores.
+            log_distributions: If False, skip the segment distribution log (used for
+                per-chunk calls from MongoDBPull.users_pull_iter).
+            order_stats: Optional user_id -> pre-aggregated order stats (from
+                MongoDBConnection.aggregate_order_stats). When given, orders is not used.
+            event_table: Optional EventTable. When given, users are returned as compact
+                EnrichedUser records (raw user by reference, derived fields in slots)
+                whose event_history resolves against this table.
             
         Returns:
-            List of enriched user dictionaries.
+            List of enriched user dictionaries (or EnrichedUser records).
         """
         self.logger.info(f"Starting user transformation for {len(users)} users...")
         self.logger.debug(f"Using {len(events)} events and {len(orders)} orders for enrichment")
         self.logger.debug("Purpose: Calculate statistics, derive segments, add campaign qualifications for each user")
         
-        # Create lookup maps
-        event_map, order_map = self.index_data_by_user(events, orders)
-        
-        # Enrich each user
+        # Create lookup maps (unless the caller already built them)
+        if event_map is None or order_map is None:
+            event_map, order_map = self.index_data_by_user(events, orders)
+        
+        self.columnar_engine = None
+        if columnar and order_stats is not None:
+            self.logger.warning("Columnar enrichment needs raw orders; using row-wise enrichment with server-side order stats")
+            columnar = False
+        if columnar and self.cache_path:
+            self.logger.warning("Columnar enrichment recomputes every user; using row-wise incremental enrichment")
+            columnar = False
+        if columnar:
+            from .columnar_enrichment import ColumnarUserEnrichment, NaiveTimestampError
+            engine = ColumnarUserEnrichment(self.logger)
+            try:
+                enriched_users = engine.transform(users, event_map, order_map, campaign_qualifier)
+            except NaiveTimestampError as e:
+                self.logger.warning(f"Columnar enrichment unavailable ({e}); falling back to row-wise enrichment")
+            else:
+                self.columnar_engine = engine
+                if event_table is not None:
+                    enriched_users = [EnrichedUser.from_enriched(user, enriched_user, events=event_table) for user, enriched_user in zip(users, enriched_users)]
+                self.logger.info(f"✓ Completed columnar transformation of {len(enriched_users)} users")
+                if log_distributions:
+                    self._log_segment_distributions(enriched_users)
+                return enriched_users
+        
+        # Enrich each user (reusing cached results of unchanged users on incremental runs)
         enriched_users = []
         total = len(users)
+        cache = self.load_cache() if self.cache_path else None
+        reused = crossed = 0
         
         for idx, user in enumerate(users, 1):
             uid = str(user.get('_id', ''))
@@ -938,13 +2378,39 @@ class UserEnrichment:
             if idx % 100 == 0 or idx == total:
                 self.logger.info(f"Processing user {idx}/{total} ({(idx/total)*100:.1f}%)...")
             
-            enriched_user = self.enrich_user_profile(user, user_events, user_orders, campaign_qualifier)
+            user_order_stats = order_stats.get(uid, EMPTY_ORDER_STATS) if order_stats is not None else None
+            if cache is None:
+                enriched_user = self.enrich_user_profile(user, user_events, user_orders, campaign_qualifier, user_order_stats)
+                if event_table is not None:
+                    enriched_user = EnrichedUser.from_enriched(user, enriched_user, events=event_table)
+                enriched_users.append(enriched_user)
+                continue
+            
+            input_hash = self.input_hash(user, user_events, user_orders, user_order_stats)
+            entry = cache.get(uid)
+            enriched_user = None
+            if entry is not None and entry['hash'] == input_hash:
+                enriched_user = self.refresh_cached_profile(user, entry['fields'])
+                if enriched_user is None:
+                    crossed += 1
+                else:
+                    reused += 1
+                    if campaign_qualifier:
+                        campaign_qualifier.add_campaign_qualifications_to_user(enriched_user, user_events)
+            if enriched_user is None:
+                enriched_user = self.enrich_user_profile(user, user_events, user_orders, campaign_qualifier, user_order_stats)
+            cache[uid] = {'hash': input_hash, 'fields': {field: enriched_user[field] for field in USER_ENRICHED_FIELDS}}
+            if event_table is not None:
+                enriched_user = EnrichedUser.from_enriched(user, enriched_user, events=event_table)
             enriched_users.append(enriched_user)
         
         self.logger.info(f"✓ Completed transformation of {len(enriched_users)} users")
+        if cache is not None:
+            self.logger.info(f"✓ Incremental enrichment: {reused} reused, {total - reused - crossed} changed or new, {crossed} crossed a time threshold")
         
         # Log segment distributions
-        self._log_segment_distributions(enriched_users)
+        if log_distributions:
+            self._log_segment_distributions(enriched_users)
         
         return enriched_users
     
@@ -959,75 +2425,125 @@ class UserEnrichment:
         self.logger.info("USER SEGMENT DISTRIBUTIONS")
         self.logger.info("=" * 80)
         
-        # Journey Stage Distribution
-        journey_counts = defaultdict(int)
-        for user in users:
-            journey_counts[user.get('journey_stage', 'Unknown')] += 1
-        
-        self.logger.info("\nJourney Stage Distribution:")
-        for stage, count in sorted(journey_counts.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / len(users)) * 100
-            self.logger.info(f"  {stage}: {count} ({percentage:.1f}%)")
-        
-        # Engagement Status Distribution
-        engagement_counts = defaultdict(int)
-        for user in users:
-            engagement_counts[user.get('engagement_status', 'Unknown')] += 1
-        
-        self.logger.info("\nEngagement Status Distribution:")
-        for status, count in sorted(engagement_counts.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / len(users)) * 100
-            self.logger.info(f"  {status}: {count} ({percentage:.1f}%)")
-        
-        # Value Segment Distribution
-        value_counts = defaultdict(int)
-        for user in users:
-            value_counts[user.get('value_segment', 'Unknown')] += 1
-        
-        self.logger.info("\nValue Segment Distribution:")
-        for segment, count in sorted(value_counts.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / len(users)) * 100
-            self.logger.info(f"  {segment}: {count} ({percentage:.1f}%)")
-        
-        # Social Role Distribution
-        social_counts = defaultdict(int)
-        for user in users:
-            social_counts[user.get('social_role', 'Unknown')] += 1
-        
-        self.logger.info("\nSocial Role Distribution:")
-        for role, count in sorted(social_counts.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / len(users)) * 100
-            self.logger.info(f"  {role}: {count} ({percentage:.1f}%)")
-        
-        # User Segment Distribution
-        user_seg_counts = defaultdict(int)
-        for user in users:
-            user_seg_counts[user.get('user_segment', 'Unknown')] += 1
-        
-        self.logger.info("\nUser Segment Distribution:")
-        for segment, count in sorted(user_seg_counts.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / len(users)) * 100
-            self.logger.info(f"  {segment}: {count} ({percentage:.1f}%)")
-        
-        # Profile Completeness Distribution
-        completeness_counts = defaultdict(int)
-        for user in users:
-            completeness = user.get('profile_completeness', '0/8 (0%)')
-            filled = int(completeness.split('/')[0]) if '/' in completeness else 0
-            completeness_counts[f"{filled}/8"] += 1
+        # Same aggregation the users report renders
+        stats = report_stats('users', (user_report_row(user) for user in users))
+        distributions = stats['distributions']
+        for title, field in (('Journey Stage', 'journey_stage'), ('Engagement Status', 'engagement_status'),
+                             ('Value Segment', 'value_segment'), ('Social Role', 'social_role'),
+                             ('User Segment', 'user_segment')):
+            self.logger.info(f"\n{title} Distribution:")
+            for value, count in _by_count(distributions[field]):
+                percentage = (count / len(users)) * 100
+                self.logger.info(f"  {value}: {count} ({percentage:.1f}%)")
         
         self.logger.info("\nProfile Completeness Distribution:")
-        for comp, count in sorted(completeness_counts.items(), key=lambda x: int(x[0].split('/')[0]), reverse=True):
+        for comp, count in _by_filled(distributions['completeness']):
             percentage = (count / len(users)) * 100
             self.logger.info(f"  {comp}: {count} ({percentage:.1f}%)")
         
         # Personalization Ready Count
-        ready_count = sum(1 for user in users if user.get('personalization_ready', False))
+        ready_count = stats['sums']['personalization_ready']
         self.logger.info(f"\nPersonalization Ready: {ready_count}/{len(users)} ({(ready_count/len(users))*100:.1f}%)")
         
         self.logger.info("=" * 80)
 
 
+# ============================================================================
+# User Event Index Class
+# ============================================================================
+
+class UserEventIndex:
+    """
+    Shared per-user event index built once from the event_map of index_data_by_user().
+
+    Holds the attendee set and pre-parsed start date of every event plus a past/future
+    split per user, so per-user consumers (social connections, event history, interest
+    analysis, campaign qualifications) never rescan the full events list.
+    """
+
+    def __init__(self, event_map: Dict[str, List[Dict[str, Any]]], now: Optional[datetime] = None):
+        """
+        Build the index.
+
+        Args:
+            event_map: Dict mapping user_id -> list of events (from index_data_by_user)
+            now: Reference time for the past/future split (default: current UTC time)
+        """
+        self.event_map = event_map
+        self.now = now or datetime.now(timezone.utc)
+        self._events: List[Dict[str, Any]] = []
+        self._attendees: Dict[int, Set[str]] = {}
+        self._start_dates: Dict[int, Optional[datetime]] = {}
+        self._past_events: Dict[str, List[Dict[str, Any]]] = {}
+        self._future_events: Dict[str, List[Dict[str, Any]]] = {}
+
+        for user_id, user_events in event_map.items():
+            past = []
+            future = []
+            for event in user_events:
+                key = id(event)
+                if key not in self._attendees:
+                    self._events.append(event)
+                    self._attendees[key] = event_attendees(event)
+                    self._start_dates[key] = parse_iso_date(event.get('startDate'))
+
+                event_date = self._start_dates[key]
+                if event_date and event_date < self.now:
+                    past.append(event)
+                else:
+                    future.append(event)
+
+            # Most recent first; sort is stable so ties keep event_map order
+            past.sort(key=lambda e: self._start_dates[id(e)], reverse=True)
+            self._past_events[user_id] = past
+            self._future_events[user_id] = future
+
+    @classmethod
+    def from_events(cls, events: List[Dict[str, Any]], now: Optional[datetime] = None) -> 'UserEventIndex':
+        """
+        Build an index directly from a list of events.
+
+        Args:
+            events: List of event documents
+            now: Reference time for the past/future split
+
+        Returns:
+            UserEventIndex instance
+        """
+        event_map, _ = UserEnrichment(logging.getLogger('MongoDBPull.UserEventIndex')).index_data_by_user(events, [])
+        return cls(event_map, now=now)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Return every distinct indexed event (first-seen order)."""
+        return self._events
+
+    def events_for(self, user_id: str) -> List[Dict[str, Any]]:
+        """Return all events the user attended or owned (event_map order)."""
+        return self.event_map.get(user_id, [])
+
+    def past_events(self, user_id: str) -> List[Dict[str, Any]]:
+        """Return the user's past events sorted by start date (most recent first)."""
+        return self._past_events.get(user_id, [])
+
+    def future_events(self, user_id: str) -> List[Dict[str, Any]]:
+        """Return the user's upcoming (or undated) events in event_map order."""
+        return self._future_events.get(user_id, [])
+
+    def attendees(self, event: Dict[str, Any]) -> Set[str]:
+        """Return the set of participant and owner IDs for an event."""
+        key = id(event)
+        if key in self._attendees:
+            return self._attendees[key]
+        return event_attendees(event)
+
+    def start_date(self, event: Dict[str, Any]) -> Optional[datetime]:
+        """Return the pre-parsed start date for an indexed event."""
+        key = id(event)
+        if key in self._start_dates:
+            return self._start_dates[key]
+        return parse_iso_date(event.get('startDate'))
+
+
 # ============================================================================
 # Scoring Functions
 # ============================================================================
@@ -1124,6 +2640,92 @@ def calculate_reactivation_score(user: Dict[str, Any]) -> float:
 # Campaign Qualification Class
 # ============================================================================
 
+# Campaigns with qualification flags (campaign_qualifications['qualifies_<campaign>'])
+CAMPAIGNS = ('seat_newcomers', 'fill_the_table', 'return_to_table')
+
+# Raw-field parts of the qualification rules in CampaignQualification, as
+# (field, operator, value) conditions per collection and campaign. Every document
+# that passes the full rule also passes these, so they can be pushed to MongoDB as
+# a pre-filter; the full rule still runs after enrichment. Campaigns whose rules only
+# read derived fields (e.g. personalization_ready, engagement_status) are absent.
+_FUTURE_PUBLIC_EVENT = (
+    ('startDate', 'after_now', None),
+    ('type', 'eq', 'public'),
+    ('maxParticipants', 'gt', 0),
+)
+QUALIFICATION_PREFILTERS: Dict[str, Dict[str, Tuple[Tuple[str, str, Any], ...]]] = {
+    'user': {
+        'seat_newcomers': (('createdAt', 'within_days', 90),),
+    },
+    'event': {
+        'seat_newcomers': _FUTURE_PUBLIC_EVENT,
+        'fill_the_table': _FUTURE_PUBLIC_EVENT,
+        'return_to_table': _FUTURE_PUBLIC_EVENT,
+    },
+}
+
+
+def _compile_condition(field: str, operator: str, value: Any, now: datetime) -> Dict[str, Any]:
+    """
+    Compile one prefilter condition to a MongoDB filter.
+    
+    Dates are stored either as BSON dates or as ISO-8601 strings, so date bounds
+    match both; string bounds are widened to the previous day's YYYY-MM-DD prefix,
+    which is a lower bound for any ISO timestamp on or after the cutoff.
+    """
+    if operator == 'eq':
+        return {field: value}
+    if operator == 'gt':
+        return {field: {'$gt': value}}
+    if operator == 'after_now':
+        return {'$or': [
+            {field: {'$gt': now}},
+            {field: {'$gte': (now - timedelta(days=1)).strftime('%Y-%m-%d')}},
+        ]}
+    if operator == 'within_days':
+        # days_since_registration is (now - date).days, so one extra day of margin;
+        # a missing date counts as 0 days
+        cutoff = now - timedelta(days=value + 1)
+        return {'$or': [
+            {field: {'$gte': cutoff}},
+            {field: {'$gte': (cutoff - timedelta(days=1)).strftime('%Y-%m-%d')}},
+            {field: None},
+        ]}
+    raise ValueError(f"Unknown prefilter operator: {operator}")
+
+
+def build_qualification_filter(collection: str, campaign: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    Compile the raw-field part of a campaign's qualification rule to a MongoDB filter.
+    
+    The filter is a superset of the campaign's qualifying documents: it only narrows
+    what is fetched and enriched, and the full rule must still be applied afterwards.
+    
+    Args:
+        collection: 'user' or 'event'
+        campaign: Campaign name (one of CAMPAIGNS)
+        now: Reference time (default: current UTC time)
+        
+    Returns:
+        MongoDB filter, or None if the campaign has no raw-field conditions for the collection.
+    """
+    if campaign not in CAMPAIGNS:
+        raise ValueError(f"Unknown campaign: {campaign} (expected one of {', '.join(CAMPAIGNS)})")
+    conditions = QUALIFICATION_PREFILTERS.get(collection, {}).get(campaign)
+    if not conditions:
+        return None
+    now = now or datetime.now(timezone.utc)
+    clauses = [_compile_condition(field, operator, value, now) for field, operator, value in conditions]
+    return clauses[0] if len(clauses) == 1 else {'$and': clauses}
+
+
+def _with_prefilter(filter: Optional[Dict[str, Any]], prefilter: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Combine a caller filter with a campaign pre-filter"""
+    if not prefilter:
+        return filter
+    return {'$and': [filter, prefilter]} if filter else prefilter
+
+
 class CampaignQualification:
     """Handles campaign qualification checks for users and events."""
     
@@ -1136,6 +2738,23 @@ class CampaignQualification:
         """
         self.logger = logger or logging.getLogger('MongoDBPull.CampaignQualification')
     
+    def filter_qualified(self, records: List[Dict[str, Any]], campaign: str, label: str) -> List[Dict[str, Any]]:
+        """
+        Keep only enriched users or events that qualify for a campaign.
+        
+        Args:
+            records: Enriched users or events (with campaign_qualifications)
+            campaign: Campaign name (one of CAMPAIGNS)
+            label: 'users' or 'events' (for logging)
+            
+        Returns:
+            Records whose qualifies_<campaign> flag is set, in their original order.
+        """
+        flag = f'qualifies_{campaign}'
+        qualified = [r for r in records if r.get('campaign_qualifications', {}).get(flag, False)]
+        self.logger.info(f"✓ {len(qualified)} of {len(records)} {label} qualify for {campaign.replace('_', '-')}")
+        return qualified
+    
     def check_user_campaign_qualifications(self, user: Dict[str, Any], events: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Check if user qualifies for various campaigns.
@@ -1621,13 +3240,16 @@ class EventTransformation:
         """
         self.logger = logger or logging.getLogger('MongoDBPull.EventTransformation')
     
-    def enrich_event_with_participants(self, event: Dict[str, Any], user_lookup: Dict[str, Dict[str, Any]]) -> None:
+    def enrich_event_with_participants(self, event: Dict[str, Any], user_lookup: Dict[str, Dict[str, Any]], demographics: Optional[Dict[str, List[Tuple[str, int]]]] = None) -> None:
         """
         Enrich event with participant analysis (modifies event in place).
         
         Args:
             event: Event dictionary (will be modified)
             user_lookup: Dictionary mapping user_id -> user document
+            demographics: Optional pre-aggregated top lists for this event
+                (from MongoDBConnection.aggregate_event_demographics). When given,
+                user_lookup is not used.
         """
         participants = event.get('participants', []) or []
         participant_profiles = []
@@ -1635,25 +3257,27 @@ class EventTransformation:
         occupation_counter = defaultdict(int)
         neighborhood_counter = defaultdict(int)
         
-        for pid in participants:
-            user = user_lookup.get(str(pid))
-            if not user:
-                continue
-            participant_profiles.append(user)
-            
-            # Count interests
-            for interest in user.get('interests', []):
-                interest_counter[str(interest).lower()] += 1
-            
-            # Count occupations
-            occ = user.get('occupation')
-            if occ:
-                occupation_counter[str(occ).lower()] += 1
-            
-            # Count neighborhoods
-            hood = user.get('homeNeighborhood')
-            if hood:
-                neighborhood_counter[str(hood).lower()] += 1
+        # Count participant signals client-side unless MongoDB already aggregated them
+        if demographics is None:
+            for pid in participants:
+                user = user_lookup.get(str(pid))
+                if not user:
+                    continue
+                participant_profiles.append(user)
+                
+                # Count interests
+                for interest in user.get('interests', []):
+                    interest_counter[str(interest).lower()] += 1
+                
+                # Count occupations
+                occ = user.get('occupation')
+                if occ:
+                    occupation_counter[str(occ).lower()] += 1
+                
+                # Count neighborhoods
+                hood = user.get('homeNeighborhood')
+                if hood:
+                    neighborhood_counter[str(hood).lower()] += 1
         
         # Calculate participant count and participation percentage
         # Use len(participants) to count ALL participants, not just those found in user_lookup
@@ -1662,9 +3286,14 @@ class EventTransformation:
         participation_percentage = (participant_count / max_participants * 100) if max_participants > 0 else 0
         
         # Top signals
-        top_interests = sorted(interest_counter.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_occupations = sorted(occupation_counter.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_neighborhoods = sorted(neighborhood_counter.items(), key=lambda x: x[1], reverse=True)[:5]
+        if demographics is not None:
+            top_interests = demographics.get('interests', [])
+            top_occupations = demographics.get('occupations', [])
+            top_neighborhoods = demographics.get('neighborhoods', [])
+        else:
+            top_interests = sorted(interest_counter.items(), key=lambda x: x[1], reverse=True)[:PARTICIPANT_TOP_K]
+            top_occupations = sorted(occupation_counter.items(), key=lambda x: x[1], reverse=True)[:PARTICIPANT_TOP_K]
+            top_neighborhoods = sorted(neighborhood_counter.items(), key=lambda x: x[1], reverse=True)[:PARTICIPANT_TOP_K]
         
         # Add fields to event
         event['participant_profiles_enriched'] = True
@@ -1677,7 +3306,7 @@ class EventTransformation:
         
         self.logger.debug(f"Enriched event '{event.get('name', 'Unknown')}' with {participant_count} participant profiles")
     
-    def transform_events(self, events: List[Dict[str, Any]], user_lookup: Dict[str, Dict[str, Any]], campaign_qualifier: 'CampaignQualification', summary_gen: 'SummaryGeneration') -> List[Dict[str, Any]]:
+    def transform_events(self, events: List[Dict[str, Any]], user_lookup: Dict[str, Dict[str, Any]], campaign_qualifier: 'CampaignQualification', summary_gen: 'SummaryGeneration', demographics: Optional[Dict[str, Dict[str, List[Tuple[str, int]]]]] = None) -> List[Dict[str, Any]]:
         """
         Transform all events by enriching with participant data.
         
@@ -1686,6 +3315,8 @@ class EventTransformation:
             user_lookup: Dictionary mapping user_id -> user document
             campaign_qualifier: CampaignQualification instance
             summary_gen: SummaryGeneration instance
+            demographics: Optional event_id -> pre-aggregated participant top lists
+                (from MongoDBConnection.aggregate_event_demographics)
             
         Returns:
             List of enriched event dictionaries
@@ -1700,7 +3331,8 @@ class EventTransformation:
             if idx % 100 == 0 or idx == total:
                 self.logger.info(f"Processing event {idx}/{total} ({(idx/total)*100:.1f}%)...")
             
-            self.enrich_event_with_participants(event, user_lookup)
+            event_demographics = demographics.get(str(event.get('_id', '')), {}) if demographics is not None else None
+            self.enrich_event_with_participants(event, user_lookup, event_demographics)
             campaign_qualifier.add_campaign_qualifications_to_event(event)
             event['summary'] = summary_gen.generate_event_summary(event)
             enriched_events.append(event)
@@ -1723,65 +3355,182 @@ class EventTransformation:
         self.logger.info("EVENT DISTRIBUTIONS")
         self.logger.info("=" * 80)
         
-        # Event Type Distribution
-        type_counts = defaultdict(int)
-        for event in events:
-            type_counts[event.get('type', 'Unknown')] += 1
+        # Same aggregation the events report renders
+        stats = report_stats('events', (event_report_row(event) for event in events))
         
         self.logger.info("\nEvent Type Distribution:")
-        for event_type, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True):
+        for event_type, count in _by_count(stats['distributions']['type']):
             percentage = (count / len(events)) * 100
             self.logger.info(f"  {event_type}: {count} ({percentage:.1f}%)")
         
-        # Participation Percentage Distribution
-        participation_ranges = {
-            '0-25%': 0,
-            '25-50%': 0,
-            '50-75%': 0,
-            '75-100%': 0,
-            '100%+': 0
-        }
-        for event in events:
-            pct = event.get('participationPercentage', 0)
-            if pct < 25:
-                participation_ranges['0-25%'] += 1
-            elif pct < 50:
-                participation_ranges['25-50%'] += 1
-            elif pct < 75:
-                participation_ranges['50-75%'] += 1
-            elif pct <= 100:
-                participation_ranges['75-100%'] += 1
-            else:
-                participation_ranges['100%+'] += 1
-        
         self.logger.info("\nParticipation Percentage Distribution:")
-        for range_name, count in participation_ranges.items():
+        for range_name in PARTICIPATION_RANGES:
+            count = stats['distributions']['participation'].get(range_name, 0)
             percentage = (count / len(events)) * 100
             self.logger.info(f"  {range_name}: {count} ({percentage:.1f}%)")
         
-        # Campaign Qualification Distribution
-        campaign_counts = {
-            'seat_newcomers': 0,
-            'fill_the_table': 0,
-            'return_to_table': 0
-        }
-        for event in events:
-            quals = event.get('campaign_qualifications', {})
-            if quals.get('qualifies_seat_newcomers'):
-                campaign_counts['seat_newcomers'] += 1
-            if quals.get('qualifies_fill_the_table'):
-                campaign_counts['fill_the_table'] += 1
-            if quals.get('qualifies_return_to_table'):
-                campaign_counts['return_to_table'] += 1
-        
         self.logger.info("\nCampaign Qualification Distribution:")
-        for campaign, count in campaign_counts.items():
+        for campaign in REPORT_CAMPAIGNS:
+            count = stats['sums'][f'qualifies_{campaign}']
             percentage = (count / len(events)) * 100
             self.logger.info(f"  {campaign}: {count} ({percentage:.1f}%)")
         
         self.logger.info("=" * 80)
 
 
+# ============================================================================
+# Co-Attendance Graph Class
+# ============================================================================
+
+class CoAttendanceGraph:
+    """
+    Sparse user x user co-attendance graph for one data snapshot.
+
+    Built once from a UserEventIndex and stored in CSR form: row r holds every user who
+    shared at least one event with user r, with the shared event count and the most
+    recent shared event date. Each event contributes to the upper triangle only once,
+    and rows are mirrored afterwards, so the cost is O(sum of event_size^2 / 2) for the
+    whole snapshot instead of one rebuild per user.
+    """
+
+    def __init__(self, event_index: UserEventIndex, logger: Optional[logging.Logger] = None):
+        """
+        Build the graph.
+
+        Args:
+            event_index: UserEventIndex for the snapshot
+            logger: Optional logger instance
+        """
+        self.logger = logger or logging.getLogger('MongoDBPull.CoAttendanceGraph')
+        self.event_index = event_index
+
+        events = event_index.events()
+        self.user_ids: List[str] = sorted({uid for event in events for uid in event_index.attendees(event)})
+        self._rows: Dict[str, int] = {uid: row for row, uid in enumerate(self.user_ids)}
+        n = len(self.user_ids)
+
+        # Accumulate the upper triangle (a < b) keyed by a * n + b
+        pair_counts: Dict[int, int] = defaultdict(int)
+        pair_last: Dict[int, datetime] = {}
+        for event in events:
+            rows = sorted(self._rows[uid] for uid in event_index.attendees(event))
+            if len(rows) < 2:
+                continue
+            event_date = event_index.start_date(event)
+            for i, a in enumerate(rows):
+                base = a * n
+                for b in rows[i + 1:]:
+                    key = base + b
+                    pair_counts[key] += 1
+                    if event_date and (key not in pair_last or event_date > pair_last[key]):
+                        pair_last[key] = event_date
+
+        # Mirror into per-row adjacency, then compress to CSR arrays sorted by column
+        adjacency: List[List[Tuple[int, int, Optional[datetime]]]] = [[] for _ in range(n)]
+        for key, count in pair_counts.items():
+            a, b = divmod(key, n)
+            last = pair_last.get(key)
+            adjacency[a].append((b, count, last))
+            adjacency[b].append((a, count, last))
+
+        self.indptr = array('l', [0])
+        self.indices = array('l')
+        self.counts = array('l')
+        self.last_dates: List[Optional[datetime]] = []
+        # Per-row positions ordered by shared count desc, then most recent, then user id
+        self._ranked: List[List[int]] = []
+        for row in range(n):
+            neighbours = sorted(adjacency[row])
+            start = len(self.indices)
+            for col, count, last in neighbours:
+                self.indices.append(col)
+                self.counts.append(count)
+                self.last_dates.append(last)
+            self.indptr.append(len(self.indices))
+            self._ranked.append(sorted(
+                range(start, len(self.indices)),
+                key=lambda pos: (
+                    -self.counts[pos],
+                    -(self.last_dates[pos].timestamp()) if self.last_dates[pos] else float('inf'),
+                    self.user_ids[self.indices[pos]]
+                )
+            ))
+
+        self.logger.info(f"✓ Built co-attendance graph: {n} users, {len(pair_counts)} connected pairs")
+
+    def _position(self, user_id: str, other_user_id: str) -> Optional[int]:
+        """Return the CSR position of (user_id, other_user_id), or None if they never met."""
+        row = self._rows.get(user_id)
+        col = self._rows.get(other_user_id)
+        if row is None or col is None:
+            return None
+        start, end = self.indptr[row], self.indptr[row + 1]
+        pos = bisect_left(self.indices, col, start, end)
+        if pos < end and self.indices[pos] == col:
+            return pos
+        return None
+
+    def _connection(self, pos: int) -> Dict[str, Any]:
+        """Format the connection stored at a CSR position."""
+        last = self.last_dates[pos]
+        return {
+            'user_id': self.user_ids[self.indices[pos]],
+            'shared_event_count': self.counts[pos],
+            'last_shared_event_date': last.isoformat() if last else None
+        }
+
+    def top_connections(self, user_id: str, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get a user's connections ordered by shared event count (descending).
+
+        Args:
+            user_id: User ID string
+            n: Optional maximum number of connections to return
+
+        Returns:
+            List of connection dictionaries with user_id, shared_event_count, last_shared_event_date
+        """
+        ranked = self.ranked_positions(user_id)
+        return self.connections_at(ranked if n is None else ranked[:n])
+
+    def ranked_positions(self, user_id: str) -> List[int]:
+        """CSR positions of a user's connections in top_connections order (shared list, do not modify)."""
+        row = self._rows.get(user_id)
+        return self._ranked[row] if row is not None else []
+
+    def connections_at(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        """Format the connections stored at CSR positions (see ranked_positions)."""
+        return [self._connection(pos) for pos in positions]
+
+    def shared_event_count(self, user_id: str, other_user_id: str) -> int:
+        """Number of events both users attended or owned."""
+        pos = self._position(user_id, other_user_id)
+        return self.counts[pos] if pos is not None else 0
+
+    def last_shared_date(self, user_id: str, other_user_id: str) -> Optional[datetime]:
+        """Start date of the most recent event both users attended or owned."""
+        pos = self._position(user_id, other_user_id)
+        return self.last_dates[pos] if pos is not None else None
+
+    def connections_attending(self, user_id: str, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get the user's connections who are attending a given event.
+
+        Args:
+            user_id: User ID string
+            event: Event dictionary (indexed or not, e.g. an upcoming campaign event)
+
+        Returns:
+            List of connection dictionaries ordered like top_connections()
+        """
+        row = self._rows.get(user_id)
+        if row is None:
+            return []
+        attendee_rows = {self._rows[uid] for uid in self.event_index.attendees(event) if uid in self._rows}
+        attendee_rows.discard(row)
+        return [self._connection(pos) for pos in self._ranked[row] if self.indices[pos] in attendee_rows]
+
+
 # ============================================================================
 # Social Connection Class
 # ============================================================================
@@ -1798,36 +3547,48 @@ class SocialConnection:
         """
         self.logger = logger or logging.getLogger('MongoDBPull.SocialConnection')
     
-    def get_user_social_connections(self, user_id: str, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def build_co_attendance_graph(self, event_index: UserEventIndex) -> CoAttendanceGraph:
+        """
+        Build the co-attendance graph for a snapshot (once, shared by all users).
+        
+        Args:
+            event_index: UserEventIndex for the snapshot
+            
+        Returns:
+            CoAttendanceGraph instance
+        """
+        self.logger.info("Building co-attendance graph for social connections...")
+        return CoAttendanceGraph(event_index, self.logger)
+    
+    def get_user_social_connections(self, user_id: str, events: List[Dict[str, Any]], event_index: Optional[UserEventIndex] = None, graph: Optional[CoAttendanceGraph] = None) -> List[Dict[str, Any]]:
         """
         Get users this user has attended events with.
         
         Args:
             user_id: User ID string
             events: List of all event documents
+            event_index: Optional UserEventIndex. If provided, the user's events and their
+                attendee sets are read from the index instead of rescanning events.
+            graph: Optional CoAttendanceGraph. If provided, connections are read straight
+                from the precomputed graph.
             
         Returns:
             List of connection dictionaries with user_id, shared_event_count, last_shared_event_date
         """
         self.logger.debug(f"Finding social connections for user {user_id}...")
         
-        user_events = []
-        for event in events:
-            participants = [str(p) for p in event.get('participants', [])]
-            owner_id = str(event.get('ownerId', ''))
-            if user_id in participants or user_id == owner_id:
-                user_events.append(event)
+        if graph is not None:
+            return graph.top_connections(user_id)
+        
+        if event_index is None:
+            event_index = UserEventIndex.from_events(events)
         
         # Find all other participants
         connection_map = defaultdict(lambda: {'count': 0, 'last_date': None})
-        for event in user_events:
-            participants = [str(p) for p in event.get('participants', [])]
-            owner_id = str(event.get('ownerId', ''))
-            all_participants = set(participants + [owner_id])
-            all_participants.discard(user_id)
-            all_participants.discard('None')
+        for event in event_index.events_for(user_id):
+            all_participants = event_index.attendees(event) - {user_id}
             
-            event_date = parse_iso_date(event.get('startDate'))
+            event_date = event_index.start_date(event)
             for other_user_id in all_participants:
                 connection_map[other_user_id]['count'] += 1
                 if event_date and (connection_map[other_user_id]['last_date'] is None or event_date > connection_map[other_user_id]['last_date']):
@@ -1848,50 +3609,47 @@ class SocialConnection:
         self.logger.debug(f"Found {len(connections)} social connections for user {user_id}")
         return connections
     
-    def get_user_event_history(self, user_id: str, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def get_user_event_history(self, user_id: str, events: List[Dict[str, Any]], event_index: Optional[UserEventIndex] = None) -> List[Dict[str, Any]]:
         """
         Get past events user has attended/owned, sorted by recency.
         
         Args:
             user_id: User ID string
             events: List of all event documents
+            event_index: Optional UserEventIndex holding the pre-sorted past events per user
             
         Returns:
             List of event documents sorted by recency (most recent first)
         """
         self.logger.debug(f"Retrieving event history for user {user_id}...")
         
-        user_events = []
-        now = datetime.now(timezone.utc)
-        
-        for event in events:
-            participants = [str(p) for p in event.get('participants', [])]
-            owner_id = str(event.get('ownerId', ''))
-            if user_id in participants or user_id == owner_id:
-                event_date = parse_iso_date(event.get('startDate'))
-                if event_date and event_date < now:  # Only past events
-                    user_events.append(event)
+        if event_index is None:
+            event_index = UserEventIndex.from_events(events)
         
-        # Sort by startDate (most recent first)
-        user_events.sort(key=lambda e: parse_iso_date(e.get('startDate')) or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+        # Copy so callers can mutate the history without touching the shared index
+        user_events = list(event_index.past_events(user_id))
         
         self.logger.debug(f"Found {len(user_events)} past events for user {user_id}")
         return user_events
     
-    def analyze_user_interests_from_events(self, user_id: str, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def analyze_user_interests_from_events(self, user_id: str, events: List[Dict[str, Any]], event_index: Optional[UserEventIndex] = None) -> Dict[str, Any]:
         """
         Analyze user interests from their event history.
         
         Args:
             user_id: User ID string
             events: List of all event documents
+            event_index: Optional UserEventIndex (avoids rescanning events for the history)
             
         Returns:
             Dictionary with top_categories, top_features, top_venues, event_type_preference, time_patterns
         """
         self.logger.debug(f"Analyzing interests from event history for user {user_id}...")
         
-        user_events = self.get_user_event_history(user_id, events)
+        if event_index is None:
+            event_index = UserEventIndex.from_events(events)
+        
+        user_events = event_index.past_events(user_id)
         
         category_counter = defaultdict(int)
         feature_counter = defaultdict(int)
@@ -1924,7 +3682,7 @@ class SocialConnection:
                 type_counter[event_type] += 1
             
             # Time patterns
-            start_date = parse_iso_date(event.get('startDate'))
+            start_date = event_index.start_date(event)
             if start_date:
                 day_counter[start_date.strftime('%A')] += 1
                 hour_counter[start_date.hour] += 1
@@ -1963,9 +3721,185 @@ class SocialConnection:
         }
 
 
-# ============================================================================
-# Report Generation Class
-# ============================================================================
+# ============================================================================
+# Report Generation Class
+# ============================================================================
+
+# Campaign qualification flags counted in reports
+REPORT_CAMPAIGNS = ('seat_newcomers', 'fill_the_table', 'return_to_table')
+
+# Participation ranges of the events report, in display order
+PARTICIPATION_RANGES = ('0-25%', '25-50%', '50-75%', '75-100%', '100%+')
+
+# Report rows written back for server-side reports: the collection they are stored in,
+# the fields summed in the totals and the fields whose value distributions are counted
+REPORT_SPECS: Dict[str, Dict[str, Any]] = {
+    'users': {
+        'collection': 'report_users',
+        'sums': ('event_count', 'order_count', 'total_spent', 'personalization_ready', 'is_active', 'vip')
+                + tuple(f'qualifies_{campaign}' for campaign in REPORT_CAMPAIGNS),
+        'distributions': ('journey_stage', 'engagement_status', 'value_segment', 'social_role',
+                          'user_segment', 'churn_risk', 'completeness'),
+    },
+    'events': {
+        'collection': 'report_events',
+        'sums': ('participants', 'capacity', 'underfilled', 'well_filled', 'overfilled', 'public')
+                + tuple(f'qualifies_{campaign}' for campaign in REPORT_CAMPAIGNS),
+        'distributions': ('type', 'eventStatus', 'participation'),
+    },
+}
+
+
+def user_report_row(user: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an enriched user to the fields the users report aggregates.
+    
+    Flags are stored as 0/1 so totals are plain sums.
+    
+    Args:
+        user: Enriched user dictionary
+        
+    Returns:
+        Report row keyed by the user's _id.
+    """
+    completeness = user.get('profile_completeness', '0/8 (0%)')
+    filled = int(completeness.split('/')[0]) if '/' in completeness else 0
+    quals = user.get('campaign_qualifications', {})
+    row = {
+        '_id': user.get('_id'),
+        'event_count': user.get('event_count', 0),
+        'order_count': user.get('order_count', 0),
+        'total_spent': user.get('total_spent', 0),
+        'personalization_ready': int(bool(user.get('personalization_ready', False))),
+        'is_active': int(bool(user.get('is_active', False))),
+        'vip': int(user.get('value_segment') == 'VIP'),
+        'journey_stage': user.get('journey_stage', 'Unknown'),
+        'engagement_status': user.get('engagement_status', 'Unknown'),
+        'value_segment': user.get('value_segment', 'Unknown'),
+        'social_role': user.get('social_role', 'Unknown'),
+        'user_segment': user.get('user_segment', 'Unknown'),
+        'churn_risk': user.get('churn_risk', 'Unknown'),
+        'completeness': f"{filled}/8",
+    }
+    for campaign in REPORT_CAMPAIGNS:
+        row[f'qualifies_{campaign}'] = int(bool(quals.get(f'qualifies_{campaign}')))
+    return row
+
+
+def event_report_row(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an enriched event to the fields the events report aggregates.
+    
+    Args:
+        event: Enriched event dictionary
+        
+    Returns:
+        Report row keyed by the event's _id.
+    """
+    pct = event.get('participationPercentage', 0)
+    if pct < 25:
+        participation = '0-25%'
+    elif pct < 50:
+        participation = '25-50%'
+    elif pct < 75:
+        participation = '50-75%'
+    elif pct <= 100:
+        participation = '75-100%'
+    else:
+        participation = '100%+'
+    quals = event.get('campaign_qualifications', {})
+    row = {
+        '_id': event.get('_id'),
+        'participants': event.get('participantCount', len(event.get('participants', []))),
+        'capacity': event.get('maxParticipants') or 0,
+        'participationPercentage': pct,
+        'underfilled': int(pct < 50),
+        'well_filled': int(50 <= pct <= 80),
+        'overfilled': int(pct > 100),
+        'public': int(event.get('type') == 'public'),
+        'type': event.get('type', 'Unknown'),
+        'eventStatus': event.get('eventStatus', 'Unknown'),
+        'participation': participation,
+    }
+    for campaign in REPORT_CAMPAIGNS:
+        row[f'qualifies_{campaign}'] = int(bool(quals.get(f'qualifies_{campaign}')))
+    return row
+
+
+def report_stats(kind: str, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate report rows in Python.
+    
+    Args:
+        kind: 'users' or 'events' (see REPORT_SPECS)
+        rows: Rows from user_report_row / event_report_row
+        
+    Returns:
+        Dictionary with count, sums (field -> total) and distributions
+        (field -> {value: count}), the same shape build_report_pipeline produces.
+    """
+    spec = REPORT_SPECS[kind]
+    stats = {'count': 0, 'sums': {field: 0 for field in spec['sums']}, 'distributions': {field: defaultdict(int) for field in spec['distributions']}}
+    for row in rows:
+        stats['count'] += 1
+        for field in spec['sums']:
+            stats['sums'][field] += row[field]
+        for field in spec['distributions']:
+            stats['distributions'][field][row[field]] += 1
+    stats['distributions'] = {field: dict(counts) for field, counts in stats['distributions'].items()}
+    return stats
+
+
+def build_report_pipeline(kind: str) -> List[Dict[str, Any]]:
+    """
+    Build the $facet aggregation that computes every report table in one pass
+    over a report rows collection.
+    
+    Args:
+        kind: 'users' or 'events' (see REPORT_SPECS)
+        
+    Returns:
+        Aggregation pipeline returning a single document with a 'totals' facet and
+        one facet per distribution field.
+    """
+    spec = REPORT_SPECS[kind]
+    totals = {'_id': None, 'count': {'$sum': 1}}
+    totals.update({field: {'$sum': f'${field}'} for field in spec['sums']})
+    facets = {'totals': [{'$group': totals}]}
+    for field in spec['distributions']:
+        facets[field] = [{'$group': {'_id': f'${field}', 'count': {'$sum': 1}}}]
+    return [{'$facet': facets}]
+
+
+def report_stats_from_facet(kind: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert the build_report_pipeline result to the report_stats shape.
+    
+    Args:
+        kind: 'users' or 'events'
+        result: The single document returned by the $facet aggregation
+        
+    Returns:
+        Dictionary with count, sums and distributions.
+    """
+    spec = REPORT_SPECS[kind]
+    totals = result['totals'][0] if result['totals'] else {}
+    return {
+        'count': totals.get('count', 0),
+        'sums': {field: totals.get(field, 0) for field in spec['sums']},
+        'distributions': {field: {row['_id']: row['count'] for row in result[field]} for field in spec['distributions']},
+    }
+
+
+def _by_count(counts: Dict[Any, int]) -> List[Tuple[Any, int]]:
+    """Distribution entries, most common first (ties by value, so both report paths agree)"""
+    return sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+def _by_filled(counts: Dict[str, int]) -> List[Tuple[str, int]]:
+    """Profile completeness entries, most complete first"""
+    return sorted(counts.items(), key=lambda item: int(item[0].split('/')[0]), reverse=True)
+
 
 class ReportGeneration:
     """Handles generation of markdown reports for users and events."""
@@ -1982,12 +3916,14 @@ class ReportGeneration:
         self.reports_dir = os.path.join(self.module_dir, 'reports')
         os.makedirs(self.reports_dir, exist_ok=True)
     
-    def generate_users_report(self, users: List[Dict[str, Any]]) -> str:
+    def generate_users_report(self, users: Optional[List[Dict[str, Any]]] = None, stats: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate comprehensive markdown report for users.
         
         Args:
             users: List of enriched user dictionaries
+            stats: Optional precomputed report_stats('users', ...) (e.g. from
+                MongoDBConnection.aggregate_report); users are not needed when given
             
         Returns:
             Path to generated report file
@@ -1996,47 +3932,27 @@ class ReportGeneration:
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         report_file = os.path.join(self.reports_dir, f"users_report_{timestamp}.md")
         
+        if stats is None:
+            stats = report_stats('users', (user_report_row(user) for user in users))
+        sums, distributions = stats['sums'], stats['distributions']
+        
         # Calculate aggregate metrics
-        total_users = len(users)
-        total_events = sum(u.get('event_count', 0) for u in users)
-        total_orders = sum(u.get('order_count', 0) for u in users)
-        total_spent = sum(u.get('total_spent', 0) for u in users)
+        total_users = stats['count']
+        total_events = sums['event_count']
+        total_orders = sums['order_count']
+        total_spent = sums['total_spent']
         avg_events_per_user = total_events / total_users if total_users > 0 else 0
         avg_spent_per_user = total_spent / total_users if total_users > 0 else 0
         
-        # Calculate segment distributions
-        journey_counts = defaultdict(int)
-        engagement_counts = defaultdict(int)
-        value_counts = defaultdict(int)
-        social_counts = defaultdict(int)
-        user_seg_counts = defaultdict(int)
-        churn_counts = defaultdict(int)
-        completeness_counts = defaultdict(int)
-        campaign_qual_counts = {
-            'seat_newcomers': 0,
-            'fill_the_table': 0,
-            'return_to_table': 0
-        }
-        
-        for user in users:
-            journey_counts[user.get('journey_stage', 'Unknown')] += 1
-            engagement_counts[user.get('engagement_status', 'Unknown')] += 1
-            value_counts[user.get('value_segment', 'Unknown')] += 1
-            social_counts[user.get('social_role', 'Unknown')] += 1
-            user_seg_counts[user.get('user_segment', 'Unknown')] += 1
-            churn_counts[user.get('churn_risk', 'Unknown')] += 1
-            
-            completeness = user.get('profile_completeness', '0/8 (0%)')
-            filled = int(completeness.split('/')[0]) if '/' in completeness else 0
-            completeness_counts[f"{filled}/8"] += 1
-            
-            quals = user.get('campaign_qualifications', {})
-            if quals.get('qualifies_seat_newcomers'):
-                campaign_qual_counts['seat_newcomers'] += 1
-            if quals.get('qualifies_fill_the_table'):
-                campaign_qual_counts['fill_the_table'] += 1
-            if quals.get('qualifies_return_to_table'):
-                campaign_qual_counts['return_to_table'] += 1
+        # Segment distributions
+        journey_counts = distributions['journey_stage']
+        engagement_counts = distributions['engagement_status']
+        value_counts = distributions['value_segment']
+        social_counts = distributions['social_role']
+        user_seg_counts = distributions['user_segment']
+        churn_counts = distributions['churn_risk']
+        completeness_counts = distributions['completeness']
+        campaign_qual_counts = {campaign: sums[f'qualifies_{campaign}'] for campaign in REPORT_CAMPAIGNS}
         
         # Generate markdown content
         markdown = []
@@ -2062,7 +3978,7 @@ class ReportGeneration:
         markdown.append("### Journey Stage Distribution\n")
         markdown.append("| Journey Stage | Count | Percentage |")
         markdown.append("|--------------|-------|------------|")
-        for stage, count in sorted(journey_counts.items(), key=lambda x: x[1], reverse=True):
+        for stage, count in _by_count(journey_counts):
             pct = (count / total_users) * 100
             markdown.append(f"| {stage} | {count:,} | {pct:.1f}% |")
         
@@ -2070,7 +3986,7 @@ class ReportGeneration:
         markdown.append("\n### Engagement Status Distribution\n")
         markdown.append("| Engagement Status | Count | Percentage |")
         markdown.append("|-------------------|-------|------------|")
-        for status, count in sorted(engagement_counts.items(), key=lambda x: x[1], reverse=True):
+        for status, count in _by_count(engagement_counts):
             pct = (count / total_users) * 100
             markdown.append(f"| {status} | {count:,} | {pct:.1f}% |")
         
@@ -2078,7 +3994,7 @@ class ReportGeneration:
         markdown.append("\n### Value Segment Distribution\n")
         markdown.append("| Value Segment | Count | Percentage |")
         markdown.append("|---------------|-------|------------|")
-        for segment, count in sorted(value_counts.items(), key=lambda x: x[1], reverse=True):
+        for segment, count in _by_count(value_counts):
             pct = (count / total_users) * 100
             markdown.append(f"| {segment} | {count:,} | {pct:.1f}% |")
         
@@ -2086,7 +4002,7 @@ class ReportGeneration:
         markdown.append("\n### Social Role Distribution\n")
         markdown.append("| Social Role | Count | Percentage |")
         markdown.append("|------------|-------|------------|")
-        for role, count in sorted(social_counts.items(), key=lambda x: x[1], reverse=True):
+        for role, count in _by_count(social_counts):
             pct = (count / total_users) * 100
             markdown.append(f"| {role} | {count:,} | {pct:.1f}% |")
         
@@ -2094,7 +4010,7 @@ class ReportGeneration:
         markdown.append("\n### User Segment Distribution\n")
         markdown.append("| User Segment | Count | Percentage |")
         markdown.append("|--------------|-------|------------|")
-        for segment, count in sorted(user_seg_counts.items(), key=lambda x: x[1], reverse=True):
+        for segment, count in _by_count(user_seg_counts):
             pct = (count / total_users) * 100
             markdown.append(f"| {segment} | {count:,} | {pct:.1f}% |")
         
@@ -2102,7 +4018,7 @@ class ReportGeneration:
         markdown.append("\n### Churn Risk Distribution\n")
         markdown.append("| Churn Risk | Count | Percentage |")
         markdown.append("|------------|-------|------------|")
-        for risk, count in sorted(churn_counts.items(), key=lambda x: x[1], reverse=True):
+        for risk, count in _by_count(churn_counts):
             pct = (count / total_users) * 100
             markdown.append(f"| {risk} | {count:,} | {pct:.1f}% |")
         
@@ -2110,7 +4026,7 @@ class ReportGeneration:
         markdown.append("\n### Profile Completeness Distribution\n")
         markdown.append("| Completeness | Count | Percentage |")
         markdown.append("|--------------|-------|------------|")
-        for comp, count in sorted(completeness_counts.items(), key=lambda x: int(x[0].split('/')[0]), reverse=True):
+        for comp, count in _by_filled(completeness_counts):
             pct = (count / total_users) * 100
             markdown.append(f"| {comp} | {count:,} | {pct:.1f}% |")
         
@@ -2171,9 +4087,9 @@ class ReportGeneration:
         
         # Insights
         markdown.append("\n## Key Insights\n")
-        ready_count = sum(1 for u in users if u.get('personalization_ready', False))
-        active_count = sum(1 for u in users if u.get('is_active', False))
-        vip_count = sum(1 for u in users if u.get('value_segment') == 'VIP')
+        ready_count = sums['personalization_ready']
+        active_count = sums['is_active']
+        vip_count = sums['vip']
         
         markdown.append(f"- **Personalization Ready:** {ready_count:,} users ({ready_count/total_users*100:.1f}%) have complete profiles ready for personalization")
         markdown.append(f"- **Active Users:** {active_count:,} users ({active_count/total_users*100:.1f}%) are currently active (≤30 days inactive)")
@@ -2187,12 +4103,14 @@ class ReportGeneration:
         self.logger.info(f"✓ Generated users report: {report_file}")
         return report_file
     
-    def generate_events_report(self, events: List[Dict[str, Any]]) -> str:
+    def generate_events_report(self, events: Optional[List[Dict[str, Any]]] = None, stats: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate comprehensive markdown report for events.
         
         Args:
             events: List of enriched event dictionaries
+            stats: Optional precomputed report_stats('events', ...) (e.g. from
+                MongoDBConnection.aggregate_report); events are not needed when given
             
         Returns:
             Path to generated report file
@@ -2201,51 +4119,21 @@ class ReportGeneration:
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         report_file = os.path.join(self.reports_dir, f"events_report_{timestamp}.md")
         
+        if stats is None:
+            stats = report_stats('events', (event_report_row(event) for event in events))
+        sums, distributions = stats['sums'], stats['distributions']
+        
         # Calculate aggregate metrics
-        total_events = len(events)
-        total_participants = sum(e.get('participantCount', len(e.get('participants', []))) for e in events)
-        total_capacity = sum(e.get('maxParticipants') or 0 for e in events)
+        total_events = stats['count']
+        total_participants = sums['participants']
+        total_capacity = sums['capacity']
         avg_participation = (total_participants / total_capacity * 100) if total_capacity > 0 else 0
         
-        # Calculate segment distributions
-        type_counts = defaultdict(int)
-        status_counts = defaultdict(int)
-        participation_ranges = {
-            '0-25%': 0,
-            '25-50%': 0,
-            '50-75%': 0,
-            '75-100%': 0,
-            '100%+': 0
-        }
-        campaign_qual_counts = {
-            'seat_newcomers': 0,
-            'fill_the_table': 0,
-            'return_to_table': 0
-        }
-        
-        for event in events:
-            type_counts[event.get('type', 'Unknown')] += 1
-            status_counts[event.get('eventStatus', 'Unknown')] += 1
-            
-            pct = event.get('participationPercentage', 0)
-            if pct < 25:
-                participation_ranges['0-25%'] += 1
-            elif pct < 50:
-                participation_ranges['25-50%'] += 1
-            elif pct < 75:
-                participation_ranges['50-75%'] += 1
-            elif pct <= 100:
-                participation_ranges['75-100%'] += 1
-            else:
-                participation_ranges['100%+'] += 1
-            
-            quals = event.get('campaign_qualifications', {})
-            if quals.get('qualifies_seat_newcomers'):
-                campaign_qual_counts['seat_newcomers'] += 1
-            if quals.get('qualifies_fill_the_table'):
-                campaign_qual_counts['fill_the_table'] += 1
-            if quals.get('qualifies_return_to_table'):
-                campaign_qual_counts['return_to_table'] += 1
+        # Segment distributions
+        type_counts = distributions['type']
+        status_counts = distributions['eventStatus']
+        participation_ranges = {name: distributions['participation'].get(name, 0) for name in PARTICIPATION_RANGES}
+        campaign_qual_counts = {campaign: sums[f'qualifies_{campaign}'] for campaign in REPORT_CAMPAIGNS}
         
         # Generate markdown content
         markdown = []
@@ -2269,7 +4157,7 @@ class ReportGeneration:
         markdown.append("### Event Type Distribution\n")
         markdown.append("| Event Type | Count | Percentage |")
         markdown.append("|------------|-------|------------|")
-        for event_type, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True):
+        for event_type, count in _by_count(type_counts):
             pct = (count / total_events) * 100
             markdown.append(f"| {event_type} | {count:,} | {pct:.1f}% |")
         
@@ -2277,7 +4165,7 @@ class ReportGeneration:
         markdown.append("\n### Event Status Distribution\n")
         markdown.append("| Event Status | Count | Percentage |")
         markdown.append("|--------------|-------|------------|")
-        for status, count in sorted(status_counts.items(), key=lambda x: x[1], reverse=True):
+        for status, count in _by_count(status_counts):
             pct = (count / total_events) * 100
             markdown.append(f"| {status} | {count:,} | {pct:.1f}% |")
         
@@ -2336,83 +4224,1237 @@ class ReportGeneration:
 | `summary` | str | Generated event summary with venue, categories, features, participation | `generate_event_summary()` |
 """)
         
-        # Campaign Qualification Criteria
-        markdown.append("\n### Campaign Qualification Criteria\n")
-        markdown.append("""
-#### seat-newcomers
-- Future event (`startDate > now`)
-- Public event (`type == "public"`)
-- Has capacity (`maxParticipants > 0`)
-- Good participation (50-80% filled)
+        # Campaign Qualification Criteria
+        markdown.append("\n### Campaign Qualification Criteria\n")
+        markdown.append("""
+#### seat-newcomers
+- Future event (`startDate > now`)
+- Public event (`type == "public"`)
+- Has capacity (`maxParticipants > 0`)
+- Good participation (50-80% filled)
+
+#### fill-the-table
+- Future event (`startDate > now`)
+- Public event (`type == "public"`)
+- Underfilled (`participationPercentage < 50%`)
+- Has capacity (`maxParticipants > 0`)
+
+#### return-to-table
+- Future event (`startDate > now`)
+- Public event (`type == "public"`)
+- Has capacity (`maxParticipants > 0`)
+- Prefers higher participation (>60%)
+""")
+        
+        # Insights
+        markdown.append("\n## Key Insights\n")
+        underfilled = sums['underfilled']
+        well_filled = sums['well_filled']
+        overfilled = sums['overfilled']
+        public_events = sums['public']
+        
+        markdown.append(f"- **Underfilled Events:** {underfilled:,} events ({underfilled/total_events*100:.1f}%) have <50% participation")
+        markdown.append(f"- **Well-Filled Events:** {well_filled:,} events ({well_filled/total_events*100:.1f}%) have 50-80% participation")
+        markdown.append(f"- **Overfilled Events:** {overfilled:,} events ({overfilled/total_events*100:.1f}%) have >100% participation")
+        markdown.append(f"- **Public Events:** {public_events:,} events ({public_events/total_events*100:.1f}%) are public")
+        markdown.append(f"- **Average Participation:** {avg_participation:.1f}% across all events")
+        
+        # Write report
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(markdown))
+        
+        self.logger.info(f"✓ Generated events report: {report_file}")
+        return report_file
+
+
+# ============================================================================
+# Delta Snapshot Class
+# ============================================================================
+
+# Candidate high-water mark fields, in order of preference
+WATERMARK_FIELDS = ('updatedAt', 'createdAt', '_id')
+
+# Hours between full reconciles (full re-download, which also drops deleted documents)
+DEFAULT_RECONCILE_HOURS = 24
+
+
+def _watermark_value(value: Any) -> bool:
+    """Whether a value can carry a watermark (a non-empty str, a datetime or an ObjectId)."""
+    return isinstance(value, (str, datetime, ObjectId)) and value != ''
+
+
+def _project_document(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply an inclusion projection to a document locally (top-level paths, like build_projection output)."""
+    if projection is None:
+        return dict(document)
+    keep = {path.split('.', 1)[0] for path in projection}
+    keep.add('_id')
+    return {key: value for key, value in document.items() if key in keep}
+
+
+class DeltaSnapshot:
+    """
+    Local snapshot of unfiltered collections, kept current with incremental pulls.
+    
+    Each collection is stored as an Extended JSON file plus a metadata file holding the
+    high-water mark: the largest value of the first WATERMARK_FIELDS field that most
+    documents carry. Documents without that field (e.g. legacy documents without
+    updatedAt) are tracked by a secondary mark on a later WATERMARK_FIELDS field. Later
+    pulls only query documents at or above the marks and merge them into the snapshot
+    by _id. Because deletes (and edits that do not move a mark, e.g. when the mark is
+    createdAt or _id) are invisible to a delta query, a full reconcile re-downloads the
+    collection every reconcile_hours; falling back to such a mark is logged as a warning.
+    """
+    
+    def __init__(self, connection: MongoDBConnection, snapshot_dir: Optional[str] = None, reconcile_hours: float = DEFAULT_RECONCILE_HOURS, logger: Optional[logging.Logger] = None):
+        """
+        Initialize DeltaSnapshot.
+        
+        Args:
+            connection: MongoDBConnection used for full and delta queries
+            snapshot_dir: Directory for snapshot files (default: 'snapshots' in module directory)
+            reconcile_hours: Hours between full reconciles
+            logger: Optional logger instance
+        """
+        self.connection = connection
+        self.snapshot_dir = snapshot_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+        self.reconcile_hours = reconcile_hours
+        self.logger = logger or logging.getLogger('MongoDBPull.DeltaSnapshot')
+        self._documents: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self._meta: Dict[str, Dict[str, Any]] = {}
+    
+    def _paths(self, collection: str) -> Tuple[str, str]:
+        """Snapshot and metadata file paths for a collection."""
+        return (os.path.join(self.snapshot_dir, f"{collection}.snapshot.json"),
+                os.path.join(self.snapshot_dir, f"{collection}.meta.json"))
+    
+    def _load(self, collection: str) -> bool:
+        """Load a collection snapshot from disk into memory. Returns False if there is none."""
+        if collection in self._documents:
+            return True
+        snapshot_path, meta_path = self._paths(collection)
+        if not (os.path.exists(snapshot_path) and os.path.exists(meta_path)):
+            return False
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            self._meta[collection] = json_util.loads(f.read(), json_options=SNAPSHOT_JSON_OPTIONS)
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            documents = json_util.loads(f.read(), json_options=SNAPSHOT_JSON_OPTIONS)
+        self._documents[collection] = {doc['_id']: doc for doc in documents}
+        self.logger.debug(f"Loaded {len(documents)} {collection} documents from snapshot")
+        return True
+    
+    def _save(self, collection: str) -> None:
+        """Write a collection snapshot and its metadata atomically."""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        snapshot_path, meta_path = self._paths(collection)
+        for path, payload in ((snapshot_path, list(self._documents[collection].values())), (meta_path, self._meta[collection])):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json_util.dumps(payload, json_options=SNAPSHOT_JSON_OPTIONS))
+            os.replace(tmp_path, path)
+    
+    @staticmethod
+    def _watermark(documents: Iterable[Dict[str, Any]]) -> Tuple[Optional[str], Any, Optional[str], Any]:
+        """
+        Pick the watermark fields and their high-water values for a set of documents.
+        
+        The primary field is the first of WATERMARK_FIELDS that more than half of the
+        documents carry with one comparable type (str, datetime or ObjectId). Documents
+        where it is missing, null or empty get a secondary mark: the first later
+        WATERMARK_FIELDS field that all of them carry with one comparable type.
+        
+        Returns:
+            Tuple of (field, value, secondary field, secondary value). The secondary pair
+            is (None, None) when no document lacks the primary field or no field
+            qualifies; everything is None when no primary field qualifies.
+        """
+        documents = list(documents)
+        for position, field in enumerate(WATERMARK_FIELDS):
+            values = [doc.get(field) for doc in documents]
+            types = Counter(type(v) for v in values if _watermark_value(v))
+            if not types:
+                continue
+            mark_type, count = types.most_common(1)[0]
+            if count * 2 <= len(documents):
+                continue
+            value = max(v for v in values if type(v) is mark_type and _watermark_value(v))
+            unmarked = [doc for doc, v in zip(documents, values) if v is None or v == '']
+            for secondary in WATERMARK_FIELDS[position + 1:] if unmarked else ():
+                secondary_values = [doc.get(secondary) for doc in unmarked]
+                if all(_watermark_value(v) for v in secondary_values) and len({type(v) for v in secondary_values}) == 1:
+                    return field, value, secondary, max(secondary_values)
+            return field, value, None, None
+        return None, None, None, None
+    
+    def _needs_full_sync(self, collection: str, projection: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Return the reason a full sync is required, or None if a delta pull suffices."""
+        if not self._load(collection):
+            return "no snapshot"
+        meta = self._meta[collection]
+        stored_projection = meta.get('projection')
+        if stored_projection is not None and (projection is None or not set(projection) <= set(stored_projection)):
+            return "snapshot lacks requested fields"
+        if meta.get('watermark_field') is None:
+            return "no usable watermark field"
+        last_full_sync = parse_iso_date(meta.get('last_full_sync'))
+        if last_full_sync is None or (datetime.now(timezone.utc) - last_full_sync).total_seconds() >= self.reconcile_hours * 3600:
+            return "reconcile due"
+        return None
+    
+    def pull(self, collection: str, projection: Optional[Dict[str, Any]] = None, full: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return every document of a collection, fetching only changes since the last pull.
+        
+        Args:
+            collection: Collection name ('user', 'event', 'order')
+            projection: Optional projection for the returned documents. The snapshot keeps
+                the union of the pulls' projections so users and events pulls share it.
+            full: If True, force a full reconcile
+            
+        Returns:
+            List of documents (fresh copies, safe to mutate) in snapshot order.
+        """
+        reason = "forced" if full else self._needs_full_sync(collection, projection)
+        now_iso = datetime.now(timezone.utc).isoformat()
+        
+        if reason:
+            # Snapshot projection: everything the pulls read, plus the watermark candidates
+            stored_projection = None
+            if projection is not None:
+                previous = self._meta.get(collection, {}).get('projection') or {}
+                stored_projection = dict(build_projection(PULL_STAGES, collection) or {})
+                stored_projection.update(previous)
+                stored_projection.update(projection)
+                stored_projection.update({field: 1 for field in WATERMARK_FIELDS if field != '_id'})
+            self.logger.info(f"Full snapshot sync of '{collection}' ({reason})...")
+            documents = self.connection.read_collection(collection, projection=stored_projection, lazy=False)
+            self._documents[collection] = {doc['_id']: doc for doc in documents}
+            documents = self._documents[collection].values()
+            field, value, secondary, secondary_value = self._watermark(documents)
+            self._meta[collection] = {
+                'collection': collection,
+                'projection': stored_projection,
+                'watermark_field': field,
+                'watermark': value,
+                'secondary_watermark_field': secondary,
+                'secondary_watermark': secondary_value,
+                'last_full_sync': now_iso,
+                'last_sync': now_iso,
+            }
+            self.logger.info(f"✓ Snapshot of '{collection}': {len(self._documents[collection])} documents (watermark: {field})")
+            if field is not None and field != WATERMARK_FIELDS[0]:
+                self.logger.warning(f"'{collection}' documents mostly lack {WATERMARK_FIELDS[0]}; delta pulls track {field}, so in-place edits only show up at the next full reconcile (every {self.reconcile_hours}h)")
+            if field is not None:
+                missing = sum(1 for doc in documents if doc.get(field) is None or doc.get(field) == '')
+                mistyped = sum(1 for doc in documents if _watermark_value(doc.get(field)) and type(doc.get(field)) is not type(value))
+                if missing and secondary:
+                    self.logger.info(f"  {missing} '{collection}' documents lack {field}; delta pulls track them by {secondary}")
+                elif missing:
+                    self.logger.warning(f"{missing} '{collection}' documents lack {field} and a common secondary watermark; they only refresh at the next full reconcile")
+                if mistyped:
+                    self.logger.warning(f"{mistyped} '{collection}' documents have a {field} of another type; they only refresh at the next full reconcile")
+        else:
+            meta = self._meta[collection]
+            field = meta['watermark_field']
+            secondary = meta.get('secondary_watermark_field')
+            delta_filter = {field: {'$gte': meta['watermark']}}
+            if secondary:
+                # Documents without the primary field, by the secondary mark
+                delta_filter = {'$or': [delta_filter, {field: {'$in': [None, '']}, secondary: {'$gte': meta['secondary_watermark']}}]}
+            changed = self.connection.read_collection(collection, filter=delta_filter, projection=meta['projection'], lazy=False)
+            
+            snapshot = self._documents[collection]
+            new_count = sum(1 for doc in changed if doc['_id'] not in snapshot)
+            for doc in changed:
+                snapshot[doc['_id']] = doc
+            
+            # Advance the marks over comparable values only (a changed document may lack the field)
+            values = [doc.get(field) for doc in changed if type(doc.get(field)) is type(meta['watermark']) and _watermark_value(doc.get(field))]
+            meta['watermark'] = max(values + [meta['watermark']])
+            if secondary:
+                values = [doc.get(secondary) for doc in changed
+                          if (doc.get(field) is None or doc.get(field) == '') and type(doc.get(secondary)) is type(meta['secondary_watermark'])]
+                meta['secondary_watermark'] = max(values + [meta['secondary_watermark']])
+            meta['last_sync'] = now_iso
+            self.logger.info(f"✓ Delta sync of '{collection}': {len(changed)} changed ({new_count} new), {len(snapshot)} documents in snapshot")
+        
+        self._meta[collection]['count'] = len(self._documents[collection])
+        self._save(collection)
+        return [_project_document(doc, projection) for doc in self._documents[collection].values()]
+
+
+# ============================================================================
+# Materialized Enrichment
+# ============================================================================
+
+# Collections the enriched fields of each pull are written back to
+MATERIALIZED_COLLECTIONS = {'users': 'user_enriched', 'events': 'event_enriched'}
+
+# Derived fields written back, per pull. Values that move with the clock are left out,
+# since they would make every document look changed every day: the day counters
+# (days_inactive, days_since_registration) and the scores computed from them
+# (newcomer_score, reactivation_score) follow from last_active / createdAt, and
+# campaign qualifications are stored as their flags only (the reasons embed day counts).
+MATERIALIZED_FIELDS = {
+    'users': (
+        'event_count', 'order_count', 'total_order_amount', 'total_spent', 'last_active',
+        'engagement_status', 'is_active', 'journey_stage', 'value_segment', 'social_role',
+        'churn_risk', 'user_segment', 'cohort', 'profile_completeness', 'personalization_ready',
+        'campaign_qualifications', 'summary',
+    ),
+    'events': (
+        'participantCount', 'participationPercentage', 'participant_count',
+        'participant_top_interests', 'participant_top_occupations', 'participant_top_neighborhoods',
+        'campaign_qualifications', 'summary',
+    ),
+}
+
+# Secondary indexes on the materialized collections (campaign and segment lookups)
+MATERIALIZED_INDEXES = {
+    'users': ['journey_stage', 'engagement_status', 'user_segment', 'value_segment', 'churn_risk']
+             + [f'campaign_qualifications.qualifies_{campaign}' for campaign in CAMPAIGNS],
+    'events': [f'campaign_qualifications.qualifies_{campaign}' for campaign in CAMPAIGNS],
+}
+
+# Documents compared and written per bulk_write
+MATERIALIZE_BATCH_SIZE = 1000
+
+
+def enrichment_document(kind: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the materialized document for an enriched user or event.
+    
+    Args:
+        kind: 'users' or 'events'
+        record: Enriched user or event (must carry _id)
+        
+    Returns:
+        Dictionary with _id, the MATERIALIZED_FIELDS the record has (campaign
+        qualifications reduced to their qualifies_* flags) and enrichment_hash, a digest
+        of those fields that changes only when one of them does.
+    """
+    fields = {field: record[field] for field in MATERIALIZED_FIELDS[kind] if field in record}
+    if 'campaign_qualifications' in fields:
+        fields['campaign_qualifications'] = {key: value for key, value in fields['campaign_qualifications'].items() if key.startswith('qualifies_')}
+    payload = json_util.dumps(fields, sort_keys=True, json_options=SNAPSHOT_JSON_OPTIONS)
+    fields['enrichment_hash'] = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    fields['_id'] = record['_id']
+    return fields
+
+
+class EnrichmentMaterializer:
+    """
+    Writes enriched fields back to MongoDB (user_enriched / event_enriched).
+    
+    Each enriched record becomes one document keyed by the source _id. Existing hashes
+    are read per batch and only documents whose enrichment_hash differs are upserted,
+    with one unordered bulk_write per batch. Re-running with the same input writes
+    nothing, and an interrupted run resumes by skipping the batches already written.
+    """
+    
+    def __init__(self, connection: MongoDBConnection, logger: Optional[logging.Logger] = None, batch_size: int = MATERIALIZE_BATCH_SIZE):
+        """
+        Initialize EnrichmentMaterializer.
+        
+        Args:
+            connection: MongoDBConnection of the database to write to
+            logger: Optional logger instance
+            batch_size: Documents compared and written per bulk_write
+        """
+        self.connection = connection
+        self.logger = logger or logging.getLogger('MongoDBPull.EnrichmentMaterializer')
+        self.batch_size = batch_size
+        self._indexed: Set[str] = set()
+    
+    def ensure_indexes(self, kind: str) -> None:
+        """Create the MATERIALIZED_INDEXES of a collection (once per materializer)."""
+        if kind in self._indexed:
+            return
+        collection = self.connection.get_database()[MATERIALIZED_COLLECTIONS[kind]]
+        collection.create_indexes([IndexModel([(field, ASCENDING)]) for field in MATERIALIZED_INDEXES[kind]])
+        self._indexed.add(kind)
+    
+    def write(self, kind: str, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Upsert the enriched fields of records whose derived values changed.
+        
+        Args:
+            kind: 'users' or 'events'
+            records: Enriched users or events
+            
+        Returns:
+            Dictionary with collection, total, written (upserted + modified), unchanged,
+            seconds and docs_per_sec (records processed per second).
+        """
+        start = time.perf_counter()
+        self.ensure_indexes(kind)
+        collection = self.connection.get_database()[MATERIALIZED_COLLECTIONS[kind]]
+        total = written = 0
+        records = iter(records)
+        while True:
+            documents = [enrichment_document(kind, record) for record in islice(records, self.batch_size)]
+            if not documents:
+                break
+            total += len(documents)
+            ids = [document['_id'] for document in documents]
+            stored = {row['_id']: row.get('enrichment_hash') for row in collection.find({'_id': {'$in': ids}}, {'enrichment_hash': 1})}
+            now = datetime.now(timezone.utc)
+            operations = [
+                UpdateOne({'_id': document['_id']}, {'$set': {**document, 'enriched_at': now}}, upsert=True)
+                for document in documents if stored.get(document['_id']) != document['enrichment_hash']
+            ]
+            if operations:
+                result = collection.bulk_write(operations, ordered=False)
+                written += result.upserted_count + result.modified_count
+        
+        seconds = time.perf_counter() - start
+        stats = {
+            'collection': collection.name,
+            'total': total,
+            'written': written,
+            'unchanged': total - written,
+            'seconds': round(seconds, 3),
+            'docs_per_sec': round(total / seconds) if seconds > 0 else 0,
+        }
+        self.logger.info(f"✓ Materialized {total} {kind} into '{collection.name}': {written} written, {total - written} unchanged ({stats['docs_per_sec']:,} docs/sec)")
+        return stats
+
+
+# ============================================================================
+# Compact Records
+# ============================================================================
+
+# Fields users_pull sets on a user after step 2, in the order they are set
+USER_STEP3_FIELDS = ('campaign_qualifications', 'summary', 'social_connections', 'event_history',
+                     'interest_analysis', 'newcomer_score', 'reactivation_score')
+
+# Fields events_pull sets on an event, in the order they are set
+EVENT_ENRICHED_FIELDS = ('participant_profiles_enriched', 'participant_count', 'participantCount',
+                         'participationPercentage', 'participant_top_interests',
+                         'participant_top_occupations', 'participant_top_neighborhoods',
+                         'campaign_qualifications', 'summary')
+
+# Step-3 user fields that users_pull(lazy=True) computes on first read, in the order
+# users_pull sets them (see LazyUserFields)
+USER_LAZY_FIELDS = ('summary', 'social_connections', 'event_history', 'interest_analysis')
+
+# Marks unset slots and keys deleted from a record's raw document
+_ABSENT = object()
+
+
+class EventTable:
+    """
+    Shared event_id -> event table that EnrichedUser.event_history resolves against.
+    
+    One table serves every user of a pull, so a history is a tuple of (interned) event
+    IDs instead of a list per user. users_events_pull swaps in the enriched events once
+    events_pull has run, so histories resolve to enriched events as in the dict output.
+    """
+    
+    __slots__ = ('_events',)
+    
+    def __init__(self, events: Iterable[Dict[str, Any]] = ()):
+        """
+        Initialize EventTable.
+        
+        Args:
+            events: Optional events to register up front
+        """
+        self._events: Dict[str, Dict[str, Any]] = {}
+        self.update(events)
+    
+    def add(self, event: Dict[str, Any]) -> str:
+        """Register an event unless its ID is already known. Returns the (interned) ID."""
+        event_id = sys.intern(str(event.get('_id', '')))
+        self._events.setdefault(event_id, event)
+        return event_id
+    
+    def update(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Register events, replacing any already stored under the same ID."""
+        for event in events:
+            self._events[sys.intern(str(event.get('_id', '')))] = event
+    
+    def resolve(self, event_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Events for a sequence of IDs, in order."""
+        return [self._events[event_id] for event_id in event_ids]
+    
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class EnrichedRecord(MutableMapping):
+    """
+    Dict-compatible enriched document with the derived fields in __slots__.
+    
+    The raw document is kept by reference and never modified: FIELDS are stored in
+    slots, and any other key written (or deleted) goes to a small overlay. Keys iterate
+    in dict order for the pulls: raw keys first, then the FIELDS that are set (or
+    pending, for lazy fields), then other added keys. Records compare equal to the dicts
+    the dict-mode pulls return.
+    """
+    
+    __slots__ = ('_raw', '_overlay')
+    FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET: frozenset = frozenset()
+    
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+    
+    def __init__(self, raw: Dict[str, Any], fields: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the record.
+        
+        Args:
+            raw: Raw document (kept by reference, never modified)
+            fields: Optional derived values to set
+        """
+        self._raw = raw
+        self._overlay: Optional[Dict[str, Any]] = None
+        for key, value in (fields or {}).items():
+            self[key] = value
+    
+    @classmethod
+    def from_enriched(cls, raw: Dict[str, Any], enriched: Dict[str, Any], **kwargs: Any) -> 'EnrichedRecord':
+        """
+        Build a record from an enriched dict built as {**raw, ...}.
+        
+        Args:
+            raw: Raw document the enriched dict was built from
+            enriched: Enriched dict
+            **kwargs: Extra constructor arguments of the subclass
+            
+        Returns:
+            Record holding raw by reference and only the keys whose values differ from it.
+        """
+        record = cls(raw, **kwargs)
+        for key, value in enriched.items():
+            if key in cls._FIELD_SET or raw.get(key, _ABSENT) is not value:
+                record[key] = value
+        return record
+    
+    def _load(self, key: str, value: Any) -> Any:
+        """Value returned for a set slot (subclasses resolve stored forms here)."""
+        return value
+    
+    def _store(self, key: str, value: Any) -> Any:
+        """Form a value is kept in its slot (subclasses compact values here)."""
+        return value
+    
+    def _lazy_field(self, key: str) -> bool:
+        """Whether a field is computed on first read (subclasses with lazy fields)."""
+        return False
+    
+    def _compute(self, key: str) -> None:
+        """Compute and set a lazy field."""
+        raise KeyError(key)
+    
+    def _pending(self, key: str) -> bool:
+        """Whether key is a lazy field that has not been computed (or deleted) yet."""
+        if key not in self._FIELD_SET or not self._lazy_field(key) or getattr(self, key, _ABSENT) is not _ABSENT:
+            return False
+        return self._overlay is None or self._overlay.get(key) is not _ABSENT
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key, _ABSENT)
+            if value is not _ABSENT:
+                return self._load(key, value)
+            if self._pending(key):
+                self._compute(key)
+                return self._load(key, getattr(self, key))
+        overlay = self._overlay
+        if overlay is not None and key in overlay:
+            value = overlay[key]
+            if value is _ABSENT:
+                raise KeyError(key)
+            return value
+        return self._raw[key]
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._FIELD_SET:
+            setattr(self, key, self._store(key, value))
+            return
+        if self._overlay is None:
+            self._overlay = {}
+        self._overlay[key] = value
+    
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key in self._FIELD_SET and getattr(self, key, _ABSENT) is not _ABSENT:
+            delattr(self, key)
+        if self._overlay is not None:
+            self._overlay.pop(key, None)
+        if key in self._raw or self._lazy_field(key):
+            if self._overlay is None:
+                self._overlay = {}
+            self._overlay[key] = _ABSENT
+    
+    def __contains__(self, key: object) -> bool:
+        if key in self._FIELD_SET and (getattr(self, key, _ABSENT) is not _ABSENT or self._pending(key)):
+            return True
+        overlay = self._overlay
+        if overlay is not None and key in overlay:
+            return overlay[key] is not _ABSENT
+        return key in self._raw
+    
+    def __iter__(self) -> Iterator[str]:
+        overlay = self._overlay or {}
+        for key in self._raw:
+            if key in self:
+                yield key
+        for key in self.FIELDS:
+            if key not in self._raw and (getattr(self, key, _ABSENT) is not _ABSENT or self._pending(key)):
+                yield key
+        for key, value in overlay.items():
+            if key not in self._raw and value is not _ABSENT:
+                yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the plain dict the dict-mode pull returns.
+        
+        Returns:
+            New dict; records nested directly or in lists (event_history) are converted too.
+        """
+        document = {}
+        for key in self:
+            value = self[key]
+            if isinstance(value, EnrichedRecord):
+                value = value.to_dict()
+            elif isinstance(value, list) and value and isinstance(value[0], EnrichedRecord):
+                value = [item.to_dict() if isinstance(item, EnrichedRecord) else item for item in value]
+            document[key] = value
+        return document
+
+
+class EnrichedUser(EnrichedRecord):
+    """
+    Compact enriched user: the raw user by reference, the USER_ENRICHED_FIELDS and step-3
+    fields in slots, event_history as event IDs resolved against a shared EventTable and
+    social_connections as positions in the shared CoAttendanceGraph. Both are rebuilt on
+    every read, so assign a new list to change them rather than modifying the one read.
+    Fields covered by a LazyUserFields are computed on first read and then kept.
+    """
+    
+    FIELDS = USER_ENRICHED_FIELDS + USER_STEP3_FIELDS
+    __slots__ = FIELDS + ('_events', '_graph', '_lazy')
+    
+    def __init__(self, raw: Dict[str, Any], fields: Optional[Dict[str, Any]] = None, events: Optional[EventTable] = None, lazy: Optional['LazyUserFields'] = None):
+        """
+        Initialize EnrichedUser.
+        
+        Args:
+            raw: Raw user document (kept by reference)
+            fields: Optional derived values to set
+            events: EventTable that event_history resolves against (a private one if None)
+            lazy: Optional LazyUserFields computing the pull's lazy fields on first read
+        """
+        self._events = events if events is not None else EventTable()
+        self._graph: Optional[CoAttendanceGraph] = None
+        self._lazy = lazy
+        super().__init__(raw, fields)
+    
+    def defer_fields(self, lazy: 'LazyUserFields') -> None:
+        """Compute lazy's fields on first read from now on (fields already set are kept)."""
+        self._lazy = lazy
+    
+    def _lazy_field(self, key: str) -> bool:
+        return self._lazy is not None and key in self._lazy.fields
+    
+    def _compute(self, key: str) -> None:
+        self._lazy.compute(self, key)
+    
+    def link_social_connections(self, graph: CoAttendanceGraph, user_id: str) -> None:
+        """
+        Set social_connections as the user's positions in a shared CoAttendanceGraph.
+        
+        The connection dicts (equal to graph.top_connections(user_id)) are built when the
+        field is read, instead of being stored per user.
+        
+        Args:
+            graph: Co-attendance graph of the pull
+            user_id: User ID string
+        """
+        self.social_connections = graph.ranked_positions(user_id)
+        self._graph = graph
+    
+    def _load(self, key: str, value: Any) -> Any:
+        if key == 'event_history':
+            return self._events.resolve(value)
+        if key == 'social_connections' and self._graph is not None:
+            return self._graph.connections_at(value)
+        return value
+    
+    def _store(self, key: str, value: Any) -> Any:
+        if key == 'event_history':
+            return tuple(self._events.add(materialize(event)) for event in value)
+        if key == 'social_connections':
+            self._graph = None
+        return value
+
+
+class EnrichedEvent(EnrichedRecord):
+    """Compact enriched event: the raw event by reference and EVENT_ENRICHED_FIELDS in slots."""
+    
+    FIELDS = EVENT_ENRICHED_FIELDS
+    __slots__ = FIELDS
+
+
+class LazyUserFields:
+    """
+    Computes lazy step-3 fields of a pull's EnrichedUser records on first read.
+    
+    One instance is shared by every user of a pull and holds the pull's events and event
+    index, so a field read later equals the one an eager users_pull sets.
+    """
+    
+    __slots__ = ('pull', 'events', 'event_index', 'fields')
+    
+    def __init__(self, pull: 'MongoDBPull', events: List[Dict[str, Any]], event_index: UserEventIndex, fields: Iterable[str] = USER_LAZY_FIELDS):
+        """
+        Initialize LazyUserFields.
+        
+        Args:
+            pull: MongoDBPull whose components compute the fields
+            events: List of all event documents of the pull
+            event_index: UserEventIndex built from the same events
+            fields: Lazy fields (a subset of USER_LAZY_FIELDS)
+        """
+        self.pull = pull
+        self.events = events
+        self.event_index = event_index
+        self.fields = frozenset(fields)
+    
+    def compute(self, user: 'EnrichedUser', field: str) -> None:
+        """Compute one lazy field of a user and set it on the record."""
+        self.pull._add_user_field(user, field, str(user.get('_id', '')), self.events, self.event_index)
+
+
+def to_plain(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert pull output to plain dicts.
+    
+    Args:
+        records: Enriched users or events (dicts or EnrichedRecords)
+        
+    Returns:
+        List of dicts (dicts are passed through unchanged).
+    """
+    return [record.to_dict() if isinstance(record, EnrichedRecord) else record for record in records]
+
+
+# ============================================================================
+# Field-Selective Enrichment
+# ============================================================================
+
+# Enrichment stages of users_pull(derived=[...]): the derived fields each stage sets and
+# the stages whose fields it reads. Only the stages the requested fields need
+# (transitively) are run; all fields of a stage are set together.
+USER_STAGES = {
+    'stats': {
+        'fields': ('event_count', 'order_count', 'total_order_amount', 'total_spent', 'last_active', 'days_inactive'),
+        'requires': (),
+    },
+    'segments': {
+        'fields': ('journey_stage', 'engagement_status', 'is_active', 'value_segment', 'social_role',
+                   'churn_risk', 'user_segment', 'cohort', 'days_since_registration'),
+        'requires': ('stats',),
+    },
+    'completeness': {
+        'fields': ('profile_completeness', 'personalization_ready'),
+        'requires': (),
+    },
+    'campaign_qualifications': {
+        'fields': ('campaign_qualifications',),
+        'requires': ('stats', 'segments', 'completeness'),
+    },
+    'summary': {
+        'fields': ('summary',),
+        'requires': ('stats', 'segments'),
+    },
+    'social_connections': {
+        'fields': ('social_connections',),
+        'requires': (),
+    },
+    'event_history': {
+        'fields': ('event_history',),
+        'requires': (),
+    },
+    'interest_analysis': {
+        'fields': ('interest_analysis',),
+        'requires': (),
+    },
+    'newcomer_score': {
+        'fields': ('newcomer_score',),
+        'requires': ('stats', 'segments', 'completeness'),
+    },
+    'reactivation_score': {
+        'fields': ('reactivation_score',),
+        'requires': ('stats', 'completeness'),
+    },
+}
+
+# Enrichment stages of events_pull(derived=[...]), as USER_STAGES
+EVENT_STAGES = {
+    'participants': {
+        'fields': EVENT_ENRICHED_FIELDS[:7],
+        'requires': (),
+    },
+    'campaign_qualifications': {
+        'fields': ('campaign_qualifications',),
+        'requires': ('participants',),
+    },
+    'summary': {
+        'fields': ('summary',),
+        'requires': ('participants',),
+    },
+}
+
+ENRICHMENT_STAGES = {'users': USER_STAGES, 'events': EVENT_STAGES}
+
+# Derived fields the users/events reports read (added to derived= with generate_report)
+REPORT_DERIVED_FIELDS = {
+    'users': ('event_count', 'order_count', 'total_spent', 'personalization_ready', 'is_active',
+              'value_segment', 'journey_stage', 'engagement_status', 'social_role', 'user_segment',
+              'churn_risk', 'profile_completeness', 'campaign_qualifications'),
+    'events': ('participantCount', 'participationPercentage', 'campaign_qualifications'),
+}
+
+# Output order of user derived fields (the order a full users_pull sets them in)
+_USER_OUTPUT_ORDER = USER_ENRICHED_FIELDS + USER_STEP3_FIELDS
+
+
+def plan_enrichment_stages(kind: str, derived: Iterable[str]) -> List[List[str]]:
+    """
+    Resolve derived fields to the enrichment stages that produce them.
+    
+    Args:
+        kind: 'users' or 'events'
+        derived: Derived field names (fields of ENRICHMENT_STAGES[kind]; users also
+            accept 'id', which is always set)
+        
+    Returns:
+        Stage names grouped into levels. Every stage's requirements are in earlier
+        levels, so the stages of a level are independent of each other; within a
+        level stages keep their declaration order.
+        
+    Raises:
+        ValueError: If a field is not set by any stage.
+    """
+    stages = ENRICHMENT_STAGES[kind]
+    producers = {field: name for name, spec in stages.items() for field in spec['fields']}
+    derived = [field for field in derived if not (kind == 'users' and field == 'id')]
+    unknown = sorted(set(derived) - set(producers))
+    if unknown:
+        raise ValueError(f"Unknown derived {kind} fields {unknown}; must be among {sorted(producers)}")
+    
+    needed: Set[str] = set()
+    pending = [producers[field] for field in derived]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(stages[name]['requires'])
+    
+    levels: List[List[str]] = []
+    done: Set[str] = set()
+    while len(done) < len(needed):
+        level = [name for name in stages if name in needed and name not in done and set(stages[name]['requires']) <= done]
+        levels.append(level)
+        done.update(level)
+    return levels
 
-#### fill-the-table
-- Future event (`startDate > now`)
-- Public event (`type == "public"`)
-- Underfilled (`participationPercentage < 50%`)
-- Has capacity (`maxParticipants > 0`)
 
-#### return-to-table
-- Future event (`startDate > now`)
-- Public event (`type == "public"`)
-- Has capacity (`maxParticipants > 0`)
-- Prefers higher participation (>60%)
-""")
+class SelectiveEnrichment:
+    """
+    Runs only the enrichment stages a set of derived fields needs.
+    
+    Stages run one at a time over all records, level by level (see
+    plan_enrichment_stages); the stages of a level run in a thread pool when
+    stage_workers > 1. A stage returns its fields per record and the fields of a level
+    are merged in declaration order after it finishes, so values and key order equal a
+    full pull minus the stages skipped.
+    The last run's stage timings are kept on self.report.
+    """
+    
+    def __init__(self, pull: 'MongoDBPull', logger: Optional[logging.Logger] = None):
+        """
+        Initialize SelectiveEnrichment.
         
-        # Insights
-        markdown.append("\n## Key Insights\n")
-        underfilled = sum(1 for e in events if e.get('participationPercentage', 0) < 50)
-        well_filled = sum(1 for e in events if 50 <= e.get('participationPercentage', 0) <= 80)
-        overfilled = sum(1 for e in events if e.get('participationPercentage', 0) > 100)
-        public_events = sum(1 for e in events if e.get('type') == 'public')
+        Args:
+            pull: MongoDBPull whose components compute the stages
+            logger: Optional logger instance
+        """
+        self.pull = pull
+        self.logger = logger or logging.getLogger('MongoDBPull.SelectiveEnrichment')
+        self.report: List[Dict[str, Any]] = []
+        self.user_stages = {
+            'stats': self._user_stats,
+            'segments': self._user_segments,
+            'completeness': self._user_completeness,
+            'campaign_qualifications': self._user_campaign_qualifications,
+            'summary': self._user_summary,
+            'social_connections': self._user_social_connections,
+            'event_history': self._user_event_history,
+            'interest_analysis': self._user_interest_analysis,
+            'newcomer_score': self._user_newcomer_score,
+            'reactivation_score': self._user_reactivation_score,
+        }
+        self.event_stages = {
+            'participants': self._event_participants,
+            'campaign_qualifications': self._event_campaign_qualifications,
+            'summary': self._event_summary,
+        }
+    
+    def users(self, users: List[Dict[str, Any]], events: List[Dict[str, Any]], event_index: UserEventIndex, order_map: Dict[str, List[Dict[str, Any]]], order_stats: Optional[Dict[str, Dict[str, Any]]], derived: Iterable[str], stage_workers: int = 1) -> List[Dict[str, Any]]:
+        """
+        Enrich users with the requested derived fields (and the fields they depend on).
         
-        markdown.append(f"- **Underfilled Events:** {underfilled:,} events ({underfilled/total_events*100:.1f}%) have <50% participation")
-        markdown.append(f"- **Well-Filled Events:** {well_filled:,} events ({well_filled/total_events*100:.1f}%) have 50-80% participation")
-        markdown.append(f"- **Overfilled Events:** {overfilled:,} events ({overfilled/total_events*100:.1f}%) have >100% participation")
-        markdown.append(f"- **Public Events:** {public_events:,} events ({public_events/total_events*100:.1f}%) are public")
-        markdown.append(f"- **Average Participation:** {avg_participation:.1f}% across all events")
+        Args:
+            users: User documents
+            events: List of all event documents
+            event_index: UserEventIndex built from events
+            order_map: user_id -> orders map (from index_data_by_user)
+            order_stats: Optional user_id -> pre-aggregated order stats (replaces orders)
+            derived: Derived user fields to compute (see USER_STAGES)
+            stage_workers: Threads for independent stages of the same level
+            
+        Returns:
+            List of new user dicts: the raw fields, 'id' and the computed derived fields
+            in full-pull order.
+        """
+        state = {'events': events, 'event_index': event_index, 'order_map': order_map, 'order_stats': order_stats}
+        contexts = []
+        for user in users:
+            uid = str(user.get('_id', ''))
+            contexts.append({'user': user, 'uid': uid, 'record': {**user, 'id': uid}})
+        self._run('users', self.user_stages, plan_enrichment_stages('users', derived), contexts, state, stage_workers)
         
-        # Write report
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(markdown))
+        enriched_users = []
+        for context in contexts:
+            record = context['record']
+            enriched_users.append({**context['user'], **{field: record[field] for field in _USER_OUTPUT_ORDER if field in record}})
+        return enriched_users
+    
+    def events(self, events: List[Dict[str, Any]], user_lookup: Dict[str, Dict[str, Any]], demographics: Optional[Dict[str, Dict[str, List[Tuple[str, int]]]]], derived: Iterable[str], stage_workers: int = 1) -> List[Dict[str, Any]]:
+        """
+        Enrich events (in place) with the requested derived fields and their dependencies.
         
-        self.logger.info(f"✓ Generated events report: {report_file}")
-        return report_file
+        Args:
+            events: Event documents
+            user_lookup: user_id -> user document
+            demographics: Optional event_id -> pre-aggregated participant top lists
+            derived: Derived event fields to compute (see EVENT_STAGES)
+            stage_workers: Threads for independent stages of the same level
+            
+        Returns:
+            The events, with the computed fields set.
+        """
+        state = {'user_lookup': user_lookup, 'demographics': demographics}
+        contexts = [{'record': event} for event in events]
+        self._run('events', self.event_stages, plan_enrichment_stages('events', derived), contexts, state, stage_workers)
+        return events
+    
+    def _run(self, kind: str, stages: Dict[str, Any], levels: List[List[str]], contexts: List[Dict[str, Any]], state: Dict[str, Any], stage_workers: int) -> None:
+        """Run the planned stages level by level, merging their fields into the records."""
+        def timed(name: str) -> Tuple[List[Dict[str, Any]], float]:
+            start = time.perf_counter()
+            values = stages[name](contexts, state)
+            return values, time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.report = []
+        for number, level in enumerate(levels):
+            if stage_workers > 1 and len(level) > 1:
+                with ThreadPoolExecutor(max_workers=min(stage_workers, len(level))) as pool:
+                    results = list(pool.map(timed, level))
+            else:
+                results = [timed(name) for name in level]
+            for name, (values, seconds) in zip(level, results):
+                for context, fields in zip(contexts, values):
+                    context['record'].update(fields)
+                self.report.append({'stage': name, 'status': 'ran', 'level': number, 'seconds': round(seconds, 4), 'records': len(contexts)})
+        planned = {name for level in levels for name in level}
+        self.report.extend({'stage': name, 'status': 'skipped', 'level': None, 'seconds': 0.0, 'records': 0} for name in stages if name not in planned)
+        
+        self.logger.info(f"✓ Ran {len(planned)} of {len(stages)} {kind} enrichment stages for {len(contexts)} {kind} ({time.perf_counter() - start:.2f}s)")
+        for entry in self.report:
+            if entry['status'] == 'ran':
+                self.logger.info(f"  ✓ {entry['stage']} (level {entry['level']}): {entry['seconds']:.3f}s")
+            else:
+                self.logger.info(f"  - {entry['stage']}: skipped")
+    
+    # User stages: each returns the stage's fields for every context, in order
+    
+    def _user_stats(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        order_stats = state['order_stats']
+        values = []
+        for context in contexts:
+            uid = context['uid']
+            user_order_stats = order_stats.get(uid, EMPTY_ORDER_STATS) if order_stats is not None else None
+            stats = self.pull.user_enrichment.calculate_stats(state['event_index'].events_for(uid), state['order_map'].get(uid, []), user_order_stats)
+            # Segments read the raw stats (last_active as a datetime)
+            context['stats'] = stats
+            values.append({
+                'event_count': stats['event_count'],
+                'order_count': stats['order_count'],
+                'total_order_amount': stats['total_spent'],
+                'total_spent': stats['total_spent'],
+                'last_active': stats['last_active'].isoformat() if stats['last_active'] else None,
+                'days_inactive': stats['days_inactive'],
+            })
+        return values
+    
+    def _user_segments(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        user_enrichment = self.pull.user_enrichment
+        values = []
+        for context in contexts:
+            segs = user_enrichment.derive_segments(context['user'], context['stats'])
+            engagement = user_enrichment.derive_engagement(context['stats'].get('last_active'))
+            values.append({
+                'journey_stage': segs['journey_stage'],
+                'engagement_status': segs['engagement_status'],
+                'is_active': engagement['is_active'],
+                'value_segment': segs['value_segment'],
+                'social_role': segs['social_role'],
+                'churn_risk': segs['churn_risk'],
+                'user_segment': segs['user_segment'],
+                'cohort': segs['cohort'],
+                'days_since_registration': segs['days_since_registration'],
+            })
+        return values
+    
+    def _user_completeness(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        values = []
+        for context in contexts:
+            comp_score, is_ready = self.pull.user_enrichment.calculate_completeness(context['user'])
+            values.append({'profile_completeness': comp_score, 'personalization_ready': is_ready})
+        return values
+    
+    def _user_campaign_qualifications(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        check = self.pull.campaign_qualification.check_user_campaign_qualifications
+        return [{'campaign_qualifications': check(context['record'], state['event_index'].events_for(context['uid']))} for context in contexts]
+    
+    def _user_summary(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        generate = self.pull.summary_generation.generate_user_summary
+        return [{'summary': generate(context['record'])} for context in contexts]
+    
+    def _user_social_connections(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # The co-attendance graph is built on first use, so its cost is part of this stage
+        graph = self.pull._co_attendance_graph_for(state['event_index'])
+        social_connection = self.pull.social_connection
+        return [{'social_connections': social_connection.get_user_social_connections(context['uid'], state['events'], event_index=state['event_index'], graph=graph)} for context in contexts]
+    
+    def _user_event_history(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        history = self.pull.social_connection.get_user_event_history
+        return [{'event_history': [materialize(event) for event in history(context['uid'], state['events'], event_index=state['event_index'])]} for context in contexts]
+    
+    def _user_interest_analysis(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        analyze = self.pull.social_connection.analyze_user_interests_from_events
+        return [{'interest_analysis': analyze(context['uid'], state['events'], event_index=state['event_index'])} for context in contexts]
+    
+    def _user_newcomer_score(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [{'newcomer_score': calculate_newcomer_score(context['record'])} for context in contexts]
+    
+    def _user_reactivation_score(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [{'reactivation_score': calculate_reactivation_score(context['record'])} for context in contexts]
+    
+    # Event stages
+    
+    def _event_participants(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        demographics = state['demographics']
+        fields = EVENT_STAGES['participants']['fields']
+        values = []
+        for context in contexts:
+            event = context['record']
+            event_demographics = demographics.get(str(event.get('_id', '')), {}) if demographics is not None else None
+            # Participant analysis sets its fields in place; run it on a copy
+            scratch = dict(event)
+            self.pull.event_transformation.enrich_event_with_participants(scratch, state['user_lookup'], event_demographics)
+            values.append({field: scratch[field] for field in fields})
+        return values
+    
+    def _event_campaign_qualifications(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        check = self.pull.campaign_qualification.check_event_campaign_qualifications
+        return [{'campaign_qualifications': check(context['record'])} for context in contexts]
+    
+    def _event_summary(self, contexts: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        generate = self.pull.summary_generation.generate_event_summary
+        return [{'summary': generate(context['record'])} for context in contexts]
 
 
 # ============================================================================
 # Main MongoDBPull Class
 # ============================================================================
 
+# Inputs of a sharded users_pull, set by the parent right before its worker processes
+# fork, so every worker reads users, events, orders and indexes copy-on-write instead
+# of receiving them pickled per task
+_SHARD_STATE: Optional[Dict[str, Any]] = None
+
+
+def _enrich_shard(bounds: Tuple[int, int]) -> Tuple[List[Dict[str, Any]], float, Dict[str, Dict[str, Any]]]:
+    """
+    Enrich users[start:end] of the forked _SHARD_STATE (runs in a worker process).
+    
+    Args:
+        bounds: (start, end) indexes of the shard in the parent's user list
+        
+    Returns:
+        Tuple of (enriched users of the shard, seconds taken, incremental cache entries of
+        the shard's users). Each event_history holds positions in the parent's events
+        list; the parent links the events back in.
+    """
+    start = time.perf_counter()
+    state = _SHARD_STATE
+    pull = state['pull']
+    events = state['events']
+    users = state['users'][bounds[0]:bounds[1]]
+    enriched_users = pull.user_enrichment.transform_users(users, events, state['orders'], pull.campaign_qualification, event_map=state['event_map'], order_map=state['order_map'], columnar=state['columnar'], log_distributions=False, order_stats=state['order_stats'])
+    pull._add_additional_enrichment(enriched_users, events, state['event_index'], state['fields'])
+    # History entries are the shared event dicts themselves (later enriched in place by
+    # users_events_pull), so they are sent as positions rather than as copies
+    positions = {id(materialize(event)): position for position, event in enumerate(events)}
+    for user in enriched_users:
+        if 'event_history' in user:
+            user['event_history'] = [positions[id(event)] for event in user['event_history']]
+    cache = pull.user_enrichment.cache or {}
+    cache_entries = {uid: cache[uid] for uid in (str(user.get('_id', '')) for user in users) if uid in cache}
+    return enriched_users, time.perf_counter() - start, cache_entries
+
+
 class MongoDBPull:
     """Main class orchestrating MongoDB data retrieval and enrichment."""
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, connection_string: Optional[str] = None, database: Optional[str] = None, delta: bool = False, snapshot_dir: Optional[str] = None, reconcile_hours: float = DEFAULT_RECONCILE_HOURS, partitions: int = 1, max_pool_size: int = DEFAULT_MAX_POOL_SIZE, max_idle_time_ms: int = DEFAULT_MAX_IDLE_TIME_MS, data_format: str = 'json', lazy_decode: bool = False, server_reports: bool = False, write_back: bool = False, source: Optional[DataSource] = None, incremental: bool = False, compact: bool = False):
         """
         Initialize MongoDBPull.
         
         Args:
             logger: Optional logger instance. If None, creates a default logger.
+            connection_string: Optional MongoDB URI (default: the production cluster)
+            database: Optional database name (default: MONGO_DATABASE)
+            delta: If True, unfiltered collection reads go through a DeltaSnapshot, so
+                repeat runs only fetch documents changed since the last run
+            snapshot_dir: Snapshot directory for delta pulls (default: 'snapshots' in module directory)
+            reconcile_hours: Hours between full reconciles of the snapshot (catches deletes)
+            partitions: Number of parallel _id-range partitions for unlimited reads
+            max_pool_size: Maximum sockets in the shared client's connection pool
+            max_idle_time_ms: Milliseconds a pooled socket may sit idle before it is closed
+            data_format: Format of files written with save_data=True: 'json' (timestamped,
+                pretty-printed), 'arrow' (memory-mappable snapshot store in data/snapshot/,
+                requires pyarrow) or 'both'
+            lazy_decode: If True, events and orders fetched from MongoDB (not through the
+                delta snapshot) are LazyDocuments that decode only the fields the
+                enrichment reads; pull outputs are still plain dicts
+            server_reports: If True, reports are built by writing each enriched record's
+                report row (segments, counts, campaign flags) to the report_users /
+                report_events collections and aggregating them with a single $facet
+                query; the collections stay available for dashboards
+            write_back: If True, the derived fields of every pulled user and event are
+                upserted into user_enriched / event_enriched (see EnrichmentMaterializer),
+                writing only documents whose derived values changed
+            source: Optional DataSource to read from instead of a new MongoDBConnection,
+                e.g. SnapshotSource(dir) or MemorySource({...}) for offline runs. The
+                connection settings above are then unused; server_reports and write_back
+                need a MongoDBConnection
+            incremental: If True, user enrichment keeps a per-user cache (ENRICHMENT_CACHE_FILE
+                in snapshot_dir) and later runs only recompute users whose events, orders or
+                profile fields changed, or whose time-based labels crossed a threshold
+            compact: If True, pulls return EnrichedUser / EnrichedEvent records instead of
+                dicts: dict-compatible, holding the raw documents by reference and derived
+                fields in __slots__, with user event histories stored as event IDs in one
+                shared EventTable (self.event_table). to_plain() converts them to dicts
         """
         self.logger = logger or setup_logging()
-        self.connection = MongoDBConnection(self.logger)
-        self.user_enrichment = UserEnrichment(self.logger)
+        self.data_format = data_format
+        self.server_reports = server_reports
+        self.compact = compact
+        self.event_table: Optional[EventTable] = None
+        if source is not None and not isinstance(source, MongoDBConnection) and (server_reports or write_back):
+            raise ValueError(f"server_reports and write_back need a MongoDBConnection, not {type(source).__name__}")
+        self.connection: DataSource = source if source is not None else MongoDBConnection(self.logger, connection_string=connection_string, database=database, partitions=partitions, max_pool_size=max_pool_size, max_idle_time_ms=max_idle_time_ms, lazy_decode=lazy_decode)
+        self.snapshot: Optional[DeltaSnapshot] = DeltaSnapshot(self.connection, snapshot_dir, reconcile_hours, self.logger) if delta else None
+        self.materializer: Optional[EnrichmentMaterializer] = EnrichmentMaterializer(self.connection, self.logger) if write_back else None
+        cache_path = os.path.join(snapshot_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'), ENRICHMENT_CACHE_FILE) if incremental else None
+        self.user_enrichment = UserEnrichment(self.logger, cache_path=cache_path)
         self.event_transformation = EventTransformation(self.logger)
         self.campaign_qualification = CampaignQualification(self.logger)
         self.summary_generation = SummaryGeneration(self.logger)
         self.social_connection = SocialConnection(self.logger)
         self.report_generation = ReportGeneration(self.logger)
+        self.co_attendance_graph: Optional[CoAttendanceGraph] = None
+        self.selective_enrichment = SelectiveEnrichment(self, self.logger)
+        self.stage_report: List[Dict[str, Any]] = []
+    
+    def _fetch(self, collection: str, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch documents from a collection, using the delta snapshot for unfiltered reads.
+        
+        Args:
+            collection: Collection name ('user', 'event', 'order')
+            filter: Optional MongoDB filter dictionary
+            limit: Optional limit on number of results
+            projection: Optional MongoDB projection
+            
+        Returns:
+            List of documents.
+        """
+        if self.snapshot is not None and not filter and not limit:
+            return self.snapshot.pull(collection, projection)
+        getter = {'user': self.connection.get_users, 'event': self.connection.get_events, 'order': self.connection.get_orders}[collection]
+        return getter(filter=filter, limit=limit, projection=projection)
+    
+    def _fetch_scoped(self, collection: str, users: List[Dict[str, Any]], projection: Optional[Dict[str, Any]] = None, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch only the events or orders that belong to the given users.
+        
+        Args:
+            collection: 'event' or 'order'
+            users: Selected user documents
+            projection: Optional MongoDB projection
+            filter: Optional MongoDB filter each scope query is combined with
+        
+        Returns:
+            List of documents, each once. Results of several chunks are merged in _id order.
+        """
+        start = time.perf_counter()
+        filters = build_scope_filters(collection, [user['_id'] for user in users if '_id' in user])
+        documents: Dict[Any, Dict[str, Any]] = {}
+        for scope_filter in filters:
+            for document in self._fetch(collection, filter=_with_prefilter(filter, scope_filter), projection=projection):
+                documents.setdefault(document['_id'], document)
+        documents = list(documents.values())
+        if len(filters) > 1:
+            # An event matched by users in several chunks is returned by each of their queries
+            try:
+                documents.sort(key=lambda document: document['_id'])
+            except TypeError:
+                pass
+        self.logger.info(f"  ✓ Scoped fetch: {len(documents)} {collection} documents for {len(users)} users in {len(filters)} queries ({time.perf_counter() - start:.2f}s)")
+        return documents
     
     def _save_data_to_file(self, data: List[Dict[str, Any]], data_type: str) -> str:
         """
-        Save data to a timestamped JSON file in the data folder.
+        Save data to a timestamped JSON file and/or the snapshot store in the data folder.
         
         Args:
             data: List of dictionaries to save
             data_type: Type of data ('users' or 'events')
             
         Returns:
-            Path to the saved file
+            Path to the saved file (the JSON file when data_format is 'both')
         """
+        data = to_plain(data)
+        
         # Get the directory of this file
         current_dir = os.path.dirname(os.path.abspath(__file__))
         data_dir = os.path.join(current_dir, 'data')
@@ -2420,6 +5462,13 @@ class MongoDBPull:
         # Create data directory if it doesn't exist
         os.makedirs(data_dir, exist_ok=True)
         
+        filepath = None
+        if self.data_format in ('arrow', 'both'):
+            from .snapshot_store import SnapshotStore
+            filepath = SnapshotStore(os.path.join(data_dir, 'snapshot'), self.logger).write(data_type, data)
+        if self.data_format == 'arrow':
+            return filepath
+        
         # Generate timestamp
         timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
         filename = f"{data_type}_{timestamp}.json"
@@ -2446,7 +5495,191 @@ class MongoDBPull:
         self.logger.info(f"✓ Data saved to: {filepath} ({len(data)} {data_type})")
         return filepath
     
-    def users_pull(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, generate_report: bool = True, save_data: bool = True, users: Optional[List[Dict[str, Any]]] = None, events: Optional[List[Dict[str, Any]]] = None, orders: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    def _generate_report(self, kind: str, records: List[Dict[str, Any]]) -> str:
+        """
+        Generate the users or events report, server-side when server_reports is set.
+        
+        Args:
+            kind: 'users' or 'events'
+            records: Enriched users or events
+            
+        Returns:
+            Path to the generated report file.
+        """
+        generate = {'users': self.report_generation.generate_users_report, 'events': self.report_generation.generate_events_report}[kind]
+        if not self.server_reports:
+            return generate(records)
+        row = {'users': user_report_row, 'events': event_report_row}[kind]
+        self.connection.write_report_rows(kind, (row(record) for record in records))
+        self.connection.publish_report_rows(kind)
+        return generate(stats=self.connection.aggregate_report(kind))
+    
+    def _co_attendance_graph_for(self, event_index: UserEventIndex) -> CoAttendanceGraph:
+        """Co-attendance graph of an event index, built on first use and kept for campaign prompts."""
+        if self.co_attendance_graph is None or self.co_attendance_graph.event_index is not event_index:
+            self.co_attendance_graph = self.social_connection.build_co_attendance_graph(event_index)
+        return self.co_attendance_graph
+    
+    def _add_user_field(self, user: Dict[str, Any], field: str, uid: str, events: List[Dict[str, Any]], event_index: UserEventIndex) -> None:
+        """
+        Set one of the USER_LAZY_FIELDS on a transformed user (eagerly in step 3, or on
+        first read through LazyUserFields).
+        
+        Args:
+            user: Transformed user (dict or EnrichedUser)
+            field: Field name (one of USER_LAZY_FIELDS)
+            uid: User ID string
+            events: List of all event documents
+            event_index: Shared UserEventIndex built from the same events
+        """
+        if field == 'summary':
+            user['summary'] = self.summary_generation.generate_user_summary(user)
+        elif field == 'social_connections':
+            # Compact records keep positions in the shared graph
+            graph = self._co_attendance_graph_for(event_index)
+            if isinstance(user, EnrichedUser):
+                user.link_social_connections(graph, uid)
+            else:
+                user['social_connections'] = self.social_connection.get_user_social_connections(uid, events, event_index=event_index, graph=graph)
+        elif field == 'event_history':
+            # Events read lazily are decoded once here, as shared dicts
+            user['event_history'] = [materialize(event) for event in self.social_connection.get_user_event_history(uid, events, event_index=event_index)]
+        elif field == 'interest_analysis':
+            user['interest_analysis'] = self.social_connection.analyze_user_interests_from_events(uid, events, event_index=event_index)
+    
+    def _derived_fields(self, kind: str, derived: Iterable[str], campaign: Optional[str], generate_report: bool) -> List[str]:
+        """
+        Derived fields a field-selective pull computes.
+        
+        Args:
+            kind: 'users' or 'events'
+            derived: Requested derived fields
+            campaign: Optional campaign the pull filters on
+            generate_report: Whether the pull renders the report
+            
+        Returns:
+            The requested fields plus the ones campaign filtering, the report and
+            write-back read, each once.
+            
+        Raises:
+            ValueError: If a field is not set by any enrichment stage (see plan_enrichment_stages).
+        """
+        fields = list(derived)
+        if campaign:
+            fields.append('campaign_qualifications')
+        if generate_report:
+            fields.extend(REPORT_DERIVED_FIELDS[kind])
+        if self.materializer is not None:
+            fields.extend(MATERIALIZED_FIELDS[kind])
+        fields = list(dict.fromkeys(fields))
+        plan_enrichment_stages(kind, fields)
+        return fields
+    
+    def _split_lazy_fields(self, lazy: bool, prefetch: Optional[Iterable[str]]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Split USER_LAZY_FIELDS into the fields step 3 computes and the ones left lazy.
+        
+        Args:
+            lazy: Whether the pull defers fields to first read
+            prefetch: Fields to compute up front anyway (implies lazy)
+            
+        Returns:
+            Tuple of (eager fields, lazy fields), each in USER_LAZY_FIELDS order.
+        """
+        if prefetch is None and not lazy:
+            return USER_LAZY_FIELDS, ()
+        prefetch = set(prefetch or ())
+        unknown = prefetch - set(USER_LAZY_FIELDS)
+        if unknown:
+            raise ValueError(f"prefetch fields must be among {USER_LAZY_FIELDS}, got {sorted(unknown)}")
+        return (tuple(field for field in USER_LAZY_FIELDS if field in prefetch),
+                tuple(field for field in USER_LAZY_FIELDS if field not in prefetch))
+    
+    def _add_additional_enrichment(self, enriched_users: List[Dict[str, Any]], events: List[Dict[str, Any]], event_index: UserEventIndex, fields: Iterable[str] = USER_LAZY_FIELDS) -> None:
+        """
+        Step 3 of users_pull: add summaries, social connections, event history,
+        interest analysis and scores to already-transformed users (in place).
+        
+        Args:
+            enriched_users: Users returned by UserEnrichment.transform_users
+            events: List of all event documents
+            event_index: Shared UserEventIndex built from the same events
+            fields: USER_LAZY_FIELDS to compute now (the rest are left to LazyUserFields);
+                campaign qualifications and scores are always set
+        """
+        fields = [field for field in USER_LAZY_FIELDS if field in set(fields)]
+        # Vectorized scores are available when the columnar engine ran
+        newcomer_scores, reactivation_scores = None, None
+        if self.user_enrichment.columnar_engine is not None:
+            newcomer_scores, reactivation_scores = self.user_enrichment.columnar_engine.scores()
+        
+        total = len(enriched_users)
+        for idx, user in enumerate(enriched_users, 1):
+            uid = str(user.get('_id', ''))
+            
+            # Add campaign qualifications (ensure it's there)
+            user_events = event_index.events_for(uid)
+            self.campaign_qualification.add_campaign_qualifications_to_user(user, user_events)
+            
+            # Add summary, social connections, event history and interest analysis
+            for field in fields:
+                self._add_user_field(user, field, uid, events, event_index)
+            
+            # Add scores
+            if newcomer_scores is not None:
+                user['newcomer_score'] = newcomer_scores[idx - 1]
+                user['reactivation_score'] = reactivation_scores[idx - 1]
+            else:
+                user['newcomer_score'] = calculate_newcomer_score(user)
+                user['reactivation_score'] = calculate_reactivation_score(user)
+            
+            if idx % 100 == 0 or idx == total:
+                self.logger.info(f"  Enriched {idx}/{total} users ({(idx/total)*100:.1f}%)")
+    
+    def _enrich_users_sharded(self, users: List[Dict[str, Any]], events: List[Dict[str, Any]], orders: List[Dict[str, Any]], event_map: Dict[str, List[Dict[str, Any]]], order_map: Dict[str, List[Dict[str, Any]]], event_index: UserEventIndex, columnar: bool, order_stats: Optional[Dict[str, Dict[str, Any]]], workers: int, fields: Iterable[str] = USER_LAZY_FIELDS) -> List[Dict[str, Any]]:
+        """
+        Steps 2 and 3 of users_pull across forked worker processes.
+        
+        Users are split into one contiguous shard per worker. Workers inherit the
+        inputs and indexes through fork (copy-on-write); only shard bounds are sent
+        to them and only enriched users come back, with event histories as positions
+        that are linked back to the shared event dicts here. Shards are merged in
+        order, so the result equals the serial path.
+        
+        Returns:
+            List of fully enriched users, in input order.
+        """
+        global _SHARD_STATE
+        if self.user_enrichment.cache_path:
+            self.user_enrichment.load_cache()
+        shard_size = -(-len(users) // workers)
+        bounds = [(start, min(start + shard_size, len(users))) for start in range(0, len(users), shard_size)]
+        _SHARD_STATE = {
+            'pull': self, 'users': users, 'events': events, 'orders': orders,
+            'event_map': event_map, 'order_map': order_map, 'event_index': event_index,
+            'columnar': columnar, 'order_stats': order_stats, 'fields': fields,
+        }
+        start = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(max_workers=len(bounds), mp_context=multiprocessing.get_context('fork')) as pool:
+                shards = list(pool.map(_enrich_shard, bounds))
+        finally:
+            _SHARD_STATE = None
+        
+        enriched_users = []
+        for number, ((shard_start, shard_end), (shard_users, seconds, cache_entries)) in enumerate(zip(bounds, shards), 1):
+            self.logger.info(f"  ✓ Shard {number}/{len(bounds)}: users {shard_start}-{shard_end - 1} enriched in {seconds:.2f}s")
+            if self.user_enrichment.cache is not None:
+                self.user_enrichment.cache.update(cache_entries)
+            for user in shard_users:
+                if 'event_history' in user:
+                    user['event_history'] = [materialize(events[position]) for position in user['event_history']]
+            enriched_users.extend(shard_users)
+        self.logger.info(f"✓ Enriched {len(enriched_users)} users in {len(bounds)} worker processes ({time.perf_counter() - start:.2f}s)")
+        self.user_enrichment._log_segment_distributions(enriched_users)
+        return enriched_users
+    
+    def users_pull(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, generate_report: bool = True, save_data: bool = True, users: Optional[List[Dict[str, Any]]] = None, events: Optional[List[Dict[str, Any]]] = None, orders: Optional[List[Dict[str, Any]]] = None, columnar: bool = False, fields: Optional[Iterable[str]] = None, server_side: bool = False, event_index: Optional[UserEventIndex] = None, campaign: Optional[str] = None, scoped: bool = False, workers: int = 1, lazy: bool = False, prefetch: Optional[Iterable[str]] = None, derived: Optional[Iterable[str]] = None, stage_workers: int = 1) -> List[Dict[str, Any]]:
         """
         Get fully transformed and enriched users.
         
@@ -2465,14 +5698,51 @@ class MongoDBPull:
             users: Optional pre-fetched users list. If provided, filter and limit are ignored.
             events: Optional pre-fetched events list. If not provided, fetches all events.
             orders: Optional pre-fetched orders list. If not provided, fetches all orders.
+            columnar: If True, derive stats, segments, completeness and scores with the
+                vectorized columnar engine (requires numpy). Output is identical.
+            fields: Extra raw user fields to fetch on top of the fields the enrichment
+                stages and campaigns read (FIELD_REQUIREMENTS), or '*' for whole documents.
+                Only applies to documents fetched here.
+            server_side: If True and orders are not provided, compute order count, total
+                spent and last order date with a $group aggregation in MongoDB instead of
+                fetching every order. Output is equal to the client-side path.
+            event_index: Optional UserEventIndex already built from events (reused, together
+                with a co-attendance graph built from it, instead of re-indexing)
+            campaign: Optional campaign name (one of CAMPAIGNS). Only users whose raw fields
+                can qualify are fetched (see QUALIFICATION_PREFILTERS), and only users
+                that qualify after enrichment are returned.
+            scoped: If True, fetch only the events the selected users participate in or
+                own and only their orders ($in queries over the users' IDs, chunked by
+                SCOPED_FETCH_CHUNK_SIZE) instead of both whole collections. The selected
+                users are enriched exactly as with full collections; use it for small
+                selections (filter/limit), since each chunk is a separate query.
+            workers: Number of worker processes for steps 2 and 3. Above 1, users are
+                sharded across forked processes that share the event/order indexes
+                copy-on-write; output equals the serial path. Needs the 'fork' start
+                method (Linux, macOS); elsewhere users are enriched serially.
+            lazy: If True, return EnrichedUser records whose USER_LAZY_FIELDS (summary,
+                social_connections, event_history, interest_analysis) are computed on first
+                read and then kept, so runs that only read qualification flags or segments
+                skip them (and the co-attendance graph) entirely
+            prefetch: USER_LAZY_FIELDS to compute for every user up front, for callers that
+                will read them for everyone (implies lazy=True)
+            derived: Optional derived fields to compute (see USER_STAGES). Only the stages
+                they need, transitively, are run (e.g. ['reactivation_score'] runs stats,
+                completeness and the score, not summaries or social connections); fields
+                the campaign filter, report and write-back read are added. Users keep
+                their raw fields and 'id'. Timings of the stages run and skipped are kept
+                on self.stage_report. Not combined with columnar, workers or lazy.
+            stage_workers: Threads for independent stages of the same dependency level
+                (with derived)
             
         Returns:
             List of fully enriched user dictionaries with the following fields:
             
             RAW FIELDS (from MongoDB):
-            - All original user collection fields (id, email, firstName, lastName, role,
-              interests, occupation, homeNeighborhood, gender, phone, birthDay,
-              tableTypePreference, createdAt, etc.)
+            - The user collection fields read by the enrichment stages and campaigns
+              (email, firstName, lastName, role, interests, occupation, homeNeighborhood,
+              gender, phone, birthDay, tableTypePreference, createdAt, etc.), plus any
+              requested via fields= (all fields with fields='*')
             
             DERIVED FIELDS:
             - event_count: Count of events (participant OR owner)
@@ -2500,6 +5770,16 @@ class MongoDBPull:
             
             See module docstring for detailed field definitions and derivation logic.
         """
+        eager_fields, lazy_fields = self._split_lazy_fields(lazy, prefetch)
+        if derived is not None:
+            if lazy_fields:
+                raise ValueError("derived= computes the requested fields up front; it cannot be combined with lazy or prefetch")
+            derived = self._derived_fields('users', derived, campaign, generate_report)
+            if columnar or workers > 1:
+                self.logger.warning("Field-selective enrichment runs row-wise in this process; ignoring columnar and workers")
+                columnar, workers = False, 1
+            eager_fields = tuple(field for field in eager_fields if field in derived)
+        
         self.logger.info("=" * 80)
         self.logger.info("STARTING USER PULL OPERATION")
         self.logger.info("=" * 80)
@@ -2508,7 +5788,9 @@ class MongoDBPull:
         # Fetch data (use provided data if available, otherwise fetch from MongoDB)
         self.logger.info("\nStep 1: Fetching raw data from MongoDB...")
         if users is None:
-            users = self.connection.get_users(filter=filter, limit=limit)
+            if campaign:
+                filter = _with_prefilter(filter, build_qualification_filter('user', campaign))
+            users = self._fetch('user', filter=filter, limit=limit, projection=build_projection(['users_pull'], 'user', fields))
         else:
             self.logger.info(f"  Using provided users list ({len(users)} users)")
             # Apply filter and limit if provided and users were pre-fetched
@@ -2518,13 +5800,21 @@ class MongoDBPull:
             if limit is not None and len(users) > limit:
                 users = users[:limit]
         
-        if events is None:
-            events = self.connection.get_events()
+        if events is None and scoped:
+            events = self._fetch_scoped('event', users, projection=build_projection(['users_pull'], 'event'))
+        elif events is None:
+            events = self._fetch('event', projection=build_projection(['users_pull'], 'event'))
         else:
             self.logger.info(f"  Using provided events list ({len(events)} events)")
         
-        if orders is None:
-            orders = self.connection.get_orders()
+        order_stats = None
+        if orders is None and server_side:
+            order_stats = self.connection.aggregate_order_stats()
+            orders = []
+        elif orders is None and scoped:
+            orders = self._fetch_scoped('order', users, projection=build_projection(['users_pull'], 'order'))
+        elif orders is None:
+            orders = self._fetch('order', projection=build_projection(['users_pull'], 'order'))
         else:
             self.logger.info(f"  Using provided orders list ({len(orders)} orders)")
         
@@ -2535,46 +5825,69 @@ class MongoDBPull:
         self.logger.info("  - Generating narratives")
         self.logger.info("  - Adding campaign qualifications")
         
-        # Transform users
-        enriched_users = self.user_enrichment.transform_users(users, events, orders, self.campaign_qualification)
+        # Index events and orders once; the event index is shared by every step-3 consumer
+        if event_index is None:
+            event_map, order_map = self.user_enrichment.index_data_by_user(events, orders)
+            event_index = UserEventIndex(event_map)
+        else:
+            self.logger.info("  Using provided event index")
+            event_map = event_index.event_map
+            _, order_map = self.user_enrichment.index_data_by_user([], orders)
+        
+        # Co-attendance graph is computed once per snapshot and kept for campaign prompts
+        # (with lazy social connections, on first read; field-selective pulls build it in
+        # the social_connections stage)
+        if derived is None and 'social_connections' in eager_fields:
+            self._co_attendance_graph_for(event_index)
+        
+        if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            self.logger.warning("Process sharding needs the 'fork' start method; enriching users serially")
+            workers = 1
+        
+        # Compact and lazy records share one event table for their histories
+        self.event_table = EventTable() if self.compact or lazy_fields else None
+        
+        if derived is not None:
+            self.logger.info(f"\nSteps 2-3: Computing {len(derived)} derived fields for {len(users)} users...")
+            enriched_users = self.selective_enrichment.users(users, events, event_index, order_map, order_stats, derived, stage_workers)
+            self.stage_report = self.selective_enrichment.report
+            if self.event_table is not None:
+                enriched_users = [EnrichedUser.from_enriched(user, enriched_user, events=self.event_table) for user, enriched_user in zip(users, enriched_users)]
+                if 'social_connections' in eager_fields:
+                    for user in enriched_users:
+                        user.link_social_connections(self.co_attendance_graph, user['id'])
+        elif workers > 1 and len(users) > 1:
+            self.logger.info(f"\nSteps 2-3: Enriching users in {workers} worker processes...")
+            enriched_users = self._enrich_users_sharded(users, events, orders, event_map, order_map, event_index, columnar, order_stats, min(workers, len(users)), eager_fields)
+            if self.event_table is not None:
+                enriched_users = [EnrichedUser.from_enriched(user, enriched_user, events=self.event_table) for user, enriched_user in zip(users, enriched_users)]
+                if 'social_connections' in eager_fields:
+                    for user in enriched_users:
+                        user.link_social_connections(self.co_attendance_graph, user['id'])
+        else:
+            # Transform users
+            enriched_users = self.user_enrichment.transform_users(users, events, orders, self.campaign_qualification, event_map=event_map, order_map=order_map, columnar=columnar, order_stats=order_stats, event_table=self.event_table)
+            
+            self.logger.info(f"\nStep 3: Adding additional enrichment to {len(enriched_users)} users...")
+            self.logger.info("  - Generating summaries")
+            self.logger.info("  - Finding social connections")
+            self.logger.info("  - Retrieving event history")
+            self.logger.info("  - Analyzing interests from events")
+            self.logger.info("  - Calculating scores (newcomer, reactivation)")
+            
+            # Add additional enrichment
+            self._add_additional_enrichment(enriched_users, events, event_index, eager_fields)
         
-        # Create user lookup for social connections
-        user_lookup = {str(u.get('_id', '')): u for u in enriched_users}
+        if lazy_fields:
+            self.logger.info(f"  Deferring {', '.join(lazy_fields)} until first read")
+            deferred = LazyUserFields(self, events, event_index, lazy_fields)
+            for user in enriched_users:
+                user.defer_fields(deferred)
         
-        self.logger.info(f"\nStep 3: Adding additional enrichment to {len(enriched_users)} users...")
-        self.logger.info("  - Generating summaries")
-        self.logger.info("  - Finding social connections")
-        self.logger.info("  - Retrieving event history")
-        self.logger.info("  - Analyzing interests from events")
-        self.logger.info("  - Calculating scores (newcomer, reactivation)")
+        self.user_enrichment.save_cache()
         
-        # Add additional enrichment
-        total = len(enriched_users)
-        for idx, user in enumerate(enriched_users, 1):
-            uid = str(user.get('_id', ''))
-            
-            # Add campaign qualifications (ensure it's there)
-            user_events = [e for e in events if uid in [str(p) for p in e.get('participants', [])] or uid == str(e.get('ownerId', ''))]
-            self.campaign_qualification.add_campaign_qualifications_to_user(user, user_events)
-            
-            # Add summary
-            user['summary'] = self.summary_generation.generate_user_summary(user)
-            
-            # Add social connections
-            user['social_connections'] = self.social_connection.get_user_social_connections(uid, events)
-            
-            # Add event history
-            user['event_history'] = self.social_connection.get_user_event_history(uid, events)
-            
-            # Add interest analysis
-            user['interest_analysis'] = self.social_connection.analyze_user_interests_from_events(uid, events)
-            
-            # Add scores
-            user['newcomer_score'] = calculate_newcomer_score(user)
-            user['reactivation_score'] = calculate_reactivation_score(user)
-            
-            if idx % 100 == 0 or idx == total:
-                self.logger.info(f"  Enriched {idx}/{total} users ({(idx/total)*100:.1f}%)")
+        if campaign:
+            enriched_users = self.campaign_qualification.filter_qualified(enriched_users, campaign, 'users')
         
         self.logger.info("\n" + "=" * 80)
         self.logger.info(f"✓ USER PULL COMPLETED: {len(enriched_users)} users fully enriched")
@@ -2583,9 +5896,13 @@ class MongoDBPull:
         # Generate report if requested
         if generate_report:
             self.logger.info("\nGenerating users markdown report...")
-            report_path = self.report_generation.generate_users_report(enriched_users)
+            report_path = self._generate_report('users', enriched_users)
             self.logger.info(f"✓ Report saved to: {report_path}")
         
+        if self.materializer is not None:
+            self.logger.info("\nWriting enriched users back to MongoDB...")
+            self.materializer.write('users', enriched_users)
+        
         # Save data if requested
         if save_data:
             self.logger.info("\nSaving users data to JSON file...")
@@ -2593,7 +5910,118 @@ class MongoDBPull:
         
         return enriched_users
     
-    def events_pull(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, generate_report: bool = True, save_data: bool = True, users: Optional[List[Dict[str, Any]]] = None, events: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    def users_pull_iter(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, events: Optional[List[Dict[str, Any]]] = None, orders: Optional[List[Dict[str, Any]]] = None, columnar: bool = False, fields: Optional[Iterable[str]] = None, server_side: bool = False, campaign: Optional[str] = None, generate_report: bool = False, lazy: bool = False, prefetch: Optional[Iterable[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream fully enriched users in bounded batches.
+        
+        Events and orders are loaded (or taken from the arguments) once and indexed,
+        exactly as in users_pull. Users are then read from a streaming cursor and
+        enriched batch_size at a time, so peak memory is bounded by one batch of
+        users plus the shared event/order indexes rather than the whole collection.
+        Each yielded user is identical to the corresponding users_pull output.
+        
+        No data file is written; callers that need the full list should use
+        users_pull. With generate_report, each batch's report rows are kept (or, with
+        server_reports, appended to report_users) and the users report is written
+        once the last batch has been consumed. With write_back, each batch is
+        materialized as soon as it is enriched. Consumers that only need the top-K
+        users can keep a bounded heap instead of the full list, e.g.
+        heapq.nlargest(k, chain.from_iterable(pull.users_pull_iter()), key=...).
+        
+        Args:
+            filter: Optional MongoDB filter for users
+            limit: Optional limit on number of users
+            batch_size: Number of users fetched per cursor round trip and enriched per yielded batch
+            events: Optional pre-fetched events list. If not provided, fetches all events.
+            orders: Optional pre-fetched orders list. If not provided, fetches all orders.
+            columnar: If True, enrich each batch with the vectorized columnar engine (requires numpy).
+            fields: Extra raw user fields to fetch, or '*' for whole documents (as in users_pull)
+            server_side: If True and orders are not provided, aggregate order stats in MongoDB (as in users_pull)
+            campaign: Optional campaign name; pre-filters and post-filters users (as in users_pull)
+            generate_report: If True, write the users report after the last batch
+            lazy: If True, yield EnrichedUser records with lazy fields (as in users_pull)
+            prefetch: Lazy fields to compute up front (as in users_pull)
+            
+        Yields:
+            Lists of at most batch_size fully enriched user dictionaries (same fields as users_pull).
+        """
+        self.logger.info("=" * 80)
+        self.logger.info("STARTING STREAMING USER PULL OPERATION")
+        self.logger.info("=" * 80)
+        eager_fields, lazy_fields = self._split_lazy_fields(lazy, prefetch)
+        
+        if events is None:
+            events = self._fetch('event', projection=build_projection(['users_pull'], 'event'))
+        else:
+            self.logger.info(f"  Using provided events list ({len(events)} events)")
+        
+        order_stats = None
+        if orders is None and server_side:
+            order_stats = self.connection.aggregate_order_stats()
+            orders = []
+        elif orders is None:
+            orders = self._fetch('order', projection=build_projection(['users_pull'], 'order'))
+        else:
+            self.logger.info(f"  Using provided orders list ({len(orders)} orders)")
+        
+        # Index events and orders once; every batch shares the index and graph
+        event_map, order_map = self.user_enrichment.index_data_by_user(events, orders)
+        event_index = UserEventIndex(event_map)
+        self.co_attendance_graph = None
+        if 'social_connections' in eager_fields:
+            self._co_attendance_graph_for(event_index)
+        self.event_table = EventTable() if self.compact or lazy_fields else None
+        deferred = LazyUserFields(self, events, event_index, lazy_fields) if lazy_fields else None
+        
+        projection = build_projection(['users_pull'], 'user', fields)
+        if campaign:
+            filter = _with_prefilter(filter, build_qualification_filter('user', campaign))
+        cursor = self.connection.iter_users(filter=filter, limit=limit, batch_size=batch_size, projection=projection)
+        total = 0
+        batch_number = 0
+        report_rows = []
+        while True:
+            users = list(islice(cursor, batch_size))
+            if not users:
+                break
+            batch_number += 1
+            
+            enriched_users = self.user_enrichment.transform_users(users, events, orders, self.campaign_qualification, event_map=event_map, order_map=order_map, columnar=columnar, log_distributions=False, order_stats=order_stats, event_table=self.event_table)
+            self._add_additional_enrichment(enriched_users, events, event_index, eager_fields)
+            if deferred is not None:
+                for user in enriched_users:
+                    user.defer_fields(deferred)
+            if campaign:
+                enriched_users = self.campaign_qualification.filter_qualified(enriched_users, campaign, 'users')
+            
+            if self.materializer is not None:
+                self.materializer.write('users', enriched_users)
+            if generate_report:
+                rows = [user_report_row(user) for user in enriched_users]
+                if self.server_reports:
+                    self.connection.write_report_rows('users', rows, append=batch_number > 1)
+                else:
+                    report_rows.extend(rows)
+            
+            total += len(enriched_users)
+            self.logger.info(f"✓ Batch {batch_number}: {len(enriched_users)} users enriched ({total} total)")
+            yield enriched_users
+        
+        self.user_enrichment.save_cache()
+        
+        if generate_report and total:
+            self.logger.info("\nGenerating users markdown report...")
+            if self.server_reports:
+                self.connection.publish_report_rows('users')
+                stats = self.connection.aggregate_report('users')
+            else:
+                stats = report_stats('users', report_rows)
+            report_path = self.report_generation.generate_users_report(stats=stats)
+            self.logger.info(f"✓ Report saved to: {report_path}")
+        
+        self.logger.info(f"✓ STREAMING USER PULL COMPLETED: {total} users in {batch_number} batches")
+    
+    def events_pull(self, filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, generate_report: bool = True, save_data: bool = True, users: Optional[List[Dict[str, Any]]] = None, events: Optional[List[Dict[str, Any]]] = None, fields: Optional[Iterable[str]] = None, server_side: bool = False, campaign: Optional[str] = None, derived: Optional[Iterable[str]] = None, stage_workers: int = 1) -> List[Dict[str, Any]]:
         """
         Get fully transformed and enriched events.
         
@@ -2611,14 +6039,29 @@ class MongoDBPull:
             save_data: If True, saves the enriched event data to a timestamped JSON file in data/ folder
             users: Optional pre-fetched users list. If not provided, fetches all users.
             events: Optional pre-fetched events list. If provided, filter and limit are ignored.
+            fields: Extra raw event fields to fetch on top of the fields the enrichment
+                stages and campaigns read (FIELD_REQUIREMENTS), or '*' for whole documents.
+                Only applies to documents fetched here.
+            server_side: If True and users are not provided, compute participant top
+                interests/occupations/neighborhoods in MongoDB ($unwind participants +
+                $lookup into user) instead of fetching every user. Output is equal to the
+                client-side path.
+            campaign: Optional campaign name (one of CAMPAIGNS). Only future public events
+                with a capacity are fetched (see QUALIFICATION_PREFILTERS), and only events
+                that qualify after enrichment are returned.
+            derived: Optional derived fields to compute (see EVENT_STAGES); only the
+                stages they need are run, as with users_pull(derived=...)
+            stage_workers: Threads for independent stages of the same dependency level
+                (with derived)
             
         Returns:
             List of fully enriched event dictionaries with the following fields:
             
             RAW FIELDS (from MongoDB):
-            - All original event collection fields (id, name, startDate, endDate, type,
-              eventStatus, maxParticipants, minParticipants, participants, ownerId,
-              venueName, neighborhood, categories, features, description, createdAt, etc.)
+            - The event collection fields read by the enrichment stages, reports and
+              campaigns (name, startDate, type, eventStatus, maxParticipants, participants,
+              venue, venueName, neighborhood, categories, features, description, etc.),
+              plus any requested via fields= (all fields with fields='*')
             
             DERIVED FIELDS:
             - participantCount: Number of participants
@@ -2634,6 +6077,9 @@ class MongoDBPull:
             
             See module docstring for detailed field definitions and derivation logic.
         """
+        if derived is not None:
+            derived = self._derived_fields('events', derived, campaign, generate_report)
+        
         self.logger.info("=" * 80)
         self.logger.info("STARTING EVENT PULL OPERATION")
         self.logger.info("=" * 80)
@@ -2642,7 +6088,9 @@ class MongoDBPull:
         # Fetch data (use provided data if available, otherwise fetch from MongoDB)
         self.logger.info("\nStep 1: Fetching raw data from MongoDB...")
         if events is None:
-            events = self.connection.get_events(filter=filter, limit=limit)
+            if campaign:
+                filter = _with_prefilter(filter, build_qualification_filter('event', campaign))
+            events = self._fetch('event', filter=filter, limit=limit, projection=build_projection(['events_pull'], 'event', fields))
         else:
             self.logger.info(f"  Using provided events list ({len(events)} events)")
             # Apply filter and limit if provided and events were pre-fetched
@@ -2652,15 +6100,21 @@ class MongoDBPull:
             if limit is not None and len(events) > limit:
                 events = events[:limit]
         
-        if users is None:
-            users = self.connection.get_users()
+        demographics = None
+        if users is None and server_side:
+            self.logger.info(f"\nStep 2: Aggregating participant demographics in MongoDB...")
+            demographics = self.connection.aggregate_event_demographics([e['_id'] for e in events if '_id' in e])
+            user_lookup = {}
         else:
-            self.logger.info(f"  Using provided users list ({len(users)} users)")
-        
-        self.logger.info(f"\nStep 2: Creating user lookup for participant analysis...")
-        # Create user lookup
-        user_lookup = {str(u.get('_id', '')): u for u in users}
-        self.logger.info(f"  Created lookup with {len(user_lookup)} users")
+            if users is None:
+                users = self._fetch('user', projection=build_projection(['events_pull'], 'user'))
+            else:
+                self.logger.info(f"  Using provided users list ({len(users)} users)")
+            
+            self.logger.info(f"\nStep 2: Creating user lookup for participant analysis...")
+            # Create user lookup
+            user_lookup = {str(u.get('_id', '')): u for u in users}
+            self.logger.info(f"  Created lookup with {len(user_lookup)} users")
         
         self.logger.info(f"\nStep 3: Transforming and enriching {len(events)} events...")
         self.logger.info("  - Analyzing participant demographics (interests, occupations, neighborhoods)")
@@ -2668,13 +6122,26 @@ class MongoDBPull:
         self.logger.info("  - Adding campaign qualifications")
         self.logger.info("  - Generating summaries")
         
-        # Transform events
-        enriched_events = self.event_transformation.transform_events(
-            events, 
-            user_lookup, 
-            self.campaign_qualification,
-            self.summary_generation
-        )
+        # Compact records overlay the derived fields instead of modifying the events
+        if self.compact:
+            events = [EnrichedEvent(materialize(event)) for event in events]
+        
+        # Transform events (only the stages the derived fields need, if given)
+        if derived is not None:
+            enriched_events = self.selective_enrichment.events(events, user_lookup, demographics, derived, stage_workers)
+            self.stage_report = self.selective_enrichment.report
+        else:
+            enriched_events = self.event_transformation.transform_events(
+                events, 
+                user_lookup, 
+                self.campaign_qualification,
+                self.summary_generation,
+                demographics=demographics
+            )
+        
+        if campaign:
+            enriched_events = self.campaign_qualification.filter_qualified(enriched_events, campaign, 'events')
+        enriched_events = [materialize(event) for event in enriched_events]
         
         self.logger.info("\n" + "=" * 80)
         self.logger.info(f"✓ EVENT PULL COMPLETED: {len(enriched_events)} events fully enriched")
@@ -2683,9 +6150,13 @@ class MongoDBPull:
         # Generate report if requested
         if generate_report:
             self.logger.info("\nGenerating events markdown report...")
-            report_path = self.report_generation.generate_events_report(enriched_events)
+            report_path = self._generate_report('events', enriched_events)
             self.logger.info(f"✓ Report saved to: {report_path}")
         
+        if self.materializer is not None:
+            self.logger.info("\nWriting enriched events back to MongoDB...")
+            self.materializer.write('events', enriched_events)
+        
         # Save data if requested
         if save_data:
             self.logger.info("\nSaving events data to JSON file...")
@@ -2693,7 +6164,7 @@ class MongoDBPull:
         
         return enriched_events
     
-    def users_events_pull(self, users_filter: Optional[Dict[str, Any]] = None, users_limit: Optional[int] = None, events_filter: Optional[Dict[str, Any]] = None, events_limit: Optional[int] = None, generate_report: bool = True, save_data: bool = True) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    def users_events_pull(self, users_filter: Optional[Dict[str, Any]] = None, users_limit: Optional[int] = None, events_filter: Optional[Dict[str, Any]] = None, events_limit: Optional[int] = None, generate_report: bool = True, save_data: bool = True, users_fields: Optional[Iterable[str]] = None, events_fields: Optional[Iterable[str]] = None, server_side: bool = False, scoped: bool = False, workers: int = 1, lazy: bool = False, prefetch: Optional[Iterable[str]] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
         Get fully transformed and enriched users and events in a single operation.
         
@@ -2701,8 +6172,12 @@ class MongoDBPull:
         then passing the data to both users_pull() and events_pull() methods. This avoids
         duplicate database queries when both users and events are needed.
         
+        The three collections are fetched concurrently over the shared connection pool,
+        and the event index and co-attendance graph are built as soon as events arrive,
+        while users and orders are still loading. Per-collection fetch times are logged.
+        
         This is the high-level function that:
-        1. Fetches users, events, and orders from MongoDB (once)
+        1. Fetches users, events, and orders from MongoDB (once, concurrently)
         2. Calls users_pull() with pre-fetched data
         3. Calls events_pull() with pre-fetched data
         4. Returns both enriched users and events
@@ -2714,6 +6189,17 @@ class MongoDBPull:
             events_limit: Optional limit on number of events
             generate_report: If True, generates timestamped markdown reports in reports/ folder
             save_data: If True, saves the enriched data to timestamped JSON files in data/ folder
+            users_fields: Extra raw user fields to fetch, or '*' for whole documents
+            events_fields: Extra raw event fields to fetch, or '*' for whole documents
+            server_side: If True, aggregate order stats in MongoDB instead of fetching orders,
+                and (when users are not filtered or limited) aggregate participant
+                demographics in MongoDB as well
+            scoped: If True (and not server_side), fetch only the selected users' orders,
+                once users have arrived, instead of the whole order collection. Events are
+                still fetched with events_filter, since events_pull enriches them.
+            workers: Worker processes for user enrichment (see users_pull)
+            lazy: If True, users are EnrichedUser records with lazy fields (see users_pull)
+            prefetch: Lazy user fields to compute up front (see users_pull)
             
         Returns:
             Tuple of (enriched_users, enriched_events):
@@ -2725,15 +6211,51 @@ class MongoDBPull:
         self.logger.info("=" * 80)
         self.logger.info(f"Purpose: Fetch and enrich both users and events with optimized data retrieval")
         
-        # Fetch data once
-        self.logger.info("\nStep 1: Fetching raw data from MongoDB (single query for efficiency)...")
-        users = self.connection.get_users(filter=users_filter, limit=users_limit)
-        events = self.connection.get_events(filter=events_filter, limit=events_limit)
-        orders = self.connection.get_orders()
+        # Fetch data once, with the collections read concurrently over the shared connection pool
+        self.logger.info("\nStep 1: Fetching raw data from MongoDB (concurrent queries)...")
+        # Both pulls consume the same documents, so project the union of their fields
+        both = ['users_pull', 'events_pull']
+        fetches = {
+            'users': lambda: self._fetch('user', filter=users_filter, limit=users_limit, projection=build_projection(both, 'user', users_fields)),
+            'events': lambda: self._fetch('event', filter=events_filter, limit=events_limit, projection=build_projection(both, 'event', events_fields)),
+        }
+        if not server_side and scoped:
+            # Started once users have arrived
+            fetches['orders'] = lambda: self._fetch_scoped('order', users, projection=build_projection(both, 'order'))
+        elif not server_side:
+            fetches['orders'] = lambda: self._fetch('order', projection=build_projection(both, 'order'))
+        
+        timings: Dict[str, float] = {}
+        
+        def timed_fetch(name: str) -> List[Dict[str, Any]]:
+            start = time.perf_counter()
+            documents = fetches[name]()
+            timings[name] = time.perf_counter() - start
+            self.logger.info(f"  ✓ Fetched {len(documents)} {name} in {timings[name]:.2f}s")
+            return documents
+        
+        fetch_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(fetches), thread_name_prefix='mongodb-fetch') as executor:
+            futures = {name: executor.submit(timed_fetch, name) for name in fetches if not (scoped and name == 'orders')}
+            
+            # Build the event index and co-attendance graph while users and orders are still loading
+            events = futures['events'].result()
+            index_start = time.perf_counter()
+            event_map, _ = self.user_enrichment.index_data_by_user(events, [])
+            event_index = UserEventIndex(event_map)
+            # Lazy social connections build the graph on first read instead
+            if 'social_connections' in self._split_lazy_fields(lazy, prefetch)[0]:
+                self.co_attendance_graph = self.social_connection.build_co_attendance_graph(event_index)
+            self.logger.info(f"  ✓ Built event index and co-attendance graph in {time.perf_counter() - index_start:.2f}s")
+            
+            users = futures['users'].result()
+            if 'orders' in futures:
+                orders = futures['orders'].result()
+            else:
+                orders = timed_fetch('orders') if 'orders' in fetches else None
         
-        self.logger.info(f"  ✓ Fetched {len(users)} users")
-        self.logger.info(f"  ✓ Fetched {len(events)} events")
-        self.logger.info(f"  ✓ Fetched {len(orders)} orders")
+        elapsed = time.perf_counter() - fetch_start
+        self.logger.info(f"  ✓ Fetch phase took {elapsed:.2f}s (collection fetches sum to {sum(timings.values()):.2f}s)")
         
         # Call users_pull with pre-fetched data
         self.logger.info("\n" + "=" * 80)
@@ -2746,21 +6268,33 @@ class MongoDBPull:
             save_data=save_data,
             users=users,
             events=events,
-            orders=orders
+            orders=orders,
+            server_side=server_side,
+            event_index=event_index,
+            workers=workers,
+            lazy=lazy,
+            prefetch=prefetch
         )
         
         # Call events_pull with pre-fetched data
         self.logger.info("\n" + "=" * 80)
         self.logger.info("Processing events with pre-fetched data...")
         self.logger.info("=" * 80)
+        # Server-side demographics join the whole user collection, so they only
+        # match the client-side path when users were not filtered or limited
+        demographics_server_side = server_side and users_filter is None and users_limit is None
         enriched_events = self.events_pull(
             filter=None,  # Already filtered
             limit=None,  # Already limited
             generate_report=generate_report,
             save_data=save_data,
-            users=users,
-            events=events
+            users=None if demographics_server_side else users,
+            events=events,
+            server_side=demographics_server_side
         )
+        if self.event_table is not None:
+            # Histories resolve to the enriched events, as the in-place dict pull does
+            self.event_table.update(enriched_events)
         
         self.logger.info("\n" + "=" * 80)
         self.logger.info(f"✓ USERS AND EVENTS PULL COMPLETED")
@@ -0,0 +1,395 @@
+"""
+Columnar Snapshot Store
+
+Stores users/events/orders and enriched pull outputs as Arrow IPC files plus a small
+manifest.json, so readers can reopen them memory-mapped instead of re-parsing
+multi-hundred-MB JSON. Records read back are equal to json.load() of the same data
+written as JSON: ObjectIds and datetimes are stored as strings, top-level fields with a
+single scalar type (str, bool, int, float) become native Arrow columns, and every other
+field (lists, dicts, mixed types, explicit nulls) is stored as a JSON-encoded string
+column. A missing field is an Arrow null and is left out of the record.
+
+Each .arrow file is self-describing (the JSON-encoded columns are listed in its schema
+metadata), so a single file can be read without the manifest. load_records() reads a
+.json path, preferring an up-to-date .arrow file next to it. Decoding a whole file
+costs about as much as json.load(), so readers pass columns= to decode only the fields
+they use.
+
+Requires pyarrow (pip install pyarrow). JSON export stays available through
+SnapshotStore.export_json() for humans.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Callable, Optional
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+
+# ============================================================================
+# Constants
+# ============================================================================
+
+FORMAT_VERSION = 1
+ARROW_SUFFIX = '.arrow'
+MANIFEST_FILE = 'manifest.json'
+JSON_COLUMNS_KEY = b'leo.json_columns'
+FORMAT_VERSION_KEY = b'leo.format_version'
+
+# Rows per Arrow record batch
+DEFAULT_CHUNK_SIZE = 65536
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+# Marks a field that is absent from a record while decoding
+_MISSING = object()
+
+
+def _require_pyarrow() -> None:
+    """Raise a helpful error when pyarrow is not installed"""
+    if pa is None:
+        raise ImportError("The snapshot store requires pyarrow (pip install pyarrow)")
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+def _default(value: Any) -> Any:
+    """JSON form of non-JSON values, matching MongoDBPull's data files (ObjectId -> str, datetime -> ISO)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_key(key: Any) -> str:
+    """Dictionary key as json.dumps writes it"""
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return str(key)
+
+
+def _normalize(value: Any, default: Callable[[Any], Any]) -> Any:
+    """Convert a value to what json.loads(json.dumps(value, default=default)) returns"""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {_json_key(k): _normalize(v, default) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item, default) for item in value]
+    return _normalize(default(value), default)
+
+
+def _arrow_type(values: List[Any]):
+    """Native Arrow type for a column's present values, or None to JSON-encode it"""
+    kinds = {type(value) for value in values}
+    if kinds == {str}:
+        return pa.string()
+    if kinds == {bool}:
+        return pa.bool_()
+    if kinds == {int} and all(_INT64_MIN <= value <= _INT64_MAX for value in values):
+        return pa.int64()
+    if kinds == {float}:
+        return pa.float64()
+    return None
+
+
+def records_to_table(records: List[Dict[str, Any]], default: Callable[[Any], Any] = _default):
+    """
+    Encode records as an Arrow table (one column per top-level field).
+
+    Args:
+        records: List of dictionaries (raw documents or enriched outputs)
+        default: Converts values JSON cannot represent (default: ObjectId -> str, datetime -> ISO)
+
+    Returns:
+        pyarrow.Table whose schema metadata lists the JSON-encoded columns.
+    """
+    _require_pyarrow()
+    names: Dict[str, None] = {}
+    normalized = []
+    for record in records:
+        normalized.append(_normalize(record, default))
+        names.update(dict.fromkeys(normalized[-1]))
+
+    arrays, json_columns = [], []
+    for name in names:
+        cells = [record.get(name) for record in normalized]
+        present = [record[name] for record in normalized if name in record]
+        arrow_type = _arrow_type(present)
+        if arrow_type is None:
+            json_columns.append(name)
+            cells = [json.dumps(record[name], ensure_ascii=False) if name in record else None for record in normalized]
+            arrow_type = pa.string()
+        arrays.append(pa.array(cells, type=arrow_type))
+
+    metadata = {JSON_COLUMNS_KEY: json.dumps(json_columns).encode(), FORMAT_VERSION_KEY: str(FORMAT_VERSION).encode()}
+    return pa.Table.from_arrays(arrays, names=list(names)).replace_schema_metadata(metadata)
+
+
+def table_to_records(table, columns: Optional[List[str]] = None, object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Decode an Arrow table written by records_to_table back into records.
+
+    Args:
+        table: pyarrow.Table
+        columns: Optional subset of fields to decode (others are never read)
+        object_hook: Optional json.loads object_hook for JSON-encoded cells, undoing
+            the default the records were written with (e.g. bson.json_util.object_hook)
+
+    Returns:
+        List of dictionaries equal to the JSON form of the original records.
+    """
+    json_columns = set(json.loads((table.schema.metadata or {}).get(JSON_COLUMNS_KEY, b'[]')))
+    names = table.column_names if columns is None else [name for name in columns if name in table.column_names]
+    columns = []
+    for name in names:
+        # Arrow nulls are missing fields; explicit nulls only occur in JSON columns (as 'null')
+        cells = table.column(name).to_pylist()
+        if name in json_columns:
+            columns.append([_MISSING if cell is None else json.loads(cell, object_hook=object_hook) for cell in cells])
+        else:
+            columns.append([_MISSING if cell is None else cell for cell in cells])
+    return [{name: value for name, value in zip(names, row) if value is not _MISSING} for row in zip(*columns)]
+
+
+# ============================================================================
+# Arrow Files
+# ============================================================================
+
+def write_records(path: str, records: List[Dict[str, Any]], default: Callable[[Any], Any] = _default) -> int:
+    """
+    Write records to an uncompressed Arrow IPC file (atomically).
+
+    Args:
+        path: Destination .arrow file
+        records: List of dictionaries
+        default: Converts values JSON cannot represent
+
+    Returns:
+        Size of the written file in bytes.
+    """
+    table = records_to_table(records, default)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=DEFAULT_CHUNK_SIZE)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def open_table(path: str, columns: Optional[List[str]] = None):
+    """
+    Open an Arrow file memory-mapped; only the columns that are read get paged in.
+
+    Args:
+        path: .arrow file
+        columns: Optional subset of columns to keep
+
+    Returns:
+        pyarrow.Table backed by the memory map.
+    """
+    _require_pyarrow()
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    if columns is not None:
+        table = table.select([name for name in columns if name in table.column_names])
+    return table
+
+
+def read_records(path: str, columns: Optional[List[str]] = None, object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Read records from an Arrow file written by write_records.
+
+    Args:
+        path: .arrow file
+        columns: Optional subset of fields to read (others are never decoded)
+        object_hook: Optional json.loads object_hook for JSON-encoded cells
+
+    Returns:
+        List of dictionaries.
+    """
+    return table_to_records(open_table(path, columns), object_hook=object_hook)
+
+
+def _fresh_arrow_path(json_path: str) -> Optional[str]:
+    """Return the .arrow file next to json_path when it can be read instead of the JSON"""
+    arrow_path = os.path.splitext(json_path)[0] + ARROW_SUFFIX
+    if pa is not None and os.path.exists(arrow_path):
+        if not os.path.exists(json_path) or os.path.getmtime(arrow_path) >= os.path.getmtime(json_path):
+            return arrow_path
+    return None
+
+
+def load_records(json_path: str, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Load records for a .json data file, preferring the .arrow file next to it.
+
+    The .arrow file is used when pyarrow is installed and it is at least as new as the
+    JSON file (or the JSON file does not exist); otherwise the JSON file is parsed.
+    Decoding every column of an Arrow file costs about as much as json.load, so readers
+    should pass the fields they use: other columns are never paged in or decoded.
+
+    Args:
+        json_path: Path of the .json data file
+        columns: Optional subset of fields to load
+
+    Returns:
+        List of dictionaries (holding only the requested fields when columns is given).
+    """
+    arrow_path = _fresh_arrow_path(json_path)
+    if arrow_path is not None:
+        return read_records(arrow_path, columns)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    if columns is None:
+        return records
+    return [{name: record[name] for name in columns if name in record} for record in records]
+
+
+def snapshot_fields(json_path: str) -> Optional[List[str]]:
+    """
+    List the fields of the .arrow file load_records would read for a .json data file.
+
+    Only the Arrow schema is read, so callers can report fields they do not load.
+
+    Args:
+        json_path: Path of the .json data file
+
+    Returns:
+        Column names, or None when load_records would parse the JSON file.
+    """
+    arrow_path = _fresh_arrow_path(json_path)
+    if arrow_path is None:
+        return None
+    return pa.ipc.open_file(pa.memory_map(arrow_path, 'r')).schema.names
+
+
+# ============================================================================
+# Snapshot Store Class
+# ============================================================================
+
+class SnapshotStore:
+    """A directory of named Arrow datasets with a manifest."""
+
+    def __init__(self, directory: str, logger: Optional[logging.Logger] = None):
+        """
+        Initialize SnapshotStore.
+
+        Args:
+            directory: Store directory (created on first write)
+            logger: Optional logger instance
+        """
+        _require_pyarrow()
+        self.directory = directory
+        self.logger = logger or logging.getLogger('MongoDBPull.SnapshotStore')
+
+    def _path(self, name: str) -> str:
+        """Arrow file path for a dataset"""
+        return os.path.join(self.directory, f"{name}{ARROW_SUFFIX}")
+
+    def manifest(self) -> Dict[str, Any]:
+        """
+        Read the manifest.
+
+        Returns:
+            Dictionary with format_version and datasets (name -> file, rows, columns,
+            json_columns, bytes, written_at).
+        """
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {'format_version': FORMAT_VERSION, 'datasets': {}}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Write the manifest atomically"""
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def names(self) -> List[str]:
+        """Names of the datasets in the store"""
+        return sorted(self.manifest()['datasets'])
+
+    def write(self, name: str, records: List[Dict[str, Any]], default: Callable[[Any], Any] = _default) -> str:
+        """
+        Write (or replace) a dataset.
+
+        Args:
+            name: Dataset name (e.g. 'users', 'events', 'orders')
+            records: List of dictionaries
+            default: Converts values JSON cannot represent
+
+        Returns:
+            Path of the written .arrow file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(name)
+        size = write_records(path, records, default)
+        schema = open_table(path).schema
+        manifest = self.manifest()
+        manifest['datasets'][name] = {
+            'file': os.path.basename(path),
+            'rows': len(records),
+            'columns': schema.names,
+            'json_columns': json.loads(schema.metadata[JSON_COLUMNS_KEY]),
+            'bytes': size,
+            'written_at': datetime.now(timezone.utc).isoformat(),
+        }
+        self._save_manifest(manifest)
+        self.logger.info(f"✓ Snapshot saved to: {path} ({len(records)} {name}, {size / 1e6:.1f} MB)")
+        return path
+
+    def table(self, name: str, columns: Optional[List[str]] = None):
+        """
+        Open a dataset as a memory-mapped Arrow table.
+
+        Args:
+            name: Dataset name
+            columns: Optional subset of columns
+
+        Returns:
+            pyarrow.Table
+        """
+        return open_table(self._path(name), columns)
+
+    def read(self, name: str, columns: Optional[List[str]] = None, object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Read a dataset as records.
+
+        Args:
+            name: Dataset name
+            columns: Optional subset of fields to read
+            object_hook: Optional json.loads object_hook matching the default the
+                dataset was written with
+
+        Returns:
+            List of dictionaries.
+        """
+        return read_records(self._path(name), columns, object_hook)
+
+    def export_json(self, name: str, path: Optional[str] = None) -> str:
+        """
+        Export a dataset as pretty-printed JSON for humans.
+
+        Args:
+            name: Dataset name
+            path: Output path (default: <name>.json in the store directory)
+
+        Returns:
+            Path of the written JSON file.
+        """
+        path = path or os.path.join(self.directory, f"{name}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.read(name), f, indent=2, ensure_ascii=False)
+        self.logger.info(f"✓ Exported {name} to: {path}")
+        return path
@@ -0,0 +1,1399 @@
+#!/usr/bin/env python3
+"""Test script for MongoDB pull and enrichment utilities"""
+
+import asyncio
+import copy
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from bson import Decimal128, Int64, ObjectId
+
+# Local mongod used by the server-side tests (skipped when unreachable)
+MONGODB_TEST_URI = os.environ.get('MONGODB_TEST_URI', 'mongodb://localhost:27017')
+
+
+def _quiet_logger():
+    """Logger that does not write log files or console output"""
+    logger = logging.getLogger('MongoDBPullTest')
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+    return logger
+
+
+def _iso(dt):
+    """Format a datetime the way the production collections store it"""
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.') + f"{dt.microsecond // 1000:03d}Z"
+
+
+def make_sample_data(n_users=200, n_events=250, n_orders=400, seed=7):
+    """
+    Build reproducible users, events and orders.
+
+    Every timestamp sits half a day away from a whole-day offset so day counts cannot
+    flip while the row-wise and columnar paths run a few milliseconds apart.
+    """
+    rnd = random.Random(seed)
+    now = datetime.now(timezone.utc)
+
+    def days_ago(days):
+        return _iso(now - timedelta(days=days, hours=12))
+
+    users = []
+    for i in range(n_users):
+        user = {
+            '_id': ObjectId(),
+            'firstName': f'First{i}',
+            'lastName': f'Last{i}',
+            'bio': f'<p>Bio for user {i}</p>' * 20,
+            'role': rnd.choice(['REGULAR', 'POTENTIAL', 'ADMIN']),
+            'createdAt': days_ago(rnd.randint(0, 900)),
+        }
+        if rnd.random() < 0.7:
+            user['interests'] = rnd.sample(['art', 'music', 'food', 'wine', 'tech', ''], rnd.randint(0, 3))
+        if rnd.random() < 0.6:
+            user['tableTypePreference'] = rnd.choice(['small', 'large', ' '])
+        if rnd.random() < 0.6:
+            user['homeNeighborhood'] = rnd.choice(['SoHo', 'Harlem', 'Chelsea'])
+        if rnd.random() < 0.6:
+            user['gender'] = rnd.choice(['male', 'female', ''])
+        if rnd.random() < 0.5:
+            user['relationship_status'] = rnd.choice(['single', 'married'])
+        if rnd.random() < 0.5:
+            user['occupation'] = rnd.choice(['Engineer', 'Chef', 'Artist'])
+        users.append(user)
+
+    user_ids = [user['_id'] for user in users]
+    events = []
+    for i in range(n_events):
+        participants = rnd.sample(user_ids, rnd.randint(0, 12))
+        event = {
+            '_id': ObjectId(),
+            'name': f'Event {i}',
+            'participants': [p if rnd.random() < 0.5 else str(p) for p in participants],
+            'ownerId': rnd.choice(user_ids) if rnd.random() < 0.9 else None,
+            'startDate': days_ago(rnd.randint(-60, 400)),
+            'type': rnd.choice(['public', 'private']),
+            'maxParticipants': rnd.choice([0, 6, 8, 10, 12, None]),
+            'categories': rnd.sample(['dinner', 'brunch', 'party', 'games'], 2),
+            'features': ['conversation', 'drinks'],
+            'venueName': rnd.choice(['Venue A', 'Venue B', 'Venue C']),
+            'description': f'<div><p>Details for event {i}</p></div>' * 20,
+            'internalNotes': 'not read by any stage',
+        }
+        events.append(event)
+
+    orders = []
+    for i in range(n_orders):
+        order = {
+            '_id': ObjectId(),
+            'userId': rnd.choice(user_ids) if rnd.random() < 0.95 else None,
+            'createdAt': days_ago(rnd.randint(0, 600)),
+        }
+        roll = rnd.random()
+        if roll < 0.45:
+            order['price'] = {'total': round(rnd.uniform(0, 400), 2)}
+        elif roll < 0.9:
+            order['price'] = rnd.choice([rnd.randint(0, 300), round(rnd.uniform(0, 300), 2)])
+        orders.append(order)
+
+    return users, events, orders
+
+
+def _project(documents, projection):
+    """Apply a top-level inclusion projection the way MongoDB would"""
+    keep = set(projection) | {'_id'}
+    return [{k: v for k, v in doc.items() if k in keep} for doc in documents]
+
+
+class _InMemoryConnection:
+    """Serves pre-built documents through the MongoDBConnection read API"""
+
+    def __init__(self, users, events, orders):
+        self.collections = {'user': users, 'event': events, 'order': orders}
+        self.returned = []
+        self.threads = set()
+        self.latency = 0.0
+
+    @classmethod
+    def _matches(cls, document, filter):
+        """Evaluate the subset of MongoDB query syntax the pulls generate"""
+        for field, condition in (filter or {}).items():
+            if field == '$and':
+                if not all(cls._matches(document, clause) for clause in condition):
+                    return False
+            elif field == '$or':
+                if not any(cls._matches(document, clause) for clause in condition):
+                    return False
+            elif not isinstance(condition, dict):
+                if document.get(field) != condition:
+                    return False
+            else:
+                value = document.get(field)
+                if '$in' in condition:
+                    # Arrays match when any element is in the list
+                    values = value if isinstance(value, list) else [value]
+                    if not any(v in condition['$in'] for v in values):
+                        return False
+                    continue
+                for operator, bound in condition.items():
+                    # Range operators only match values of the same BSON type
+                    if type(value) is not type(bound):
+                        return False
+                    if (operator == '$gte' and value < bound) or (operator == '$gt' and value <= bound):
+                        return False
+        return True
+
+    def read_collection(self, collection, filter=None, limit=None, projection=None, partitions=None, lazy=None):
+        time.sleep(self.latency)
+        documents = [doc for doc in self.collections[collection] if self._matches(doc, filter)]
+        documents = documents[:limit] if limit else documents
+        self.returned.append((collection, len(documents)))
+        self.threads.add(threading.current_thread().name)
+        return _project(documents, projection) if projection else copy.deepcopy(documents)
+
+    def get_users(self, filter=None, limit=None, projection=None, partitions=None):
+        return self.read_collection('user', filter, limit, projection)
+
+    def get_events(self, filter=None, limit=None, projection=None, partitions=None):
+        return self.read_collection('event', filter, limit, projection)
+
+    def get_orders(self, filter=None, limit=None, projection=None, partitions=None):
+        return self.read_collection('order', filter, limit, projection)
+
+    def iter_users(self, filter=None, limit=None, batch_size=None, projection=None, partitions=None):
+        return iter(self.get_users(filter, limit, projection))
+
+
+class _AsyncInMemoryConnection:
+    """Serves an _InMemoryConnection's documents through the AsyncMongoDBConnection read API"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def read_collection(self, collection, filter=None, limit=None, projection=None):
+        await asyncio.sleep(self.connection.latency)
+        return self.connection.read_collection(collection, filter, limit, projection)
+
+    async def close(self):
+        pass
+
+
+def _local_mongod():
+    """Client for the local test mongod, or None when it is not running"""
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    client = MongoClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command('ping')
+    except PyMongoError:
+        client.close()
+        return None
+    return client
+
+
+def test_module_imports():
+    """Test that the mongodb_pull module can be imported"""
+    try:
+        from utils.mongodb_pull import MongoDBPull, UserEnrichment, UserEventIndex, CoAttendanceGraph
+        print("✓ Module imports successful")
+        return True
+    except ImportError as e:
+        print(f"✗ Module import failed: {e}")
+        return False
+
+
+def test_columnar_enrichment_matches_row_wise():
+    """Test that the columnar engine produces exactly the row-wise enrichment"""
+    from utils.mongodb_pull import UserEnrichment, CampaignQualification, calculate_newcomer_score, calculate_reactivation_score
+
+    users, events, orders = make_sample_data()
+    logger = _quiet_logger()
+    enrichment = UserEnrichment(logger)
+    qualifier = CampaignQualification(logger)
+
+    row_wise = enrichment.transform_users(copy.deepcopy(users), events, orders, qualifier)
+    columnar = enrichment.transform_users(copy.deepcopy(users), events, orders, qualifier, columnar=True)
+
+    assert enrichment.columnar_engine is not None, "Columnar engine did not run"
+    assert len(row_wise) == len(columnar)
+    for expected, actual in zip(row_wise, columnar):
+        assert list(expected.keys()) == list(actual.keys()), f"Key order differs for user {expected['id']}"
+        assert expected == actual, f"Enrichment differs for user {expected['id']}"
+        for key, value in expected.items():
+            assert type(value) is type(actual[key]), f"Type of '{key}' differs for user {expected['id']}"
+
+    newcomer_scores, reactivation_scores = enrichment.columnar_engine.scores()
+    assert newcomer_scores == [calculate_newcomer_score(u) for u in row_wise]
+    assert reactivation_scores == [calculate_reactivation_score(u) for u in row_wise]
+    print(f"✓ Columnar enrichment matches row-wise output for {len(row_wise)} users")
+    return True
+
+
+def test_users_pull_iter_matches_users_pull():
+    """Test that streamed batches concatenate to exactly the users_pull output"""
+    from utils.mongodb_pull import MongoDBPull
+
+    users, events, orders = make_sample_data()
+    pull = MongoDBPull(_quiet_logger())
+    pull.connection = _InMemoryConnection(users, events, orders)
+    expected = pull.users_pull(generate_report=False, save_data=False)
+
+    batches = list(pull.users_pull_iter(batch_size=37))
+
+    assert all(len(batch) <= 37 for batch in batches)
+    assert [len(batch) for batch in batches[:-1]] == [37] * (len(batches) - 1)
+    streamed = [user for batch in batches for user in batch]
+    assert streamed == expected, "Streamed users differ from users_pull output"
+    print(f"✓ users_pull_iter yielded {len(batches)} batches matching users_pull ({len(streamed)} users)")
+    return True
+
+
+def test_projection_preserves_enrichment():
+    """Test that registry projections keep every field the users/events pulls read"""
+    from utils.mongodb_pull import MongoDBPull, build_projection, ALL_FIELDS
+
+    users, events, orders = make_sample_data()
+    pull = MongoDBPull(_quiet_logger())
+
+    assert build_projection(['users_pull'], 'user', ALL_FIELDS) is None
+    assert 'bio' not in build_projection(['users_pull'], 'user')
+    assert 'bio' in build_projection(['users_pull'], 'user', ['bio'])
+    assert 'internalNotes' not in build_projection(['users_pull'], 'event')
+    assert 'description' in build_projection(['events_pull'], 'event')
+
+    # users_pull: dropped raw fields are the only difference
+    user_projection = build_projection(['users_pull'], 'user')
+    event_projection = build_projection(['users_pull'], 'event')
+    full = pull.users_pull(users=copy.deepcopy(users), events=events, orders=orders, generate_report=False, save_data=False)
+    projected = pull.users_pull(
+        users=_project(users, user_projection),
+        events=_project(events, event_projection),
+        orders=_project(orders, build_projection(['users_pull'], 'order')),
+        generate_report=False, save_data=False,
+    )
+    dropped = set(users[0]) - set(user_projection) - {'_id'}
+    assert 'bio' in dropped
+    for user in full:
+        for key in dropped:
+            user.pop(key, None)
+        user['event_history'] = _project(user['event_history'], event_projection)
+    assert full == projected, "users_pull output changed under projection"
+
+    # events_pull
+    event_projection = build_projection(['events_pull'], 'event')
+    full = pull.events_pull(users=users, events=copy.deepcopy(events), generate_report=False, save_data=False)
+    projected = pull.events_pull(
+        users=_project(users, build_projection(['events_pull'], 'user')),
+        events=_project(events, event_projection),
+        generate_report=False, save_data=False,
+    )
+    dropped = set(events[0]) - set(event_projection) - {'_id'}
+    assert 'internalNotes' in dropped
+    for event in full:
+        for key in dropped:
+            event.pop(key, None)
+    assert full == projected, "events_pull output changed under projection"
+    print("✓ Projected pulls match full-document pulls")
+    return True
+
+
+def test_projection_covers_airtable_sync_fields():
+    """Test that pull projections keep every raw column the Airtable sync reads"""
+    import ast
+    from utils.mongodb_pull import build_projection, USER_ENRICHED_FIELDS
+    from utils.mongodb_pull.mongodb_pull import USER_STEP3_FIELDS, EVENT_ENRICHED_FIELDS
+
+    # Read the mappings from source: airtable_sync needs pyairtable at import time
+    sync_path = os.path.join(os.path.dirname(__file__), '..', 'airtable_sync', 'airtable_sync.py')
+    with open(sync_path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    mappings = {
+        node.targets[0].id: ast.literal_eval(node.value)
+        for node in tree.body
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', None) in ('USERS_FIELD_MAPPING', 'EVENTS_FIELD_MAPPING')
+    }
+
+    # 'id' and the qualification flags are derived by the pull or the sync itself
+    checks = [
+        ('USERS_FIELD_MAPPING', 'users_pull', 'user', set(USER_ENRICHED_FIELDS) | set(USER_STEP3_FIELDS)),
+        ('EVENTS_FIELD_MAPPING', 'events_pull', 'event', set(EVENT_ENRICHED_FIELDS) | {'id'}),
+    ]
+    for mapping, pull, collection, derived in checks:
+        projection = build_projection([pull], collection)
+        raw = {key for key in mappings[mapping] if key not in derived and not key.startswith('qualifies_')}
+        missing = raw - set(projection)
+        assert not missing, f"{pull} projection drops Airtable columns {sorted(missing)}"
+    print(f"✓ Projections cover the raw Airtable columns of {len(checks)} mappings")
+    return True
+
+
+def test_server_side_aggregation_matches_client_side():
+    """Test that $group/$lookup pushdown equals the client-side stats and demographics"""
+    from utils.mongodb_pull import MongoDBPull
+
+    client = _local_mongod()
+    if client is None:
+        print(f"- Skipped server-side aggregation test (no mongod at {MONGODB_TEST_URI})")
+        return True
+
+    database = f"mongodb_pull_test_{ObjectId()}"
+    users, events, orders = make_sample_data()
+    # Values where MongoDB operators differ from Python ($toLower, $convert, $isNumber)
+    users[0]['interests'] = ['CAFÉ', 'Café', 1.0, 1]
+    users[0]['occupation'] = 1.0
+    events[0]['participants'] = list(events[0].get('participants') or []) + [users[0]['_id']]
+    orders[0]['price'] = Decimal128('12.50')
+    pull = MongoDBPull(_quiet_logger(), connection_string=MONGODB_TEST_URI, database=database)
+    try:
+        client[database]['user'].insert_many(users)
+        client[database]['event'].insert_many(events)
+        client[database]['order'].insert_many(orders)
+
+        client_side = pull.users_pull(generate_report=False, save_data=False)
+        server_side = pull.users_pull(generate_report=False, save_data=False, server_side=True)
+        assert client_side == server_side, "Server-side order stats differ from client-side"
+
+        client_side = pull.events_pull(generate_report=False, save_data=False)
+        server_side = pull.events_pull(generate_report=False, save_data=False, server_side=True)
+        assert client_side == server_side, "Server-side demographics differ from client-side"
+    finally:
+        pull.close()
+        client.drop_database(database)
+        client.close()
+
+    print(f"✓ Server-side aggregation matches client-side enrichment ({len(users)} users, {len(events)} events)")
+    return True
+
+
+def test_server_side_pipelines_follow_python_values():
+    """Test that pipeline results fold decimal, non-ASCII and double values like the Python path"""
+    from utils.mongodb_pull import EventTransformation, UserEnrichment, build_order_stats_pipeline, fold_demographic_values
+    from utils.mongodb_pull.mongodb_pull import _OCCURRENCE_STRIDE
+
+    # Bare prices count only when pymongo decodes them to int/float
+    orders = [{'price': Decimal128('12.50')}, {'price': 2.5}, {'price': Int64(3)}, {'price': {'total': 4}}]
+    assert UserEnrichment(_quiet_logger()).calculate_stats([], orders)['total_spent'] == 9.5
+    branches = build_order_stats_pipeline()[0]['$project']['amount']['$switch']['branches']
+    assert branches[1]['case'] == {'$in': [{'$type': '$price'}, ['double', 'int', 'long']]}
+
+    users = {
+        'u1': {'interests': ['CAFÉ', 'wine', 1.0], 'occupation': 'Ingénieur', 'homeNeighborhood': 'SoHo'},
+        'u2': {'interests': ['Café', 1, 1.0], 'occupation': 'INGÉNIEUR', 'homeNeighborhood': 'soho'},
+        'u3': {'interests': ['café', None, 'Wine'], 'occupation': 1.0},
+    }
+    event = {'participants': ['u1', 'u2', 'u3', 'missing']}
+    EventTransformation(_quiet_logger()).enrich_event_with_participants(event, users)
+
+    # Rows as build_event_demographics_pipeline groups them: raw value per BSON type
+    groups = {}
+    for p_idx, pid in enumerate(event['participants']):
+        user = users.get(pid)
+        if not user:
+            continue
+        signals = [('interests', value, p_idx * _OCCURRENCE_STRIDE + i) for i, value in enumerate(user.get('interests') or [])]
+        signals += [(d, user[f], p_idx * _OCCURRENCE_STRIDE) for d, f in (('occupations', 'occupation'), ('neighborhoods', 'homeNeighborhood')) if user.get(f)]
+        for dimension, value, position in signals:
+            entry = groups.setdefault(dimension, {}).setdefault((type(value).__name__, repr(value)), [value, 0, position])
+            entry[1] += 1
+            entry[2] = min(entry[2], position)
+
+    folded = {dimension: fold_demographic_values(entries.values()) for dimension, entries in groups.items()}
+    assert folded['interests'] == event['participant_top_interests'] == [('café', 3), ('wine', 2), ('1.0', 2), ('1', 1), ('none', 1)]
+    assert folded['occupations'] == event['participant_top_occupations'] == [('ingénieur', 2), ('1.0', 1)]
+    assert folded['neighborhoods'] == event['participant_top_neighborhoods']
+    print("✓ Pipeline rows fold Decimal128 prices, non-ASCII case and 1.0 like the Python path")
+    return True
+
+
+def test_delta_snapshot_pulls_only_changes():
+    """Test that delta pulls merge changed documents and reconcile drops deletes"""
+    from utils.mongodb_pull import MongoDBPull, DeltaSnapshot, build_projection
+
+    users, events, orders = make_sample_data()
+    # Most users carry updatedAt; the first two are legacy documents with createdAt only
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i, user in enumerate(users[2:]):
+        user['updatedAt'] = _iso(base + timedelta(minutes=i))
+    if users[0]['createdAt'] < users[1]['createdAt']:
+        users[0]['createdAt'], users[1]['createdAt'] = users[1]['createdAt'], users[0]['createdAt']
+    connection = _InMemoryConnection(users, events, orders)
+    projection = build_projection(['users_pull'], 'user')
+    warnings = []
+
+    class WarningCapture(logging.Handler):
+        def emit(self, record):
+            warnings.append(record.getMessage())
+
+    logger = _quiet_logger()
+    logger.addHandler(WarningCapture(logging.WARNING))
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        snapshot = DeltaSnapshot(connection, snapshot_dir, logger=logger)
+        assert snapshot.pull('user', projection) == connection.get_users(projection=projection)
+        meta = snapshot._meta['user']
+        assert (meta['watermark_field'], meta['secondary_watermark_field']) == ('updatedAt', 'createdAt')
+        assert meta['secondary_watermark'] == users[0]['createdAt']
+        assert warnings == []
+        snapshot.pull('event')
+        assert snapshot._meta['event']['watermark_field'] == '_id'
+        assert any("'event' documents mostly lack updatedAt" in message for message in warnings), warnings
+
+        # Edits that bump updatedAt (including a legacy user's first one) and new users,
+        # with or without updatedAt, are fetched together with the documents sitting on
+        # the old marks ($gte). Edits that move no mark wait for the full reconcile.
+        later = _iso(base + timedelta(days=1))
+        newest_created = max(user['createdAt'] for user in users)
+        users.append({'_id': ObjectId(), 'firstName': 'New', 'createdAt': later, 'updatedAt': later})
+        users.append({'_id': ObjectId(), 'firstName': 'Legacy new', 'createdAt': newest_created})
+        users[2]['firstName'] = 'Edited'
+        users[2]['updatedAt'] = later
+        users[0]['firstName'] = 'Legacy edited'
+        users[0]['updatedAt'] = later
+        silent_names = (users[1]['firstName'], users[3]['firstName'])
+        users[1]['firstName'] = 'Silent legacy edit'
+        users[3]['firstName'] = 'Silent edit'
+        connection.returned.clear()
+        pulled = snapshot.pull('user', projection)
+        assert connection.returned == [('user', 5)], connection.returned
+        by_id = {user['_id']: user for user in pulled}
+        assert by_id[users[2]['_id']]['firstName'] == 'Edited'
+        assert by_id[users[0]['_id']]['firstName'] == 'Legacy edited'
+        assert by_id[users[-2]['_id']]['firstName'] == 'New'
+        assert by_id[users[-1]['_id']]['firstName'] == 'Legacy new'
+        assert (by_id[users[1]['_id']]['firstName'], by_id[users[3]['_id']]['firstName']) == silent_names
+        assert snapshot._meta['user']['watermark'] == later
+        assert snapshot._meta['user']['secondary_watermark'] == newest_created
+        assert snapshot.pull('user', projection, full=True) == connection.get_users(projection=projection)
+        pulled = snapshot.pull('user', projection)
+
+        # A fresh instance reads the same snapshot back from disk with types intact
+        reloaded = DeltaSnapshot(connection, snapshot_dir, logger=_quiet_logger())
+        assert reloaded.pull('user', projection) == pulled
+        assert reloaded._meta['user']['secondary_watermark_field'] == 'createdAt'
+
+        # Deletes are only visible after a full reconcile
+        del users[1]
+        assert len(snapshot.pull('user', projection)) == len(users) + 1
+        assert snapshot.pull('user', projection, full=True) == connection.get_users(projection=projection)
+
+        # users_pull through the snapshot matches a direct pull
+        pull = MongoDBPull(_quiet_logger())
+        pull.connection = connection
+        direct = pull.users_pull(generate_report=False, save_data=False)
+        pull.snapshot = DeltaSnapshot(connection, snapshot_dir, logger=_quiet_logger())
+        assert pull.users_pull(generate_report=False, save_data=False) == direct
+
+    print("✓ Delta snapshot fetched changes by primary and secondary watermarks; silent edits and deletes waited for the reconcile")
+    return True
+
+
+def test_users_events_pull_fetches_concurrently():
+    """Test that concurrent fetching gives the same output as sequential pulls"""
+    from utils.mongodb_pull import MongoDBPull, build_projection
+
+    users, events, orders = make_sample_data()
+    connection = _InMemoryConnection(users, events, orders)
+    pull = MongoDBPull(_quiet_logger())
+    pull.connection = connection
+
+    both = ['users_pull', 'events_pull']
+    fetched_users = connection.get_users(projection=build_projection(both, 'user'))
+    fetched_events = connection.get_events(projection=build_projection(both, 'event'))
+    fetched_orders = connection.get_orders(projection=build_projection(both, 'order'))
+    expected_users = pull.users_pull(users=fetched_users, events=fetched_events, orders=fetched_orders, generate_report=False, save_data=False)
+    expected_events = pull.events_pull(users=fetched_users, events=fetched_events, generate_report=False, save_data=False)
+
+    # Simulated network latency keeps all three fetches in flight at once
+    connection.threads.clear()
+    connection.latency = 0.2
+    enriched_users, enriched_events = pull.users_events_pull(generate_report=False, save_data=False)
+    assert len(connection.threads) == 3, connection.threads
+    assert all(name.startswith('mongodb-fetch') for name in connection.threads)
+    assert enriched_users == expected_users
+    assert enriched_events == expected_events
+    print("✓ users_events_pull fetched collections concurrently with unchanged output")
+    return True
+
+
+def test_partitioned_reads_match_single_cursor():
+    """Test that _id-range partitions cover every document exactly once, in _id order"""
+    from utils.mongodb_pull import MongoDBPull, build_partition_filters
+
+    def in_range(document, range_filter):
+        bounds = range_filter.get('_id', {})
+        return ('$gte' not in bounds or document['_id'] >= bounds['$gte']) and ('$lt' not in bounds or document['_id'] < bounds['$lt'])
+
+    users, events, orders = make_sample_data()
+    ids = sorted(user['_id'] for user in users)
+    edges = ids[::len(ids) // 4] + [ids[-1]]
+    buckets = [{'_id': {'min': low, 'max': high}, 'count': 0} for low, high in zip(edges, edges[1:])]
+    filters = build_partition_filters(buckets)
+    assert len(filters) == len(buckets)
+    partitioned = [user for range_filter in filters for user in sorted(users, key=lambda u: u['_id']) if in_range(user, range_filter)]
+    assert partitioned == sorted(users, key=lambda u: u['_id'])
+
+    user_filter = {'firstName': {'$exists': True}}
+    assert all(f['$and'][0] == user_filter for f in build_partition_filters(buckets, user_filter))
+    mixed = [{'_id': {'min': 1, 'max': 'a'}, 'count': 1}, {'_id': {'min': 'a', 'max': 'b'}, 'count': 1}]
+    assert build_partition_filters(mixed) is None
+
+    client = _local_mongod()
+    if client is None:
+        print(f"✓ Partition filters cover every _id once (mongod read skipped, none at {MONGODB_TEST_URI})")
+        return True
+
+    database = f"mongodb_pull_test_{ObjectId()}"
+    pull = MongoDBPull(_quiet_logger(), connection_string=MONGODB_TEST_URI, database=database, partitions=4)
+    try:
+        client[database]['user'].insert_many(users)
+        single = sorted(pull.connection.get_users(partitions=1), key=lambda u: u['_id'])
+        assert pull.connection.get_users() == single
+        assert list(pull.connection.iter_users(batch_size=50)) == single
+        assert pull.connection.get_users(limit=10, partitions=4) == pull.connection.get_users(limit=10, partitions=1)
+    finally:
+        pull.close()
+        client.drop_database(database)
+        client.close()
+
+    print(f"✓ Partitioned reads match a single cursor ({len(users)} users, 4 partitions)")
+    return True
+
+
+def test_partitioned_iteration_prefetches_one_partition():
+    """Test that iter_* reads only one _id-range partition ahead of the one it yields"""
+    from utils.mongodb_pull import MongoDBConnection, build_partition_filters
+
+    users = sorted(make_sample_data()[0], key=lambda u: u['_id'])
+    ids = [user['_id'] for user in users]
+    edges = ids[::len(ids) // 8] + [ids[-1]]
+    filters = build_partition_filters([{'_id': {'min': low, 'max': high}, 'count': 0} for low, high in zip(edges, edges[1:])])
+    started = []
+
+    class _Cursor:
+        def __init__(self, documents):
+            self.documents = documents
+
+        def sort(self, key, direction):
+            return iter(sorted(self.documents, key=lambda d: d[key]))
+
+    class _PartitionedConnection(MongoDBConnection):
+        def _partition_filters(self, collection, filter, partitions):
+            return filters
+
+        def _find(self, collection, filter=None, limit=None, batch_size=None, projection=None, raw=False):
+            started.append(filter)
+            bounds = filter['_id']
+            return _Cursor([u for u in users if ('$gte' not in bounds or u['_id'] >= bounds['$gte']) and ('$lt' not in bounds or u['_id'] < bounds['$lt'])])
+
+    connection = _PartitionedConnection(_quiet_logger(), partitions=len(filters))
+    streamed, ahead = [], 0
+    for user in connection.iter_users(batch_size=10):
+        partition = sum(1 for edge in edges[1:-1] if user['_id'] >= edge)
+        ahead = max(ahead, len(started) - partition - 1)
+        streamed.append(user)
+    assert streamed == users and len(started) == len(filters)
+    assert ahead <= 1, f"{ahead} partitions were read ahead"
+
+    started.clear()
+    assert connection.get_users() == users and len(started) == len(filters)
+    print(f"✓ Partitioned iteration reads at most 1 of {len(filters)} partitions ahead")
+    return True
+
+
+def test_connections_share_registry_client():
+    """Test that connections borrow one client per URI and options from the registry"""
+    from utils.mongodb_pull import MongoDBPull, MongoDBConnection, MongoClientRegistry
+
+    registry = MongoClientRegistry(_quiet_logger())
+    try:
+        first = MongoDBConnection(_quiet_logger(), connection_string=MONGODB_TEST_URI, registry=registry)
+        second = MongoDBConnection(_quiet_logger(), connection_string=MONGODB_TEST_URI, registry=registry)
+        other_pool = MongoDBConnection(_quiet_logger(), connection_string=MONGODB_TEST_URI, max_pool_size=5, registry=registry)
+        client = first.get_client()
+        assert second.get_client() is client
+        assert other_pool.get_client() is not client
+        assert registry.references(client) == 2
+
+        # Released clients stay open for the next borrower until closed as idle
+        first.close()
+        second.close()
+        assert registry.references(client) == 0
+        third = MongoDBConnection(_quiet_logger(), connection_string=MONGODB_TEST_URI, registry=registry)
+        assert third.get_client() is client
+        third.close()
+        assert registry.close_idle() == 1
+        assert registry.references(other_pool.get_client()) == 1
+
+        # MongoDBPull instances share the process-wide registry by default
+        pulls = [MongoDBPull(_quiet_logger(), connection_string=MONGODB_TEST_URI) for _ in range(3)]
+        assert len({id(pull.connection.get_client()) for pull in pulls}) == 1
+        for pull in pulls:
+            pull.close()
+    finally:
+        registry.close_all()
+
+    print("✓ Connections share one registry client per URI and pool settings")
+    return True
+
+
+def test_campaign_prefilter_matches_full_qualification():
+    """Test that campaign pre-filters fetch fewer documents without losing qualifiers"""
+    from utils.mongodb_pull import MongoDBPull, CAMPAIGNS, build_qualification_filter
+
+    users, events, orders = make_sample_data()
+    del users[0]['createdAt']  # a missing date counts as 0 days since registration
+    connection = _InMemoryConnection(users, events, orders)
+    pull = MongoDBPull(_quiet_logger())
+    pull.connection = connection
+    all_users = pull.users_pull(generate_report=False, save_data=False)
+    all_events = pull.events_pull(generate_report=False, save_data=False)
+
+    assert build_qualification_filter('user', 'fill_the_table') is None
+    for campaign in CAMPAIGNS:
+        flag = f'qualifies_{campaign}'
+        connection.returned.clear()
+        qualified_users = pull.users_pull(generate_report=False, save_data=False, campaign=campaign)
+        assert qualified_users == [u for u in all_users if u['campaign_qualifications'][flag]], campaign
+        fetched_users = dict(connection.returned)['user']
+
+        connection.returned.clear()
+        qualified_events = pull.events_pull(generate_report=False, save_data=False, campaign=campaign)
+        assert qualified_events == [e for e in all_events if e['campaign_qualifications'][flag]], campaign
+        assert dict(connection.returned)['event'] < len(events)
+
+    assert fetched_users == len(users)  # return_to_table has no raw-field user conditions
+    connection.returned.clear()
+    pull.users_pull(generate_report=False, save_data=False, campaign='seat_newcomers')
+    assert dict(connection.returned)['user'] < len(users)
+    print("✓ Campaign pre-filters fetched fewer documents with identical qualifiers")
+    return True
+
+
+def test_async_users_events_pull_matches_sync():
+    """Test that the async pull equals the blocking pull and leaves the event loop free"""
+    from utils.mongodb_pull import MongoDBPull
+    from utils.mongodb_pull.async_mongodb_pull import AsyncMongoDBPull
+
+    users, events, orders = make_sample_data()
+    connection = _InMemoryConnection(users, events, orders)
+    pull = MongoDBPull(_quiet_logger())
+    pull.connection = connection
+    expected = pull.users_events_pull(generate_report=False, save_data=False)
+
+    async def run(async_pull):
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        try:
+            return await async_pull.users_events_pull(generate_report=False, save_data=False), ticks
+        finally:
+            done.set()
+            await ticking
+            await async_pull.close()
+
+    async_pull = AsyncMongoDBPull(_quiet_logger())
+    async_pull.connection = _AsyncInMemoryConnection(connection)
+    connection.latency = 0.2
+    result, ticks = asyncio.run(run(async_pull))
+    assert result == expected
+    assert ticks > 10, ticks
+
+    client = _local_mongod()
+    if client is None:
+        print(f"✓ Async users_events_pull matches sync output (mongod run skipped, none at {MONGODB_TEST_URI})")
+        return True
+
+    database = f"mongodb_pull_test_{ObjectId()}"
+    sync_pull = MongoDBPull(_quiet_logger(), connection_string=MONGODB_TEST_URI, database=database)
+    try:
+        client[database]['user'].insert_many(users)
+        client[database]['event'].insert_many(events)
+        client[database]['order'].insert_many(orders)
+        expected = sync_pull.users_events_pull(generate_report=False, save_data=False)
+        result, _ = asyncio.run(run(AsyncMongoDBPull(_quiet_logger(), connection_string=MONGODB_TEST_URI, database=database)))
+        assert result == expected
+    finally:
+        sync_pull.close()
+        client.drop_database(database)
+        client.close()
+
+    print(f"✓ Async users_events_pull matches sync output against {MONGODB_TEST_URI}")
+    return True
+
+
+def test_index_advisor_reports_collscans():
+    """Test that the index advisor finds COLLSCANs and that created indexes remove them"""
+    from utils.mongodb_pull import MongoDBConnection
+    from utils.mongodb_pull.index_advisor import ACCESS_PATHS, IndexAdvisor, format_report, plan_stages
+
+    explain = {'queryPlanner': {
+        'winningPlan': {'queryPlan': {'stage': 'PROJECTION_SIMPLE', 'inputStage': {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN', 'indexName': 'type_1_startDate_1'}}}},
+        'rejectedPlans': [{'stage': 'COLLSCAN'}],
+    }}
+    assert plan_stages(explain) == ['PROJECTION_SIMPLE', 'FETCH', 'IXSCAN']
+    samples = {'now': datetime.now(timezone.utc), 'user_id': ObjectId(), 'user_createdAt': '2025-01-01T00:00:00.000Z', 'order_createdAt': None}
+    for path in ACCESS_PATHS:
+        assert path['filter'](samples), path['name']
+    delta_paths = {(path['collection'], path['index'][0][0]) for path in ACCESS_PATHS if 'delta pull' in path['name']}
+    assert delta_paths == {(c, f) for c in ('user', 'event', 'order') for f in ('updatedAt', 'createdAt')}
+    assert isinstance(next(p for p in ACCESS_PATHS if p['name'] == 'user delta pull (createdAt)')['filter'](samples)['createdAt']['$gte'], str)
+
+    client = _local_mongod()
+    if client is None:
+        print(f"✓ Index advisor parses plans (mongod run skipped, none at {MONGODB_TEST_URI})")
+        return True
+
+    database = f"mongodb_pull_test_{ObjectId()}"
+    users, events, orders = make_sample_data()
+    connection = MongoDBConnection(_quiet_logger(), connection_string=MONGODB_TEST_URI, database=database)
+    try:
+        client[database]['user'].insert_many(users)
+        client[database]['event'].insert_many(events)
+        client[database]['order'].insert_many(orders)
+        advisor = IndexAdvisor(connection, _quiet_logger())
+        rows = advisor.advise()
+        assert all(row['before']['collscan'] for row in rows)
+        rows = advisor.advise(create=True)
+        assert all(row['after'] is None or not row['after']['collscan'] for row in rows)
+        assert not any(row['before']['collscan'] for row in advisor.advise())
+        assert 'COLLSCAN' in format_report(rows)
+    finally:
+        connection.close()
+        client.drop_database(database)
+        client.close()
+
+    print(f"✓ Index advisor reported COLLSCANs and indexed all {len(ACCESS_PATHS)} access paths")
+    return True
+
+
+def test_snapshot_store_round_trips_json():
+    """Test that Arrow snapshots read back equal to the JSON form of the records"""
+    import json
+    from utils.mongodb_pull import MongoDBPull
+    from utils.mongodb_pull.snapshot_store import SnapshotStore, load_records, snapshot_fields, pa
+
+    users, events, orders = make_sample_data()
+    users[1]['interests'] = None          # explicit null next to missing and list values
+    users[2]['score'] = 3                 # int in an otherwise missing column
+    users[3]['score'] = 2.5               # mixed int/float column
+    users[4]['createdAt'] = datetime.now(timezone.utc)  # datetime among ISO strings
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        json_path = os.path.join(data_dir, 'users.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(users, f, default=str)
+        subset = [{k: u[k] for k in ('email', 'interests') if k in u} for u in json.loads(json.dumps(users, default=str))]
+        assert snapshot_fields(json_path) is None
+        assert load_records(json_path, columns=['email', 'interests']) == subset
+        if pa is None:
+            assert load_records(json_path) == json.loads(json.dumps(users, default=str))
+            print("- Skipped snapshot store test (pyarrow not installed); JSON fallback works")
+            return True
+
+        store = SnapshotStore(data_dir, _quiet_logger())
+        store.write('users', users, default=str)
+        expected = json.loads(json.dumps(users, default=str))
+        assert store.read('users') == expected
+        assert load_records(json_path) == expected
+        assert load_records(json_path, columns=['email', 'interests', 'unknown']) == subset
+        assert set(snapshot_fields(json_path)) == {k for u in expected for k in u}
+        assert store.read('users', columns=['_id', 'interests']) == [{k: u[k] for k in ('_id', 'interests') if k in u} for u in expected]
+        assert store.manifest()['datasets']['users']['rows'] == len(users)
+
+        # Enriched pull output, compared with the JSON MongoDBPull saves (ObjectId -> str, datetime -> ISO)
+        pull = MongoDBPull(_quiet_logger())
+        pull.connection = _InMemoryConnection(*make_sample_data())
+        enriched = pull.events_pull(generate_report=False, save_data=False)
+        store.write('events', enriched)
+        as_json = json.dumps(enriched, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+        assert store.read('events') == json.loads(as_json)
+
+    print(f"✓ Arrow snapshots round-trip to the JSON form ({len(users)} users, {len(enriched)} enriched events)")
+    return True
+
+
+def test_lazy_documents_match_decoded_documents():
+    """Test that LazyDocuments decode only what is read and enrich like plain dicts"""
+    import bson
+    from utils.mongodb_pull import MongoDBPull, LazyDocument, materialize
+
+    users, events, orders = make_sample_data()
+    events[0]['venue'] = {'name': 'Venue D', 'geo': {'coordinates': [1.5, 2.5]}}
+    events[0]['capacity'] = 2 ** 40
+    events[0]['checkedIn'] = True
+
+    document = LazyDocument(bson.encode(events[0]))
+    assert document['participants'] == events[0]['participants']
+    assert set(document._values) == {'participants'}
+    assert 'venue' in document and 'missing' not in document and document.get('missing') is None
+    assert len(document) == len(events[0])
+    document['summary'] = 'Dinner'
+    del document['internalNotes']
+    expected = {k: v for k, v in events[0].items() if k != 'internalNotes'}
+    expected['summary'] = 'Dinner'
+    assert document.to_dict() == expected and list(document) == list(expected)
+    assert materialize(document) is document.to_dict()
+
+    def lazy(documents):
+        return [LazyDocument(bson.encode(doc)) for doc in documents]
+
+    pull = MongoDBPull(_quiet_logger())
+    expected_users = pull.users_pull(users=copy.deepcopy(users), events=copy.deepcopy(events), orders=copy.deepcopy(orders), generate_report=False, save_data=False)
+    lazy_users = pull.users_pull(users=copy.deepcopy(users), events=lazy(events), orders=lazy(orders), generate_report=False, save_data=False)
+    assert lazy_users == expected_users
+    assert all(type(event) is dict for user in lazy_users for event in user['event_history'])
+    expected_events = pull.events_pull(users=users, events=copy.deepcopy(events), generate_report=False, save_data=False)
+    lazy_events = pull.events_pull(users=users, events=lazy(events), generate_report=False, save_data=False)
+    assert lazy_events == expected_events and all(type(event) is dict for event in lazy_events)
+
+    client = _local_mongod()
+    if client is None:
+        print(f"✓ LazyDocuments enrich like decoded documents (mongod read skipped, none at {MONGODB_TEST_URI})")
+        return True
+
+    database = f"mongodb_pull_test_{ObjectId()}"
+    pull = MongoDBPull(_quiet_logger(), connection_string=MONGODB_TEST_URI, database=database, lazy_decode=True)
+    try:
+        client[database]['event'].insert_many(copy.deepcopy(events))
+        client[database]['order'].insert_many(copy.deepcopy(orders))
+        decoded = list(client[database]['event'].find())
+        lazy_events = pull.connection.get_events()
+        assert all(isinstance(event, LazyDocument) for event in lazy_events)
+        assert [event.to_dict() for event in lazy_events] == decoded
+        assert [order.to_dict() for order in pull.connection.iter_orders(batch_size=50)] == list(client[database]['order'].find())
+        assert all(type(event) is dict for event in pull.connection.read_collection('event', lazy=False))
+    finally:
+        pull.close()
+        client.drop_database(database)
+        client.close()
+
+    print(f"✓ LazyDocuments match decoded documents ({len(events)} events, {len(orders)} orders read lazily)")
+    return True
+
+
+def test_scoped_fetch_reads_only_selected_users_data():
+    """Test that scoped pulls fetch only the selected users' events and orders"""
+    from utils.mongodb_pull import MongoDBPull, build_scope_filters
+
+    users, events, orders = make_sample_data()
+    user_ids = [user['_id'] for user in users[:20]]
+    filters = build_scope_filters('event', user_ids, chunk_size=8)
+    assert len(filters) == 3
+    keys = filters[0]['$or'][0]['participants']['$in']
+    assert user_ids[0] in keys and str(user_ids[0]) in keys and len(keys) == 16
+    assert build_scope_filters('order', [str(user_ids[0])]) == [{'userId': {'$in': [str(user_ids[0]), user_ids[0]]}}]
+    assert build_scope_filters('order', []) == []
+
+    connection = _InMemoryConnection(users, events, orders)
+    pull = MongoDBPull(_quiet_logger())
+    pull.connection = connection
+    expected = pull.users_pull(limit=20, generate_report=False, save_data=False)
+    connection.returned.clear()
+    scoped = pull.users_pull(limit=20, scoped=True, generate_report=False, save_data=False)
+    fetched = dict(connection.returned)
+    assert scoped == expected
+    assert fetched['event'] < len(events) and fetched['order'] < len(orders)
+
+    expected_users, expected_events = pull.users_events_pull(users_limit=20, generate_report=False, save_data=False)
+    connection.returned.clear()
+    scoped_users, scoped_events = pull.users_events_pull(users_limit=20, scoped=True, generate_report=False, save_data=False)
+    assert scoped_users == expected_users and scoped_events == expected_events
+    assert dict(connection.returned)['order'] == fetched['order']
+
+    print(f"✓ Scoped pull of 20 users fetched {fetched['event']}/{len(events)} events and {fetched['order']}/{len(orders)} orders with unchanged output")
+    return True
+
+
+def test_report_stats_match_across_report_paths():
+    """Test that streamed and server-side reports match the in-memory report"""
+    import math
+    from utils.mongodb_pull import MongoDBPull, MongoDBConnection, report_stats, user_report_row, event_report_row
+
+    def body(path):
+        with open(path) as f:
+            return [line for line in f if not line.startswith('**Generated')]
+
+    users, events, orders = make_sample_data()
+    pull = MongoDBPull(_quiet_logger())
+    pull.connection = _InMemoryConnection(users, events, orders)
+    with tempfile.TemporaryDirectory() as reports_dir:
+        pull.report_generation.reports_dir = reports_dir
+        enriched_users = pull.users_pull(generate_report=False, save_data=False)
+        enriched_events = pull.events_pull(generate_report=False, save_data=False)
+        expected = body(pull.report_generation.generate_users_report(enriched_users))
+        for _ in pull.users_pull_iter(batch_size=64, generate_report=True):
+            pass
+        streamed = sorted(os.listdir(reports_dir))[-1]
+        assert body(os.path.join(reports_dir, streamed)) == expected, "Streamed users report differs"
+
+    user_rows = [user_report_row(user) for user in enriched_users]
+    event_rows = [event_report_row(event) for event in enriched_events]
+    client = _local_mongod()
+    if client is None:
+        print(f"✓ Streamed users report matches users_pull report (server-side part skipped, no mongod at {MONGODB_TEST_URI})")
+        return True
+
+    database = f"mongodb_pull_test_{ObjectId()}"
+    connection = MongoDBConnection(_quiet_logger(), connection_string=MONGODB_TEST_URI, database=database)
+    try:
+        for kind, rows in (('users', user_rows), ('events', event_rows)):
+            connection.write_report_rows(kind, rows[:50])
+            connection.write_report_rows(kind, rows[50:], append=True)
+            connection.publish_report_rows(kind)
+            expected, server = report_stats(kind, rows), connection.aggregate_report(kind)
+            assert server['count'] == expected['count'] and server['distributions'] == expected['distributions']
+            assert all(math.isclose(server['sums'][field], value) for field, value in expected['sums'].items())
+    finally:
+        connection.close()
+        client.drop_database(database)
+        client.close()
+
+    print("✓ Streamed and $facet reports match the in-memory reports")
+    return True
+
+
+def test_materialized_enrichment_writes_only_changes():
+    """Test that write-back hashes derived fields and rewrites only changed documents"""
+    from utils.mongodb_pull import MongoDBPull, EnrichmentMaterializer, enrichment_document
+
+    users, events, orders = make_sample_data()
+    pull = MongoDBPull(_quiet_logger())
+    pull.connection = _InMemoryConnection(users, events, orders)
+    enriched_users = pull.users_pull(generate_report=False, save_data=False)
+    enriched_events = pull.events_pull(generate_report=False, save_data=False)
+
+    user = copy.deepcopy(enriched_users[0])
+    document = enrichment_document('users', user)
+    assert document['_id'] == user['_id'] and document['journey_stage'] == user['journey_stage']
+    assert 'days_inactive' not in document and 'email' not in document
+    user['days_inactive'] += 1
+    assert enrichment_document('users', user)['enrichment_hash'] == document['enrichment_hash']
+    user['campaign_qualifications']['qualifies_fill_the_table'] = not user['campaign_qualifications']['qualifies_fill_the_table']
+    assert enrichment_document('users', user)['enrichment_hash'] != document['enrichment_hash']
+
+    client = _local_mongod()
+    if client is None:
+        print(f"✓ Enrichment documents hash only derived fields (write-back skipped, no mongod at {MONGODB_TEST_URI})")
+        return True
+
+    database = f"mongodb_pull_test_{ObjectId()}"
+    pull = MongoDBPull(_quiet_logger(), connection_string=MONGODB_TEST_URI, database=database)
+    materializer = EnrichmentMaterializer(pull.connection, _quiet_logger(), batch_size=64)
+    try:
+        first = materializer.write('users', enriched_users)
+        assert first['written'] == len(enriched_users)
+        assert materializer.write('users', enriched_users)['written'] == 0, "Unchanged users were rewritten"
+        changed = copy.deepcopy(enriched_users)
+        changed[3]['journey_stage'] = 'Returned' if changed[3]['journey_stage'] != 'Returned' else 'Attended'
+        assert materializer.write('users', changed)['written'] == 1
+        stored = client[database]['user_enriched'].find_one({'_id': changed[3]['_id']})
+        assert stored['journey_stage'] == changed[3]['journey_stage']
+        assert materializer.write('events', enriched_events)['written'] == len(enriched_events)
+        assert 'journey_stage_1' in client[database]['user_enriched'].index_information()
+    finally:
+        pull.close()
+        client.drop_database(database)
+        client.close()
+
+    print(f"✓ Write-back materialized {first['total']} users at {first['docs_per_sec']:,} docs/sec and rewrote only changes")
+    return True
+
+
+class _InMemoryCollection:
+    """Serves the collection calls EnrichmentMaterializer makes from a dict keyed by _id"""
+
+    def __init__(self, name):
+        self.name = name
+        self.documents = {}
+
+    def create_indexes(self, models):
+        return []
+
+    def find(self, filter, projection=None):
+        return [{'_id': _id, 'enrichment_hash': self.documents[_id].get('enrichment_hash')} for _id in filter['_id']['$in'] if _id in self.documents]
+
+    def bulk_write(self, operations, ordered=True):
+        from types import SimpleNamespace
+        upserted = modified = 0
+        for operation in operations:
+            _id = operation._filter['_id']
+            if _id in self.documents:
+                modified += 1
+            else:
+                upserted += 1
+            self.documents.setdefault(_id, {}).update(operation._doc['$set'])
+        return SimpleNamespace(upserted_count=upserted, modified_count=modified)
+
+
+def test_materialized_enrichment_skips_day_rollover():
+    """Test that a rerun one day later rewrites no materialized documents"""
+    from types import SimpleNamespace
+    from utils.mongodb_pull import MongoDBPull, EnrichmentMaterializer, USER_TIME_LABELS
+    from utils.mongodb_pull import mongodb_pull as mongodb_pull_module
+
+    class NextDay(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(days=1)
+
+    users, events, orders = make_sample_data()
+    pull = MongoDBPull(_quiet_logger())
+    pull.connection = _InMemoryConnection(users, events, orders)
+    collections = {'user_enriched': _InMemoryCollection('user_enriched'), 'event_enriched': _InMemoryCollection('event_enriched')}
+    materializer = EnrichmentMaterializer(SimpleNamespace(get_database=lambda: collections), _quiet_logger(), batch_size=64)
+
+    today_users = pull.users_pull(generate_report=False, save_data=False)
+    today_events = pull.events_pull(generate_report=False, save_data=False)
+    assert materializer.write('users', today_users)['written'] == len(users)
+    assert materializer.write('events', today_events)['written'] == len(events)
+
+    mongodb_pull_module.datetime = NextDay
+    try:
+        tomorrow_users = pull.users_pull(generate_report=False, save_data=False)
+        tomorrow_events = pull.events_pull(generate_report=False, save_data=False)
+    finally:
+        mongodb_pull_module.datetime = datetime
+    assert any(a['days_inactive'] != b['days_inactive'] for a, b in zip(today_users, tomorrow_users))
+
+    # Only users whose time-based labels cross a threshold overnight (e.g. 180 days
+    # inactive: Dormant -> Inactive) really change; every other document is left alone
+    def labels(user):
+        flags = {key: value for key, value in user['campaign_qualifications'].items() if key.startswith('qualifies_')}
+        return [user[label] for label in USER_TIME_LABELS] + [user['is_active'], flags]
+    crossed = sum(labels(a) != labels(b) for a, b in zip(today_users, tomorrow_users))
+    assert crossed < len(users) // 20
+    users_stats = materializer.write('users', tomorrow_users)
+    events_stats = materializer.write('events', tomorrow_events)
+    assert users_stats['written'] == crossed, f"{users_stats['written']} users rewritten after a day, {crossed} crossed a threshold"
+    assert events_stats['written'] == 0, f"{events_stats['written']} events rewritten after a day"
+    assert materializer.write('users', tomorrow_users)['written'] == 0
+    stored = collections['user_enriched'].documents[users[0]['_id']]
+    assert set(stored['campaign_qualifications']) == {'qualifies_seat_newcomers', 'qualifies_fill_the_table', 'qualifies_return_to_table'}
+    print(f"✓ Rerun one day later rewrote {crossed} of {users_stats['total']} users (threshold crossings) and 0 of {events_stats['total']} events")
+    return True
+
+
+def test_data_sources_match_connection_reads():
+    """Test that pulls from MemorySource and SnapshotSource match the connection double"""
+    from utils.mongodb_pull import MongoDBPull, MemorySource, SnapshotSource, save_snapshot, match_filter
+    from utils.mongodb_pull.snapshot_store import SnapshotStore, pa
+
+    users, events, orders = make_sample_data()
+    assert match_filter({'a': [1, 2], 'b': None}, {'a': 2, 'b': None, 'c': None})
+    assert not match_filter({'a': '2025-01-01'}, {'a': {'$gt': 5}})
+    assert match_filter({'p': {'q': 3}}, {'$or': [{'p.q': {'$in': [3]}}, {'x': 1}]})
+
+    reference = MongoDBPull(_quiet_logger())
+    reference.connection = _InMemoryConnection(users, events, orders)
+    fixture = {'user': users, 'event': events, 'order': orders}
+    before = copy.deepcopy(fixture)
+    memory = MongoDBPull(_quiet_logger(), source=MemorySource(fixture, _quiet_logger()))
+    for kwargs in ({}, {'campaign': 'seat_newcomers'}, {'limit': 30, 'scoped': True}):
+        assert memory.users_pull(generate_report=False, save_data=False, **kwargs) == reference.users_pull(generate_report=False, save_data=False, **kwargs), f"MemorySource users differ for {kwargs}"
+    assert memory.events_pull(generate_report=False, save_data=False, campaign='fill_the_table') == reference.events_pull(generate_report=False, save_data=False, campaign='fill_the_table')
+    assert fixture == before, "Pulls modified the fixture documents"
+    if pa is None:
+        print("- Skipped SnapshotSource test (pyarrow not installed); MemorySource pulls match")
+        return True
+
+    events[0]['checkedInAt'] = datetime(2026, 1, 2, 3, 4, 5, 678000)  # BSON date as pymongo returns it
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        counts = save_snapshot(MemorySource(fixture, _quiet_logger()), snapshot_dir)
+        assert counts == {'user': len(users), 'event': len(events), 'order': len(orders)}
+        assert SnapshotStore(snapshot_dir, _quiet_logger()).names() == ['event', 'order', 'user']
+        assert SnapshotSource(snapshot_dir, _quiet_logger()).read_collection('event') == events, "BSON types did not round-trip"
+        offline = MongoDBPull(_quiet_logger(), source=SnapshotSource(snapshot_dir, _quiet_logger()))
+        snapshot_users, snapshot_events = offline.users_events_pull(generate_report=False, save_data=False)
+        memory_users, memory_events = memory.users_events_pull(generate_report=False, save_data=False)
+        assert snapshot_users == memory_users and snapshot_events == memory_events, "SnapshotSource pull differs"
+        try:
+            SnapshotSource(snapshot_dir, _quiet_logger()).read_collection('message')
+            assert False, "Missing snapshot file was not reported"
+        except FileNotFoundError:
+            pass
+
+    print(f"✓ MemorySource and SnapshotSource pulls match ({len(users)} users, {len(events)} events)")
+    return True
+
+
+def test_parse_iso_date_parses_each_string_once():
+    """Test that parse_iso_date memoizes strings without changing results"""
+    from utils.mongodb_pull import MongoDBPull, MemorySource, parse_iso_date, date_cache_info, clear_date_cache
+
+    clear_date_cache()
+    assert parse_iso_date('2024-03-01T10:00:00.000Z') == datetime(2024, 3, 1, 10, tzinfo=timezone.utc)
+    assert parse_iso_date('2024-03-01T10:00:00.000Z') is parse_iso_date('2024-03-01T10:00:00.000Z')
+    assert parse_iso_date('not a date') is None and parse_iso_date('not a date') is None
+    assert parse_iso_date(None) is None and parse_iso_date(datetime(2024, 1, 1)) == datetime(2024, 1, 1)
+    assert date_cache_info() == {'parsed': 2, 'cached': 2}
+
+    users, events, orders = make_sample_data()
+    dates = {doc[field] for docs in (users, events, orders) for doc in docs for field in ('createdAt', 'startDate') if isinstance(doc.get(field), str)}
+    clear_date_cache()
+    pull = MongoDBPull(_quiet_logger(), source=MemorySource({'user': users, 'event': events, 'order': orders}))
+    pull.users_events_pull(generate_report=False, save_data=False)
+    parsed = date_cache_info()['parsed']
+    assert 0 < parsed <= len(dates) + len(users), f"{parsed} parses for {len(dates)} distinct date strings"
+
+    print(f"✓ users_events_pull parsed {parsed} distinct date strings once each")
+    return True
+
+
+def test_sharded_users_pull_matches_serial():
+    """Test that workers=N enrichment in forked processes equals the serial output"""
+    import json
+    import multiprocessing
+    from utils.mongodb_pull import MongoDBPull, MemorySource
+
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        print("- Skipped sharded enrichment test (no 'fork' start method)")
+        return True
+
+    users, events, orders = make_sample_data()
+    pull = MongoDBPull(_quiet_logger(), source=MemorySource({'user': users, 'event': events, 'order': orders}))
+    serial = pull.users_pull(generate_report=False, save_data=False)
+    sharded = pull.users_pull(generate_report=False, save_data=False, workers=3)
+    assert json.dumps(sharded, default=str) == json.dumps(serial, default=str), "Sharded output differs from serial"
+    serial_pair = pull.users_events_pull(generate_report=False, save_data=False)
+    sharded_pair = pull.users_events_pull(generate_report=False, save_data=False, workers=2)
+    assert json.dumps(sharded_pair, default=str) == json.dumps(serial_pair, default=str)
+    one_user = dict(users=users[:1], events=events, orders=orders, generate_report=False, save_data=False)
+    assert pull.users_pull(workers=4, **one_user) == pull.users_pull(**one_user)
+
+    print(f"✓ Sharded enrichment of {len(users)} users matches the serial path byte for byte")
+    return True
+
+
+def test_incremental_enrichment_recomputes_only_dirty_users():
+    """Test that incremental runs reuse cached users and still match a full recompute"""
+    import json
+    import tempfile
+    from utils.mongodb_pull import MongoDBPull, MemorySource, USER_ENRICHED_FIELDS
+
+    users, events, orders = make_sample_data()
+    source = MemorySource({'user': users, 'event': events, 'order': orders})
+    full = MongoDBPull(_quiet_logger(), source=source).users_pull(generate_report=False, save_data=False)
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        def incremental_run():
+            pull = MongoDBPull(_quiet_logger(), source=source, snapshot_dir=snapshot_dir, incremental=True)
+            recomputed = []
+            enrich_user_profile = pull.user_enrichment.enrich_user_profile
+            def counting(user, *args, **kwargs):
+                recomputed.append(str(user['_id']))
+                return enrich_user_profile(user, *args, **kwargs)
+            pull.user_enrichment.enrich_user_profile = counting
+            return pull, pull.users_pull(generate_report=False, save_data=False), recomputed
+
+        _, first, recomputed = incremental_run()
+        assert len(recomputed) == len(users), "First run should enrich every user"
+        _, second, recomputed = incremental_run()
+        assert recomputed == [], f"Unchanged users were recomputed: {recomputed[:5]}"
+        assert json.dumps(second, default=str) == json.dumps(full, default=str), "Cached output differs from full recompute"
+
+        # An order edit dirties its user; a stale time label forces a recompute
+        changed = dict(orders[0], price={'total': 12345})
+        orders[0] = changed
+        pull, _, _ = incremental_run()
+        uid = next(u for u in pull.user_enrichment.cache if u != str(changed['userId']))
+        pull.user_enrichment.cache[uid]['fields']['engagement_status'] = 'stale'
+        pull.user_enrichment.save_cache()
+        orders[0] = dict(changed, price={'total': 54321})
+        _, third, recomputed = incremental_run()
+        assert sorted(recomputed) == sorted({str(changed['userId']), uid}), f"Unexpected recomputes: {recomputed}"
+        expected = MongoDBPull(_quiet_logger(), source=source).users_pull(generate_report=False, save_data=False)
+        assert json.dumps(third, default=str) == json.dumps(expected, default=str)
+        assert all(set(USER_ENRICHED_FIELDS) <= set(user) for user in third)
+
+    print(f"✓ Incremental enrichment reused {len(users)} cached users and recomputed only dirty ones")
+    return True
+
+
+def test_compact_records_match_dict_pulls():
+    """Test that compact=True records behave like, and convert to, the dict-mode output"""
+    import copy
+    import json
+    from utils.mongodb_pull import MongoDBPull, MemorySource, EnrichedUser, EnrichedEvent, to_plain
+
+    users, events, orders = make_sample_data()
+    def source():
+        return MemorySource({'user': copy.deepcopy(users), 'event': copy.deepcopy(events), 'order': copy.deepcopy(orders)})
+
+    expected_users, expected_events = MongoDBPull(_quiet_logger(), source=source()).users_events_pull(generate_report=False, save_data=False)
+    pull = MongoDBPull(_quiet_logger(), source=source(), compact=True)
+    compact_users, compact_events = pull.users_events_pull(generate_report=False, save_data=False)
+    assert all(isinstance(user, EnrichedUser) for user in compact_users)
+    assert all(isinstance(event, EnrichedEvent) for event in compact_events)
+    assert json.dumps(to_plain(compact_users), default=str) == json.dumps(expected_users, default=str)
+    assert json.dumps(to_plain(compact_events), default=str) == json.dumps(expected_events, default=str)
+
+    # Dict behaviour: equality, key order, membership, writes and deletes stay off the raw document
+    user = compact_users[0]
+    assert user == expected_users[0] and list(user) == list(expected_users[0])
+    assert len(user) == len(expected_users[0]) and 'event_history' in user and user.get('missing') is None
+    raw_name = user['firstName']
+    user['firstName'] = 'Changed'
+    user['note'] = 'added'
+    del user['cohort']
+    assert user['firstName'] == 'Changed' and user['note'] == 'added' and 'cohort' not in user
+    assert user._raw['firstName'] == raw_name, "Writes must not modify the raw document"
+
+    # Histories are event IDs resolved against the one shared table (enriched events)
+    assert all(isinstance(event_id, str) for event_id in user.event_history)
+    history = [event for u in compact_users for event in u['event_history']]
+    assert all(isinstance(event, EnrichedEvent) for event in history)
+    assert len({id(event) for event in history}) <= len(pull.event_table)
+
+    print(f"✓ Compact records match dict pulls ({len(compact_users)} users, {len(compact_events)} events)")
+    return True
+
+
+def test_lazy_fields_compute_on_first_read():
+    """Test that lazy=True defers step-3 fields to first read and still matches users_pull"""
+    import copy
+    import json
+    from utils.mongodb_pull import MongoDBPull, MemorySource, to_plain
+
+    users, events, orders = make_sample_data()
+    def source():
+        return MemorySource({'user': copy.deepcopy(users), 'event': copy.deepcopy(events), 'order': copy.deepcopy(orders)})
+
+    expected = MongoDBPull(_quiet_logger(), source=source()).users_pull(generate_report=False, save_data=False)
+    pull = MongoDBPull(_quiet_logger(), source=source())
+    calls = []
+    generate_user_summary = pull.summary_generation.generate_user_summary
+    pull.summary_generation.generate_user_summary = lambda user: calls.append(user['id']) or generate_user_summary(user)
+    lazy_users = pull.users_pull(generate_report=False, save_data=False, lazy=True)
+
+    # Qualification-only reads skip summaries and the co-attendance graph entirely
+    qualified = [user for user in lazy_users if user['campaign_qualifications']['qualifies_fill_the_table']]
+    assert calls == [] and pull.co_attendance_graph is None
+    top = sorted(qualified, key=lambda user: user['event_count'], reverse=True)[:5]
+    summaries = [user['summary'] for user in top] + [user['summary'] for user in top]
+    assert len(calls) == len(top), "Summaries should be computed once per user on first read"
+    expected_summaries = {user['id']: user['summary'] for user in expected}
+    assert summaries[:len(top)] == [expected_summaries[user['id']] for user in top]
+    assert json.dumps(to_plain(lazy_users), default=str) == json.dumps(expected, default=str)
+
+    # prefetch computes the named fields for everyone up front
+    pull = MongoDBPull(_quiet_logger(), source=source())
+    prefetched = pull.users_pull(generate_report=False, save_data=False, prefetch=['social_connections'])
+    assert pull.co_attendance_graph is not None
+    assert json.dumps(to_plain(prefetched), default=str) == json.dumps(expected, default=str)
+
+    print(f"✓ Lazy fields computed on first read for {len(top)} of {len(lazy_users)} users and match users_pull")
+    return True
+
+
+def test_field_selective_enrichment_runs_only_needed_stages():
+    """Test that derived= runs only the stages the requested fields need and matches a full pull"""
+    import copy
+    import json
+    from utils.mongodb_pull import MongoDBPull, MemorySource, USER_STAGES, plan_enrichment_stages
+
+    users, events, orders = make_sample_data()
+    def source():
+        return MemorySource({'user': copy.deepcopy(users), 'event': copy.deepcopy(events), 'order': copy.deepcopy(orders)})
+
+    full_pull = MongoDBPull(_quiet_logger(), source=source())
+    expected_users = full_pull.users_pull(generate_report=False, save_data=False)
+    expected_events = full_pull.events_pull(generate_report=False, save_data=False)
+
+    # Dependencies are resolved transitively and grouped into independent levels
+    assert plan_enrichment_stages('users', ['reactivation_score']) == [['stats', 'completeness'], ['reactivation_score']]
+    assert plan_enrichment_stages('events', ['summary']) == [['participants'], ['summary']]
+    try:
+        plan_enrichment_stages('users', ['no_such_field'])
+        assert False, "Unknown derived fields should raise"
+    except ValueError:
+        pass
+
+    pull = MongoDBPull(_quiet_logger(), source=source())
+    selected = pull.users_pull(generate_report=False, save_data=False, derived=['reactivation_score'])
+    ran = [entry['stage'] for entry in pull.stage_report if entry['status'] == 'ran']
+    skipped = {entry['stage'] for entry in pull.stage_report if entry['status'] == 'skipped'}
+    assert ran == ['stats', 'completeness', 'reactivation_score']
+    assert skipped == set(USER_STAGES) - set(ran) and pull.co_attendance_graph is None
+    for user, expected in zip(selected, expected_users):
+        assert 'summary' not in user and 'journey_stage' not in user
+        assert {key: value for key, value in expected.items() if key in user} == user
+
+    # All fields, with independent stages in threads, equal the full pull
+    pull = MongoDBPull(_quiet_logger(), source=source())
+    every_field = [field for spec in USER_STAGES.values() for field in spec['fields']]
+    all_users = pull.users_pull(generate_report=False, save_data=False, derived=every_field, stage_workers=4)
+    assert json.dumps(all_users, default=str) == json.dumps(expected_users, default=str)
+
+    pull = MongoDBPull(_quiet_logger(), source=source())
+    selected_events = pull.events_pull(generate_report=False, save_data=False, derived=['participationPercentage'])
+    assert [entry['status'] for entry in pull.stage_report] == ['ran', 'skipped', 'skipped']
+    for event, expected in zip(selected_events, expected_events):
+        assert 'summary' not in event and event['participationPercentage'] == expected['participationPercentage']
+    all_events = MongoDBPull(_quiet_logger(), source=source()).events_pull(generate_report=False, save_data=False, derived=['summary', 'campaign_qualifications'], stage_workers=2)
+    assert json.dumps(all_events, default=str) == json.dumps(expected_events, default=str)
+
+    print(f"✓ Field-selective enrichment ran {len(ran)} of {len(USER_STAGES)} user stages and matches full pulls")
+    return True
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing MongoDB Pull Utilities")
+    print("=" * 60)
+
+    all_passed = True
+
+    # Run tests
+    all_passed &= test_module_imports()
+    all_passed &= test_columnar_enrichment_matches_row_wise()
+    all_passed &= test_users_pull_iter_matches_users_pull()
+    all_passed &= test_projection_preserves_enrichment()
+    all_passed &= test_projection_covers_airtable_sync_fields()
+    all_passed &= test_server_side_aggregation_matches_client_side()
+    all_passed &= test_server_side_pipelines_follow_python_values()
+    all_passed &= test_delta_snapshot_pulls_only_changes()
+    all_passed &= test_users_events_pull_fetches_concurrently()
+    all_passed &= test_partitioned_reads_match_single_cursor()
+    all_passed &= test_partitioned_iteration_prefetches_one_partition()
+    all_passed &= test_connections_share_registry_client()
+    all_passed &= test_campaign_prefilter_matches_full_qualification()
+    all_passed &= test_async_users_events_pull_matches_sync()
+    all_passed &= test_index_advisor_reports_collscans()
+    all_passed &= test_snapshot_store_round_trips_json()
+    all_passed &= test_lazy_documents_match_decoded_documents()
+    all_passed &= test_scoped_fetch_reads_only_selected_users_data()
+    all_passed &= test_report_stats_match_across_report_paths()
+    all_passed &= test_materialized_enrichment_writes_only_changes()
+    all_passed &= test_materialized_enrichment_skips_day_rollover()
+    all_passed &= test_data_sources_match_connection_reads()
+    all_passed &= test_parse_iso_date_parses_each_string_once()
+    all_passed &= test_sharded_users_pull_matches_serial()
+    all_passed &= test_incremental_enrichment_recomputes_only_dirty_users()
+    all_passed &= test_compact_records_match_dict_pulls()
+    all_passed &= test_lazy_fields_compute_on_first_read()
+    all_passed &= test_field_selective_enrichment_runs_only_needed_stages()
+
+    print("=" * 60)
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+        sys.exit(1)
+    print("=" * 60)
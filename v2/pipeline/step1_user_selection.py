@@ -11,37 +11,48 @@ relationshipStatus, tableTypePreference, workNeighborhood
 
 import json
 import logging
+import sys
 from datetime import datetime
 from pathlib import Path
 
+# Add leo-dev root directory to Python path for imports
+# This script is in pipeline/, so leo-dev root is parent directory
+_script_dir = Path(__file__).parent
+_leo_dev_root = _script_dir.parent
+if str(_leo_dev_root) not in sys.path:
+    sys.path.insert(0, str(_leo_dev_root))
 
-def load_users(filepath):
+# Import utility functions
+from utils.snapshot_io import load_raw
+
+
+def load_users(filepath, source=None):
     """
-    Load users from JSON file.
+    Load users from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to users.json file
+        source: Optional data source to read from instead of the file (see utils.snapshot_io.load_raw)
         
     Returns:
         List of user dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        users = json.load(f)
+    users = load_raw(filepath, source)
     return users
 
 
-def load_messages(filepath):
+def load_messages(filepath, source=None):
     """
-    Load messages from JSON file.
+    Load messages from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to messages.json file
+        source: Optional data source to read from instead of the file (see utils.snapshot_io.load_raw)
         
     Returns:
         List of message dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        messages = json.load(f)
+    messages = load_raw(filepath, source)
     return messages
 
 
@@ -278,9 +289,13 @@ def save_qualified_users(users, output_path):
     return output_path
 
 
-def main():
+def main(source=None):
     """
     Main function to run the user selection pipeline.
+    
+    Args:
+        source: Optional data source (any object with read_collection, e.g. the backend
+            SnapshotSource or MemorySource) to read the data/raw data sets from
     """
     # Define paths
     base_dir = Path(__file__).parent.parent
@@ -300,13 +315,13 @@ def main():
     
     # Step 1: Load users
     logger.info("STEP 1: Loading users...")
-    users = load_users(users_path)
+    users = load_users(users_path, source)
     logger.info(f"Loaded {len(users)} users from {users_path}")
     logger.info("")
     
     # Step 2: Load messages
     logger.info("STEP 2: Loading messages...")
-    messages = load_messages(messages_path)
+    messages = load_messages(messages_path, source)
     logger.info(f"Loaded {len(messages)} messages from {messages_path}")
     logger.info("")
     
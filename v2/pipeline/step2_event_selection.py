@@ -10,43 +10,37 @@ This script loads event data and filters events based on:
 
 import json
 import logging
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+# Add leo-dev root directory to Python path for imports
+# This script is in pipeline/, so leo-dev root is parent directory
+_script_dir = Path(__file__).parent
+_leo_dev_root = _script_dir.parent
+if str(_leo_dev_root) not in sys.path:
+    sys.path.insert(0, str(_leo_dev_root))
 
-def load_events(filepath):
+# Import utility functions
+from utils.snapshot_io import load_raw
+from utils.timestamps import parse_iso_date
+
+
+def load_events(filepath, source=None):
     """
-    Load events from JSON file.
+    Load events from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to events.json file
+        source: Optional data source to read from instead of the file (see utils.snapshot_io.load_raw)
         
     Returns:
         List of event dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        events = json.load(f)
+    events = load_raw(filepath, source)
     return events
 
 
-def parse_iso_date(date_string):
-    """
-    Parse ISO 8601 date string with 'Z' timezone to datetime object.
-    
-    Handles format: "2019-08-05T17:00:00.000Z"
-    
-    Args:
-        date_string: ISO 8601 date string with 'Z' timezone
-        
-    Returns:
-        datetime object in UTC timezone
-    """
-    # Replace 'Z' with '+00:00' for fromisoformat compatibility
-    if date_string.endswith('Z'):
-        date_string = date_string[:-1] + '+00:00'
-    return datetime.fromisoformat(date_string)
-
-
 def filter_future_events(events):
     """
     Filter events to keep only those with startDate in the future.
@@ -341,9 +335,13 @@ def log_qualified_events(logger, events):
         logger.info("")
 
 
-def main():
+def main(source=None):
     """
     Main function to run the event selection pipeline.
+    
+    Args:
+        source: Optional data source (any object with read_collection, e.g. the backend
+            SnapshotSource or MemorySource) to read the data/raw data sets from
     """
     # Define paths
     base_dir = Path(__file__).parent.parent
@@ -362,7 +360,7 @@ def main():
     
     # Step 1: Load events
     logger.info("STEP 1: Loading events...")
-    events = load_events(events_path)
+    events = load_events(events_path, source)
     logger.info(f"Loaded {len(events)} events from {events_path}")
     logger.info("")
     
@@ -85,10 +85,22 @@ qualified_events: list[dict]
 
 import json
 import logging
+import sys
 from collections import Counter
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+# Add leo-dev root directory to Python path for imports
+# This script is in pipeline/, so leo-dev root is parent directory
+_script_dir = Path(__file__).parent
+_leo_dev_root = _script_dir.parent
+if str(_leo_dev_root) not in sys.path:
+    sys.path.insert(0, str(_leo_dev_root))
+
+# Import utility functions
+from utils.snapshot_io import load_raw, load_records
+from utils.timestamps import parse_iso_date
+
 
 def setup_logging(log_dir):
     """
@@ -131,7 +143,7 @@ def setup_logging(log_dir):
 
 def load_qualified_users(filepath):
     """
-    Load qualified users from JSON file.
+    Load qualified users from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to qualified_users.json file
@@ -139,29 +151,28 @@ def load_qualified_users(filepath):
     Returns:
         List of user dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        users = json.load(f)
+    users = load_records(filepath)
     return users
 
 
-def load_all_events(filepath):
+def load_all_events(filepath, source=None):
     """
-    Load all events from JSON file.
+    Load all events from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to events.json file
+        source: Optional data source to read from instead of the file (see utils.snapshot_io.load_raw)
         
     Returns:
         List of event dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        events = json.load(f)
+    events = load_raw(filepath, source)
     return events
 
 
 def load_qualified_events(filepath):
     """
-    Load qualified events from JSON file.
+    Load qualified events from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to qualified_events.json file
@@ -169,46 +180,25 @@ def load_qualified_events(filepath):
     Returns:
         List of qualified event dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        events = json.load(f)
+    events = load_records(filepath)
     return events
 
 
-def load_all_users(filepath):
+def load_all_users(filepath, source=None):
     """
-    Load all users from JSON file for lookup purposes.
+    Load all users from JSON file (or its .arrow snapshot) for lookup purposes.
     
     Args:
         filepath: Path to users.json file
+        source: Optional data source to read from instead of the file (see utils.snapshot_io.load_raw)
         
     Returns:
         List of user dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        users = json.load(f)
+    users = load_raw(filepath, source)
     return users
 
 
-def parse_iso_date(date_string):
-    """
-    Parse ISO 8601 date string with 'Z' timezone to datetime object.
-    
-    Handles format: "2019-08-05T17:00:00.000Z"
-    
-    Args:
-        date_string: ISO 8601 date string with 'Z' timezone
-        
-    Returns:
-        datetime object in UTC timezone
-    """
-    if not date_string:
-        return None
-    # Replace 'Z' with '+00:00' for fromisoformat compatibility
-    if date_string.endswith('Z'):
-        date_string = date_string[:-1] + '+00:00'
-    return datetime.fromisoformat(date_string)
-
-
 def filter_user_fields(user):
     """
     Filter user to keep only essential fields and map field names.
@@ -908,9 +898,13 @@ def save_enriched_users(users, output_path):
     return output_path
 
 
-def main():
+def main(source=None):
     """
     Main function to run the user profile enrichment pipeline.
+    
+    Args:
+        source: Optional data source (any object with read_collection, e.g. the backend
+            SnapshotSource or MemorySource) to read the data/raw data sets from
     """
     # Define paths
     base_dir = Path(__file__).parent.parent
@@ -938,7 +932,7 @@ def main():
     
     # Step 2: Load all events
     logger.info("STEP 2: Loading all events...")
-    all_events = load_all_events(all_events_path)
+    all_events = load_all_events(all_events_path, source)
     logger.info(f"Loaded {len(all_events)} events")
     logger.info("")
     
@@ -950,7 +944,7 @@ def main():
     
     # Step 4: Load all users for lookup
     logger.info("STEP 4: Loading all users for lookup...")
-    all_users = load_all_users(all_users_path)
+    all_users = load_all_users(all_users_path, source)
     logger.info(f"Loaded {len(all_users)} users for lookup")
     logger.info("")
     
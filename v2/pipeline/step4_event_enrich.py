@@ -69,11 +69,23 @@ events: list[dict]
 
 import json
 import logging
+import sys
 import re
 from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 
+# Add leo-dev root directory to Python path for imports
+# This script is in pipeline/, so leo-dev root is parent directory
+_script_dir = Path(__file__).parent
+_leo_dev_root = _script_dir.parent
+if str(_leo_dev_root) not in sys.path:
+    sys.path.insert(0, str(_leo_dev_root))
+
+# Import utility functions
+from utils.snapshot_io import load_raw, load_records
+from utils.timestamps import parse_iso_date
+
 
 def setup_logging(log_dir):
     """
@@ -116,7 +128,7 @@ def setup_logging(log_dir):
 
 def load_qualified_events(filepath):
     """
-    Load qualified events from JSON file.
+    Load qualified events from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to qualified_events.json file
@@ -124,46 +136,25 @@ def load_qualified_events(filepath):
     Returns:
         List of event dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        events = json.load(f)
+    events = load_records(filepath)
     return events
 
 
-def load_all_users(filepath):
+def load_all_users(filepath, source=None):
     """
-    Load all users from JSON file for lookup purposes.
+    Load all users from JSON file (or its .arrow snapshot) for lookup purposes.
     
     Args:
         filepath: Path to users.json file
+        source: Optional data source to read from instead of the file (see utils.snapshot_io.load_raw)
         
     Returns:
         List of user dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        users = json.load(f)
+    users = load_raw(filepath, source)
     return users
 
 
-def parse_iso_date(date_string):
-    """
-    Parse ISO 8601 date string with 'Z' timezone to datetime object.
-    
-    Handles format: "2019-08-05T17:00:00.000Z"
-    
-    Args:
-        date_string: ISO 8601 date string with 'Z' timezone
-        
-    Returns:
-        datetime object in UTC timezone or None if invalid
-    """
-    if not date_string:
-        return None
-    # Replace 'Z' with '+00:00' for fromisoformat compatibility
-    if date_string.endswith('Z'):
-        date_string = date_string[:-1] + '+00:00'
-    return datetime.fromisoformat(date_string)
-
-
 def clean_html(html_string):
     """
     Remove HTML tags from text using regex.
@@ -668,9 +659,13 @@ def save_enriched_events(events, output_path):
     return output_path
 
 
-def main():
+def main(source=None):
     """
     Main function to run the event enrichment pipeline.
+    
+    Args:
+        source: Optional data source (any object with read_collection, e.g. the backend
+            SnapshotSource or MemorySource) to read the data/raw data sets from
     """
     # Define paths
     base_dir = Path(__file__).parent.parent
@@ -696,7 +691,7 @@ def main():
     
     # Step 2: Load all users
     logger.info("STEP 2: Loading all users...")
-    all_users = load_all_users(all_users_path)
+    all_users = load_all_users(all_users_path, source)
     logger.info(f"Loaded {len(all_users)} users")
     logger.info("")
     
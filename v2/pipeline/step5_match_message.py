@@ -51,6 +51,7 @@ if str(_leo_dev_root) not in sys.path:
 # Import utility functions
 from utils.ai_prompt import call_claude, parse_json_response
 from utils.airtable_crud import create_message_record
+from utils.snapshot_io import load_raw, load_records
 
 # ============================================================================
 # PROMPTS (Edit these to modify matching, message generation, and quality check)
@@ -218,7 +219,7 @@ def setup_logging(log_dir):
 
 def load_enriched_users(filepath):
     """
-    Load enriched users from JSON file.
+    Load enriched users from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to enriched_users.json file
@@ -226,14 +227,13 @@ def load_enriched_users(filepath):
     Returns:
         List of user dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        users = json.load(f)
+    users = load_records(filepath)
     return users
 
 
 def load_enriched_events(filepath):
     """
-    Load enriched events from JSON file.
+    Load enriched events from JSON file (or its .arrow snapshot).
     
     Args:
         filepath: Path to enriched_events.json file
@@ -241,23 +241,22 @@ def load_enriched_events(filepath):
     Returns:
         List of event dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        events = json.load(f)
+    events = load_records(filepath)
     return events
 
 
-def load_raw_users(filepath):
+def load_raw_users(filepath, source=None):
     """
     Load raw users from JSON file for phone number lookup.
     
     Args:
         filepath: Path to users.json file
+        source: Optional data source to read from instead of the file (see utils.snapshot_io.load_raw)
         
     Returns:
         List of user dictionaries
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        users = json.load(f)
+    users = load_raw(filepath, source, columns=['email', 'phone'])
     return users
 
 
@@ -615,9 +614,13 @@ def process_user(
 # MAIN FUNCTION
 # ============================================================================
 
-def main():
+def main(source=None):
     """
     Main function to run the matching and messaging pipeline.
+    
+    Args:
+        source: Optional data source (any object with read_collection, e.g. the backend
+            SnapshotSource or MemorySource) to read the data/raw data sets from
     """
     # Define paths
     base_dir = Path(__file__).parent.parent
@@ -659,7 +662,7 @@ def main():
     # Step 2.5: Load raw users for phone lookup
     logger.info("STEP 2.5: Loading raw users for phone lookup...")
     raw_users_path = base_dir / 'data' / 'raw' / 'users.json'
-    raw_users = load_raw_users(raw_users_path)
+    raw_users = load_raw_users(raw_users_path, source)
     phone_lookup = create_phone_lookup(raw_users)
     logger.info(f"Created phone lookup with {len(phone_lookup)} entries")
     logger.info("")
@@ -0,0 +1,143 @@
+"""
+Snapshot I/O Utility
+
+This module loads pipeline data files, reading the memory-mapped Arrow snapshot of a
+file when one is available instead of parsing the (much larger) JSON.
+
+PURPOSE:
+--------
+Every pipeline step loads users/events/messages with json.load(). When a .arrow file
+written by the backend snapshot store (backend/utils/mongodb_pull/snapshot_store.py)
+sits next to the .json file and is at least as new, load_records() reads that instead.
+The records are equal to json.load() of the JSON file.
+
+ARROW FORMAT:
+------------
+- One column per top-level field; a null cell means the field is absent
+- Columns listed in the schema metadata key 'leo.json_columns' hold JSON-encoded values
+- All other columns are native str/bool/int/float values
+
+Requires pyarrow (pip install pyarrow) for Arrow files; without it JSON is always used.
+
+DATA SOURCES:
+------------
+Steps that read data/raw files accept an optional data source instead: any object with
+read_collection(name), such as the backend's MongoDBConnection, SnapshotSource or
+MemorySource (backend/utils/mongodb_pull). Raw file names map to collection names
+through RAW_COLLECTIONS; records are normalized to JSON types like the raw files
+(ObjectIds as strings, dates as "2019-08-05T17:00:00.000Z" UTC strings; sources return
+BSON dates as naive UTC datetimes).
+
+FUNCTIONS:
+---------
+- load_records(): Load a .json data file (optionally only some fields), preferring an
+  up-to-date .arrow snapshot
+- load_raw(): Load a data/raw data set from a data source, or from its file
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+JSON_COLUMNS_KEY = b'leo.json_columns'
+
+# data/raw file name -> collection name in a data source
+RAW_COLLECTIONS = {'users': 'user', 'events': 'event', 'messages': 'messages'}
+
+
+def _read_arrow(filepath, columns=None):
+    """
+    Read records from an Arrow snapshot file (memory-mapped).
+
+    Args:
+        filepath: Path to .arrow file
+        columns: Optional list of fields to read (other columns are never decoded)
+
+    Returns:
+        List of dictionaries
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(filepath), 'r')).read_all()
+    if columns is not None:
+        table = table.select([name for name in columns if name in table.column_names])
+    json_columns = set(json.loads((table.schema.metadata or {}).get(JSON_COLUMNS_KEY, b'[]')))
+    missing = object()
+    names = table.column_names
+    columns = []
+    for name in names:
+        cells = table.column(name).to_pylist()
+        if name in json_columns:
+            columns.append([missing if cell is None else json.loads(cell) for cell in cells])
+        else:
+            columns.append([missing if cell is None else cell for cell in cells])
+    return [{name: value for name, value in zip(names, row) if value is not missing} for row in zip(*columns)]
+
+
+def _select(records, columns):
+    """Keep only the given fields of each record (all of them when columns is None)"""
+    if columns is None:
+        return records
+    return [{name: record[name] for name in columns if name in record} for record in records]
+
+
+def load_records(filepath, columns=None):
+    """
+    Load records from a JSON data file, or from its .arrow snapshot when available.
+
+    Decoding every column of a snapshot costs about as much as json.load(), so pass
+    columns when only some fields are used.
+
+    Args:
+        filepath: Path to .json file
+        columns: Optional list of fields to load
+
+    Returns:
+        List of dictionaries
+    """
+    arrow_path = os.path.splitext(str(filepath))[0] + '.arrow'
+    if pa is not None and os.path.exists(arrow_path):
+        if not os.path.exists(filepath) or os.path.getmtime(arrow_path) >= os.path.getmtime(filepath):
+            return _read_arrow(arrow_path, columns)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return _select(json.load(f), columns)
+
+
+def _raw_json_value(value):
+    """
+    json.dumps default matching the exported raw files.
+
+    Args:
+        value: Value json cannot encode (datetime, ObjectId, ...)
+
+    Returns:
+        ISO 8601 UTC string with 'Z' for datetimes (naive ones are UTC), str() otherwise
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime('%Y-%m-%dT%H:%M:%S.') + f"{value.microsecond // 1000:03d}Z"
+    return str(value)
+
+
+def load_raw(filepath, source=None, columns=None):
+    """
+    Load a data/raw data set, from a data source when one is given.
+
+    Args:
+        filepath: Path to the raw .json file (its name selects the collection)
+        source: Optional data source with read_collection(name)
+        columns: Optional list of fields to load
+
+    Returns:
+        List of dictionaries
+    """
+    if source is None:
+        return load_records(filepath, columns)
+    name = os.path.splitext(os.path.basename(str(filepath)))[0]
+    records = _select(source.read_collection(RAW_COLLECTIONS.get(name, name)), columns)
+    # ObjectIds and datetimes become strings, as in the exported raw files
+    return json.loads(json.dumps(records, default=_raw_json_value))
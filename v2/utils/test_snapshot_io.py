@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test script for the v2 snapshot I/O utilities"""
+
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add v2 root directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class _DatetimeSource:
+    """Data source returning BSON dates as naive UTC datetimes, like MongoDBConnection"""
+
+    def __init__(self, collections):
+        self.collections = collections
+
+    def read_collection(self, name):
+        return self.collections[name]
+
+
+def test_load_raw_formats_source_dates_like_raw_files():
+    """Test that load_raw turns source datetimes into the raw files' ISO 'Z' strings"""
+    from utils.snapshot_io import load_raw
+    from pipeline.step2_event_selection import filter_future_events
+
+    start = (datetime.now(timezone.utc) + timedelta(days=30)).replace(microsecond=250000)
+    source = _DatetimeSource({'event': [
+        {'_id': 'e1', 'type': 'public', 'startDate': start.replace(tzinfo=None)},
+        {'_id': 'e2', 'type': 'public', 'startDate': start.astimezone(timezone(timedelta(hours=-5)))},
+        {'_id': 'e3', 'type': 'public', 'startDate': datetime(2020, 1, 1, 19, 0)},
+    ]})
+
+    events = load_raw('data/raw/events.json', source=source)
+    expected = start.strftime('%Y-%m-%dT%H:%M:%S.250Z')
+    assert [event['startDate'] for event in events] == [expected, expected, '2020-01-01T19:00:00.000Z']
+
+    future, stats = filter_future_events(events)
+    assert [event['_id'] for event in future] == ['e1', 'e2']
+    assert stats['past_events'] == 1 and stats['invalid_date_events'] == 0
+    print("✓ Source datetimes load as ISO 8601 UTC strings and pass the future-event filter")
+    return True
+
+
+def test_load_records_reads_only_requested_columns():
+    """Test that load_records(columns=...) returns the same subset from .arrow and .json files"""
+    from utils.snapshot_io import JSON_COLUMNS_KEY, load_raw, load_records, pa
+
+    users = [
+        {'_id': 'u1', 'email': 'a@example.com', 'phone': '555-0001', 'interests': ['wine']},
+        {'_id': 'u2', 'email': 'b@example.com', 'event_history': [{'event_id': 'e1'}]},
+    ]
+    expected = [{'email': 'a@example.com', 'phone': '555-0001'}, {'email': 'b@example.com'}]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        json_path = os.path.join(data_dir, 'users.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(users, f)
+        assert load_records(json_path, columns=['email', 'phone']) == expected
+        assert load_raw(json_path, source=_DatetimeSource({'user': users}), columns=['email', 'phone']) == expected
+
+        if pa is None:
+            print("- Skipped Arrow column test (pyarrow not installed); JSON fallback works")
+            return True
+        nested = ['interests', 'event_history']
+        table = pa.table({
+            '_id': [u['_id'] for u in users],
+            'email': [u['email'] for u in users],
+            'phone': [u.get('phone') for u in users],
+            **{name: [json.dumps(u[name]) if name in u else None for u in users] for name in nested},
+        }).replace_schema_metadata({JSON_COLUMNS_KEY: json.dumps(nested)})
+        with pa.OSFile(os.path.join(data_dir, 'users.arrow'), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        assert load_records(json_path) == users
+        assert load_records(json_path, columns=['email', 'phone']) == expected
+    print("✓ load_records decodes only the requested columns from .arrow and .json files")
+    return True
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Testing v2 Snapshot I/O Utilities")
+    print("=" * 60)
+
+    all_passed = True
+
+    # Run tests
+    all_passed &= test_load_raw_formats_source_dates_like_raw_files()
+    all_passed &= test_load_records_reads_only_requested_columns()
+
+    print("=" * 60)
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+        sys.exit(1)
+    print("=" * 60)
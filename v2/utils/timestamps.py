@@ -0,0 +1,71 @@
+"""
+Timestamp Utility
+
+This module provides the ISO 8601 date parser shared by the pipeline steps.
+
+PURPOSE:
+--------
+The same startDate/createdAt/birthDay strings are parsed many times per run (event
+filters, history sorting, last-event lookups, summaries). parse_iso_date() parses each
+distinct string once and returns the memoized datetime afterwards. Datetimes are
+immutable, so sharing them between records is safe.
+
+Mirrors parse_iso_date in backend/utils/mongodb_pull/mongodb_pull.py, except that
+invalid strings raise ValueError (the steps count or skip them).
+
+FUNCTIONS:
+---------
+- parse_iso_date(): Parse an ISO 8601 string (e.g. "2019-08-05T17:00:00.000Z") to a datetime
+- date_cache_info(): Number of strings parsed so far and currently memoized
+"""
+
+from datetime import datetime
+
+# Distinct date strings kept parsed; the memo is emptied when it reaches this size
+DATE_CACHE_SIZE = 1 << 17
+
+_DATE_CACHE = {}
+_DATE_STATS = {'parsed': 0}
+
+
+def parse_iso_date(date_string):
+    """
+    Parse ISO 8601 date string with 'Z' timezone to datetime object.
+
+    Handles format: "2019-08-05T17:00:00.000Z"
+
+    Args:
+        date_string: ISO 8601 date string with 'Z' timezone (datetimes are returned as is)
+
+    Returns:
+        datetime object in UTC timezone, or None if date_string is empty
+
+    Raises:
+        ValueError: If date_string is not a valid ISO 8601 date
+    """
+    if not date_string:
+        return None
+    if isinstance(date_string, datetime):
+        return date_string
+    parsed = _DATE_CACHE.get(date_string)
+    if parsed is None:
+        # Replace 'Z' with '+00:00' for fromisoformat compatibility
+        if date_string.endswith('Z'):
+            parsed = datetime.fromisoformat(date_string[:-1] + '+00:00')
+        else:
+            parsed = datetime.fromisoformat(date_string)
+        if len(_DATE_CACHE) >= DATE_CACHE_SIZE:
+            _DATE_CACHE.clear()
+        _DATE_CACHE[date_string] = parsed
+        _DATE_STATS['parsed'] += 1
+    return parsed
+
+
+def date_cache_info():
+    """
+    Report parser memo statistics.
+
+    Returns:
+        Dictionary with 'parsed' (strings parsed so far) and 'cached' (strings memoized)
+    """
+    return {'parsed': _DATE_STATS['parsed'], 'cached': len(_DATE_CACHE)}